@@ -46,10 +46,25 @@ is specified by NUM_REPS"
 
 FLAGS: List[Flag] = [
     Flag("help", ["-h", "--help"], "Show this help message and exit"),
-    Flag("verbose", ["-v", "--verbose"], "Enable verbose output"),
+    Flag("verbose", ["-v", "--verbose"], "Enable verbose output, i.e. log every move of every game"),
     Flag("quiet", ["-q", "--quiet"], "Quiet output, i.e. no progress bar"),
     Flag("no-write", ["-x", "--no-write"], "Don't write to log file"),
     Flag("out-file", ["-o", "--out"], "Output file to which simulation results are written", value_after=2, value_after_type=str),
+    Flag("jobs", ["-j", "--jobs"], "Number of worker processes to run the simulation in", value_after=2, value_after_type=int),
+    Flag("seed", ["-s", "--seed"], "Master seed from which the seed of every game is derived", value_after=2, value_after_type=int),
+    Flag("batch", ["--batch"], "Simulate many games at once with NumPy. Only supports stateless player types"),
+    Flag("exact", ["--exact"], "Instead of simulating, compute the exact results by dynamic programming. "
+         "Only supports stateless player types, like --batch. NUM_REPS is ignored"),
+    Flag("event-store", ["--event-store"], "Write every event of every game to a binary file", value_after=2, value_after_type=str),
+    Flag("replay", ["--replay"], "Instead of running the simulation, replay the game with the given index and print its log. "
+         "The seed of the original simulation must be passed with --seed", value_after=2, value_after_type=int),
+    Flag("precision", ["--precision"], "Stop as soon as the 95 % confidence interval of every player's win rate is narrower than WIDTH. "
+         "NUM_REPS is then the maximum number of games", value_after=2, value_after_type=float),
+    Flag("metrics-port", ["--metrics-port"], "Serve metrics about the running simulation in the Prometheus text format "
+         "at http://127.0.0.1:PORT/metrics", value_after=2, value_after_type=int),
+    Flag("metrics-file", ["--metrics-file"], "Write metrics about the running simulation in the Prometheus text format "
+         "to this file every few seconds", value_after=2, value_after_type=str),
+    Flag("time-decisions", ["--time-decisions"], "Measure how long each player type takes for its decisions and show the times with the results"),
     Flag("no-sort", ["-u", "--no-sort"],
          "Don't sort results by player win rate"),
     Flag("plot-all", ["-p", "--plot-all"],
@@ -57,6 +72,11 @@ FLAGS: List[Flag] = [
     Flag("plot-win-rate", ["--plot-win-rate"], "Show plot for win rate"),
     Flag("plot-loss-reason", ["--plot-loss-reason"],
          "Show plot for loss reason"),
+    Flag("plot-game-length", ["--plot-game-length"], "Show the distribution of the number of moves per game"),
+    Flag("plot-out", ["--plot-out"], "Instead of showing the plots, write them to files in this directory, in a background process. "
+         "Without any of the plot options, all plots are written", value_after=2, value_after_type=str),
+    Flag("format", ["--format"], "Comma-separated file formats for --plot-out, e.g. png,svg (default png)",
+         value_after=2, value_after_type=str),
     # Only used in help section
     Flag("player-class-dummy", [], help_alias="--<PLAYER_CLASS> [N]",
          help_str=f"Add N Player(s) of PLAYER_CLASS to simulation. Possible values for PLAYER_CLASS are: {player_flags}."),
@@ -179,6 +199,8 @@ def breakLines(lines, max_len):
                 line = line[col:]
                 additional_indent = 1
                 i += 1
+            # `i` already points to the line after the ones that were inserted
+            continue
         i += 1
     return lines
 
@@ -0,0 +1,256 @@
+from typing import Callable, Dict, List, Optional, Tuple, Type
+
+import numpy as np
+
+import constants as c
+from game import TooFewPlayers
+from gameevent import KICK_REASON
+from player import Player, DummyPlayer, AdvancedDummyPlayer, ShowOffPlayer, RandomPlayer, ThresholdPlayer
+from stats import Histogram
+from strategytable import StrategyTable, StrategyNotCompilable, compileStrategy
+from throw import DICE_RANKS
+
+# Vectorized decision functions. They take the player instance, arrays of ranks and a
+# numpy.random.Generator, and return an array with one decision per game. A rank of -1
+# means there is no previous throw to beat.
+DoubtFunc = Callable[[Player, np.ndarray, np.random.Generator], np.ndarray]
+ThrowStatedFunc = Callable[[Player, np.ndarray, np.ndarray, np.random.Generator], np.ndarray]
+
+# The order of KICK_REASON determines the column of each reason in the loss reason table
+KICK_REASONS = list(KICK_REASON)
+REASON_LYING = KICK_REASONS.index(KICK_REASON.LYING)
+REASON_FALSE_ACCUSATION = KICK_REASONS.index(KICK_REASON.FALSE_ACCUSATION)
+REASON_FAILED_TO_BEAT = KICK_REASONS.index(KICK_REASON.FAILED_TO_BEAT_PREDECESSOR)
+
+DICE_RANKS_ARRAY = np.array(DICE_RANKS)
+
+
+def _uniformInt(rng: np.random.Generator, low: np.ndarray, high: np.ndarray) -> np.ndarray:
+    """Draw a random int from [low, high) for each element.
+
+    Elements with an empty range give meaningless results and must be discarded by the caller."""
+    return low + (rng.random(len(low)) * (high - low)).astype(np.int64)
+
+
+def _beats(myRank: np.ndarray, lastRank: np.ndarray) -> np.ndarray:
+    return (lastRank < 0) | (myRank > lastRank)
+
+
+def _doubtMaexchen(player: Player, lastRank: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    return lastRank == c.MAEXCHEN_RANK
+
+
+def _dummyThrowStated(player: Player, myRank: np.ndarray, lastRank: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    return np.where(_beats(myRank, lastRank), myRank, lastRank + 1)
+
+
+def _advDummyDoubt(player: Player, lastRank: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    return (lastRank == c.MAEXCHEN_RANK) | (lastRank == c.RANK_66)
+
+
+def _advDummyThrowStated(player: Player, myRank: np.ndarray, lastRank: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    lie = np.where(lastRank == c.RANK_66, c.MAEXCHEN_RANK, _uniformInt(rng, lastRank + 1, c.N_THROW_VALUES - 1))
+    return np.where(_beats(myRank, lastRank), myRank, lie)
+
+
+def _showOffThrowStated(player: Player, myRank: np.ndarray, lastRank: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    return _uniformInt(rng, np.maximum(lastRank + 1, c.RANK_11), c.N_THROW_VALUES)
+
+
+def _randomDoubt(player: Player, lastRank: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    return rng.random(len(lastRank)) < player.doubtChance  # type: ignore
+
+
+def _randomThrowStated(player: Player, myRank: np.ndarray, lastRank: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    return rng.integers(0, c.N_THROW_VALUES, len(myRank))
+
+
+def _thresDoubt(player: Player, lastRank: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    return lastRank >= player.doubtThreshold.rank  # type: ignore
+
+
+def _thresThrowStated(player: Player, myRank: np.ndarray, lastRank: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    return np.where(_beats(myRank, lastRank), np.maximum(myRank, player.lieThreshold.rank), lastRank + 1)  # type: ignore
+
+
+# Vectorized equivalents of the strategies of stateless player classes
+VECTORIZED_STRATEGIES: Dict[Type[Player], Tuple[DoubtFunc, ThrowStatedFunc]] = {
+    DummyPlayer: (_doubtMaexchen, _dummyThrowStated),
+    AdvancedDummyPlayer: (_advDummyDoubt, _advDummyThrowStated),
+    ShowOffPlayer: (_doubtMaexchen, _showOffThrowStated),
+    RandomPlayer: (_randomDoubt, _randomThrowStated),
+    ThresholdPlayer: (_thresDoubt, _thresThrowStated),
+}
+
+
+def _tableStrategy(table: StrategyTable) -> Tuple[DoubtFunc, ThrowStatedFunc]:
+    """Return vectorized decision functions that sample from a compiled StrategyTable"""
+    def doubt(player: Player, lastRank: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        return table.sampleDoubt(lastRank, rng)
+
+    def throwStated(player: Player, myRank: np.ndarray, lastRank: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        return table.sampleStated(myRank, lastRank, rng)
+
+    return doubt, throwStated
+
+
+class BatchSimulation:
+    """Play many independent games at once, in lockstep.
+
+    The state of all games of a batch is stored in NumPy arrays (one row per game), and every
+    step performs one move in each game that is still running. The players' strategies are
+    replaced by the vectorized functions in VECTORIZED_STRATEGIES. Other players are compiled
+    to a StrategyTable (see strategytable.compileStrategy), which only works for stateless ones.
+
+    The rules are the same as in Game, and so are the statistics, but the random numbers
+    are drawn differently: the results of a BatchSimulation are reproducible with the same
+    seed and batch size, but they don't match those of a Game with the same seed.
+    """
+
+    def __init__(self, players: List[Player], n_games: int, batch_size: int = 4096, seed: Optional[int] = None) -> None:
+        """
+        :param players: Players to simulate. Their ids must be 0, ..., len(players) - 1
+        :param n_games: Number of games to simulate
+        :param batch_size: Number of games to simulate at once
+        :param seed: Seed for the PRNG
+        """
+        if not self.supports(players):
+            raise ValueError("BatchSimulation only supports players that don't listen to events")
+        self.players = players
+        self._strategies: List[Tuple[DoubtFunc, ThrowStatedFunc]] = []
+        for p in players:
+            if type(p) in VECTORIZED_STRATEGIES:
+                self._strategies.append(VECTORIZED_STRATEGIES[type(p)])
+                continue
+            try:
+                self._strategies.append(_tableStrategy(compileStrategy(p)))
+            except StrategyNotCompilable as e:
+                raise ValueError(f"BatchSimulation can't simulate {p!r}: {e}") from e
+        self.n_games = n_games
+        self.batch_size = batch_size
+        self.rng = np.random.default_rng(seed)
+
+        n = len(players)
+        self.games_won = [0 for _ in range(n)]
+        self.win_rounds: Dict[Optional[int], Histogram] = {p.id: Histogram() for p in players}
+        self.loss_reason: Dict[Optional[int], Dict[KICK_REASON, int]] = {p.id: {reason: 0 for reason in KICK_REASON} for p in players}
+        # Same as loss_reason, as a table with one row per player and one column per KICK_REASON
+        self._loss_counts = np.zeros((n, len(KICK_REASONS)), dtype=np.int64)
+
+    @staticmethod
+    def supports(players: List[Player]) -> bool:
+        """Check whether all players have a vectorized strategy or may be compiled to one.
+
+        Whether a player can actually be compiled is only known once it was tried."""
+        return all(type(p) in VECTORIZED_STRATEGIES or not p.listens_to_events for p in players)
+
+    def run(self) -> None:
+        n_done = 0
+        while n_done < self.n_games:
+            batch_size = min(self.batch_size, self.n_games - n_done)
+            self._runBatch(batch_size)
+            n_done += batch_size
+        for i, p in enumerate(self.players):
+            for j, reason in enumerate(KICK_REASONS):
+                self.loss_reason[p.id][reason] = int(self._loss_counts[i, j])
+
+    def _runBatch(self, size: int) -> None:
+        """Play `size` games until all of them are finished"""
+        n = len(self.players)
+        if n < 2:
+            raise TooFewPlayers(n)
+        rng = self.rng
+        strategies = self._strategies
+        seat_offsets = np.arange(1, n + 1)
+
+        # For each game: index (in self.players) of the player sitting on each seat
+        seating = rng.permuted(np.tile(np.arange(n), (size, 1)), axis=1)
+        alive = np.ones((size, n), dtype=bool)
+        n_alive = np.full(size, n)
+        current = rng.integers(0, n, size)
+        last_stated = np.full(size, -1)
+        last_actual = np.full(size, -1)
+        n_moves = np.zeros(size, dtype=np.int64)
+
+        while len(current):
+            rows = np.arange(len(current))
+            n_moves += 1
+            player = seating[rows, current]
+
+            # (1) Ask players that have a throw to beat whether they doubt it
+            doubt = np.zeros(len(rows), dtype=bool)
+            has_last = last_stated >= 0
+            for i, (get_doubt, _) in enumerate(strategies):
+                mask = has_last & (player == i)
+                if mask.any():
+                    doubt[mask] = get_doubt(self.players[i], last_stated[mask], rng)
+
+            # (2) Everyone else throws the dice and states a result
+            throws = ~doubt
+            actual = DICE_RANKS_ARRAY[rng.integers(0, 36, len(rows))]
+            stated = np.full(len(rows), -1)
+            for i, (_, get_throw_stated) in enumerate(strategies):
+                mask = throws & (player == i)
+                if mask.any():
+                    stated[mask] = get_throw_stated(self.players[i], actual[mask], last_stated[mask], rng)
+
+            # (3) Determine who is kicked
+            kicked = np.full(len(rows), -1)
+            reason = np.full(len(rows), -1)
+            truthful = last_stated == last_actual
+            false_acc = doubt & truthful
+            kicked[false_acc] = current[false_acc]
+            reason[false_acc] = REASON_FALSE_ACCUSATION
+            lying = doubt & ~truthful
+            if lying.any():
+                kicked[lying] = self._prevAlive(alive[lying], current[lying], seat_offsets)
+                reason[lying] = REASON_LYING
+            beats = _beats(stated, last_stated)
+            failed = throws & ~beats
+            kicked[failed] = current[failed]
+            reason[failed] = REASON_FAILED_TO_BEAT
+            accepted = throws & beats
+            last_stated = np.where(accepted, stated, last_stated)
+            last_actual = np.where(accepted, actual, last_actual)
+
+            is_kicked = kicked >= 0
+            if is_kicked.any():
+                k_rows = rows[is_kicked]
+                k_seats = kicked[is_kicked]
+                alive[k_rows, k_seats] = False
+                n_alive[k_rows] -= 1
+                last_stated[k_rows] = -1
+                last_actual[k_rows] = -1
+                k_players = seating[k_rows, k_seats]
+                np.add.at(self._loss_counts, (k_players, reason[is_kicked]), 1)
+
+            # (4) Evaluate finished games and drop them from the batch
+            finished = n_alive == 1
+            if finished.any():
+                winners = seating[finished, alive[finished].argmax(axis=1)]
+                moves = n_moves[finished]
+                for i, p in enumerate(self.players):
+                    won = winners == i
+                    self.games_won[p.id] += int(won.sum())  # type: ignore
+                    self.win_rounds[p.id].addCounts(np.bincount(moves[won]).tolist())
+                running = ~finished
+                seating, alive, n_alive, current = seating[running], alive[running], n_alive[running], current[running]
+                last_stated, last_actual, n_moves = last_stated[running], last_actual[running], n_moves[running]
+
+            # (5) Advance to the next alive player
+            if len(current):
+                current = self._nextAlive(alive, current, seat_offsets)
+
+    @staticmethod
+    def _nextAlive(alive: np.ndarray, current: np.ndarray, seat_offsets: np.ndarray) -> np.ndarray:
+        """For each game, find the first alive seat after `current`"""
+        seats = (current[:, None] + seat_offsets) % alive.shape[1]
+        first = alive[np.arange(len(current))[:, None], seats].argmax(axis=1)
+        return seats[np.arange(len(current)), first]
+
+    @staticmethod
+    def _prevAlive(alive: np.ndarray, current: np.ndarray, seat_offsets: np.ndarray) -> np.ndarray:
+        """For each game, find the first alive seat before `current`"""
+        seats = (current[:, None] - seat_offsets) % alive.shape[1]
+        first = alive[np.arange(len(current))[:, None], seats].argmax(axis=1)
+        return seats[np.arange(len(current)), first]
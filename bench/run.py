@@ -0,0 +1,208 @@
+"""Benchmarks for the simulation engines.
+
+Every scenario plays a fixed number of games with a fixed seed and a fixed mix of player
+types, and is run in a fresh process so that its peak memory usage can be measured.
+
+Run all scenarios and write the results to a file:
+    python -m bench.run -o results.json
+Compare against earlier results, exiting with status 1 if anything regressed:
+    python -m bench.run --compare baseline.json
+
+The time it takes to start the command line program and play a few games is measured as
+well, and must stay below STARTUP_BUDGET, since short simulations are dominated by it.
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, asdict
+import json
+import multiprocessing
+import platform
+import os
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+from evaluate import Evaluation
+from player import Player, FLAGS_TO_PLAYERS
+
+# Results of one scenario, e.g. {"games_per_sec": 1234.5, ...}
+Result = Dict[str, Any]
+
+# Relative change of a metric beyond which it counts as a regression
+DEFAULT_TOLERANCE = 0.1
+# For each metric, whether higher values are better
+METRICS = {
+    "games_per_sec": True,
+    "moves_per_sec": True,
+    "peak_rss_kib": False,
+    "peak_traced_kib": False,
+    # Memory blocks still allocated after a run, e.g. logs or statistics that are kept
+    "retained_blocks": False,
+}
+
+# Command whose wall-clock time is measured as the startup time, relative to the repository
+STARTUP_COMMAND = ["main.py", "10", "--dummy", "3", "-x", "-q"]
+# Number of times the command is run, of which the fastest is reported
+STARTUP_REPEAT = 5
+# Maximum startup time in seconds
+STARTUP_BUDGET = 0.3
+
+
+@dataclass
+class Scenario:
+    name: str
+    # Number of players of each type, keyed by their command line flag (see FLAGS_TO_PLAYERS)
+    mix: Dict[str, int]
+    n_games: int
+    seed: int = 0
+    # Keyword arguments for Evaluation
+    options: Dict[str, Any] = field(default_factory=dict)
+    # Number of timed runs, of which the fastest is reported
+    repeat: int = 3
+
+    def players(self) -> List[Player]:
+        return [FLAGS_TO_PLAYERS[flag]() for flag, n in self.mix.items() for _ in range(n)]
+
+
+SCENARIOS = [
+    Scenario("dummies", {"dummy": 6}, 2000),
+    Scenario("stateless", {"dummy": 1, "adv-dummy": 1, "show-off": 1, "random": 1, "thres": 1}, 2000),
+    Scenario("stateless-batch", {"dummy": 1, "adv-dummy": 1, "show-off": 1, "random": 1, "thres": 1}, 20000,
+             options={"batch": True}),
+    Scenario("stateless-slow", {"dummy": 1, "adv-dummy": 1, "show-off": 1, "random": 1, "thres": 1}, 2000,
+             options={"fast": False}),
+    Scenario("trackers", {"tracking": 3, "c-thres": 2, "c-dummy": 1, "thres": 2}, 1000),
+    Scenario("table-500", {"dummy": 100, "adv-dummy": 100, "random": 100, "thres": 100, "tracking": 50, "c-thres": 50}, 3,
+             repeat=1),
+]
+
+
+def runScenario(scenario: Scenario) -> Result:
+    """Run a scenario and measure it. Is meant to be called in a fresh process."""
+    best = None
+    n_moves = 0
+    for _ in range(scenario.repeat):
+        ev = Evaluation(scenario.players(), scenario.n_games, seed=scenario.seed, **scenario.options)
+        t_start = time.perf_counter()
+        ev.run()
+        elapsed = time.perf_counter() - t_start
+        if best is None or elapsed < best:
+            best = elapsed
+        # Every game ends with the move in which the winner was determined
+        n_moves = round(ev.getGameLengths().mean * scenario.n_games)
+    assert best is not None
+
+    # Count memory in a separate run, since tracing slows the simulation down
+    ev = Evaluation(scenario.players(), scenario.n_games, seed=scenario.seed, **scenario.options)
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    ev.run()
+    _, peak_traced = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    retained_blocks = sys.getallocatedblocks() - blocks_before
+
+    return {
+        "n_games": scenario.n_games,
+        "n_players": len(ev.players),
+        "seconds": best,
+        "games_per_sec": scenario.n_games / best,
+        "moves_per_sec": n_moves / best,
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "peak_traced_kib": peak_traced // 1024,
+        "retained_blocks": retained_blocks,
+    }
+
+
+def measureStartup(repeat: int = STARTUP_REPEAT) -> float:
+    """Return the shortest time in seconds it took to run STARTUP_COMMAND in a new interpreter"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    best = None
+    for _ in range(repeat):
+        t_start = time.perf_counter()
+        subprocess.run([sys.executable, *STARTUP_COMMAND], cwd=root, check=True, stdout=subprocess.DEVNULL)
+        elapsed = time.perf_counter() - t_start
+        if best is None or elapsed < best:
+            best = elapsed
+    assert best is not None
+    return best
+
+
+def runAll(scenarios: List[Scenario]) -> Dict[str, Any]:
+    """Run every scenario in its own process and collect the results"""
+    results: Dict[str, Result] = {}
+    # Spawn instead of fork, so that each process starts out with the memory of a fresh interpreter
+    context = multiprocessing.get_context("spawn")
+    for scenario in scenarios:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            results[scenario.name] = executor.submit(runScenario, scenario).result()
+        print(formatResult(scenario.name, results[scenario.name]), flush=True)
+    startup = measureStartup()
+    print(f"{'startup':<16} {startup * 1000:>10.1f} ms (budget {STARTUP_BUDGET * 1000:.0f} ms)", flush=True)
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "startup_sec": startup,
+        "scenarios": results,
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """Return a description of every metric that got worse by more than `tolerance`"""
+    regressions = []
+    for name, result in current["scenarios"].items():
+        base = baseline["scenarios"].get(name)
+        if base is None:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            old, new = base.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (change < -tolerance) if higher_is_better else (change > tolerance):
+                regressions.append(f"{name}: {metric} {old:.6g} -> {new:.6g} ({change:+.1%})")
+    if current.get("startup_sec", 0) > STARTUP_BUDGET:
+        regressions.append(f"startup: {current['startup_sec']:.3f} s exceeds the budget of {STARTUP_BUDGET} s")
+    return regressions
+
+
+def formatResult(name: str, result: Result) -> str:
+    return (f"{name:<16} {result['games_per_sec']:>10.1f} games/s {result['moves_per_sec']:>12.1f} moves/s "
+            f"{result['peak_rss_kib'] / 1024:>8.1f} MiB RSS {result['retained_blocks']:>9} blocks retained")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the simulation engines")
+    parser.add_argument("-o", "--output", help="Write the results to this JSON file")
+    parser.add_argument("-c", "--compare", metavar="BASELINE", help="Compare the results with those in a JSON file")
+    parser.add_argument("-t", "--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"Relative change that counts as a regression (default {DEFAULT_TOLERANCE})")
+    parser.add_argument("-s", "--scenario", action="append", choices=[s.name for s in SCENARIOS],
+                        help="Only run this scenario. Can be given multiple times.")
+    args = parser.parse_args(argv)
+
+    scenarios = [s for s in SCENARIOS if args.scenario is None or s.name in args.scenario]
+    results = runAll(scenarios)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+    # Without a baseline, only the startup budget is checked
+    baseline: Dict[str, Any] = {"scenarios": {}}
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+    regressions = compare(baseline, results, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if regressions:
+        return 1
+    if args.compare:
+        print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,6 +12,30 @@ N_THROW_VALUES = len(THROW_VALUES)
 # Map values to their ranks. This is a frequent operation, so the ranks are pre-calucalted
 # instead of calling THROW_VALUES.index() when needed
 THROW_RANK_BY_VALUE = {val: rank for rank, val in enumerate(THROW_VALUES)}
+# Ranks that players frequently compare against
+MAEXCHEN_RANK = THROW_RANK_BY_VALUE[MAEXCHEN]
+RANK_66 = THROW_RANK_BY_VALUE[66]
+RANK_11 = THROW_RANK_BY_VALUE[11]
 
 # Width of the progress bar in characters
 PROGRESS_BAR_WIDTH = 20
+# Seconds between two updates of the progress bar
+PROGRESS_INTERVAL = 0.5
+
+# Number of games after which Evaluation checks whether the requested precision was reached
+PRECISION_CHECK_INTERVAL = 1000
+# Number of games of a batch simulation that are played at once, with the seed of the first one.
+# Evaluation only distributes whole blocks, so the results don't depend on the number of workers.
+BATCH_BLOCK_SIZE = 4096
+
+# Number of values with a bucket of their own in a stats.Histogram, e.g. of the number of moves
+# a game took. Larger values are only counted in total.
+HISTOGRAM_BUCKETS = 1024
+
+# Plots of tables with more players than this show the average of each player class instead
+PLOT_MAX_PLAYERS = 16
+
+# Seconds between two writes of the metrics file, see metrics.MetricsExporter
+METRICS_INTERVAL = 5.0
+# Number of games after which a process adds its results to the shared progress.ProgressCounters
+RESULTS_PUBLISH_INTERVAL = 100
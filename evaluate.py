@@ -1,16 +1,30 @@
 import copy
 import time
-from contextlib import suppress
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import ExitStack, suppress
 import logging
-from typing import List, Tuple, Dict, Optional, Union
+from math import ceil, sqrt
+import multiprocessing
+from random import randrange
+from sys import maxsize
+from typing import Any, List, Sequence, Tuple, Dict, Optional, Union
 
 from gameevent import EventKick
 from player import Player
 from game import Game
+from gamelog import GameLog, CountingLog
+from fastgame import FastGame
+from tracing import Tracer
+from observation import ObservationService
+from timing import DecisionTimer
 from gameevent import KICK_REASON
-from formatting import formatTable, printProgress
+from formatting import formatTable
 from disk import writeLog
-from plot import plotWinRate, plotLossReason, plotWRandLR
+from plotfiles import FIGURE_NAMES, renderInBackground
+from metrics import MetricsExporter
+from progress import ProgressCounters, ProgressReporter, GAMES, MOVES, N_COUNTERS, slotSize
+from stats import Histogram, proportionStdError
+from utils import Z_95, deriveSeed, wilsonInterval
 import constants as c
 
 
@@ -18,13 +32,30 @@ class IncompleteLogError(Exception):
     pass
 
 
+class BatchNotSupported(Exception):
+    """Is raised when the players of a batch simulation can't be simulated by BatchSimulation"""
+    pass
+
+
 class Evaluation:
     """Run Games repeatedly"""
 
-    def __init__(self, players: List[Player], n_repetitions: int, show_progress: bool = False, deepcopy: bool = True) -> None:
+    def __init__(self, players: List[Player], n_repetitions: int, show_progress: bool = False, deepcopy: bool = True,
+                 workers: int = 1, seed: Optional[int] = None, fast: bool = True, batch: bool = False,
+                 tracer: Optional[Tracer] = None, record_logs: bool = False, timer: Optional[DecisionTimer] = None,
+                 precision: Optional[float] = None, metrics: Optional[MetricsExporter] = None) -> None:
         """
         :param players: List of player instances to simulate
-        :param n_repetitions: Number of games to simulate
+        :param n_repetitions: Number of games to simulate, or the maximum number if `precision` is given
+        :param workers: Number of processes to distribute the games across. Each process
+          plays with its own copies of the players.
+        :param seed: Master seed from which the seed of every game is derived. A random
+          one is generated if not specified.
+        :param timer: Measure how long the players take for their decisions. This plays all
+          games with Game, in the current process. The measurements are shown by prettyResults().
+        :param precision: Stop early, as soon as the 95 % confidence interval of every player's
+          win rate is narrower than this. Checked every PRECISION_CHECK_INTERVAL games.
+        :param metrics: Publish the progress and results while the games are played
         """
 
         # TODO: This isn't really needed anymore
@@ -32,21 +63,41 @@ class Evaluation:
         # Das kann passieren, wenn eine Liste durch "list = [element] * integer" erstellt wird
         self.players = [copy.copy(p) for p in players] if deepcopy else players
         self.n_repetitions = n_repetitions
+        self.precision = precision
+        self.metrics = metrics
+        # Number of games that have been played and evaluated so far
+        self.games_played = 0
         self.assignIds(self.players)
         for player in self.players:
             player.onInit(self.players)
+        # State of the players before any game was played, from which single games can be replayed.
+        # Only taken by run(), before the players take part in any game.
+        self._initial_players: Optional[List[Player]] = None
+        # Statistics about the players, computed once for all players that read them
+        self.observations = self.shareObservations(self.players)
 
-        # Speichert, wie oft jeder Spieler gewonnen hat. Der Index entspricht der id der jeweiligen Spieler.
-        self.games_won = [0 for _ in range(len(self.players))]
-        # Store the indexes of the moves at which the player won
-        self.win_rounds: Dict[Optional[int], List[int]] = {p.id: [] for p in self.players}
-        # Store how many times the player was kicked for each reason
-        self.loss_reason: Dict[Optional[int], Dict[KICK_REASON, int]] = {p.id: {reason: 0 for reason in KICK_REASON} for p in self.players}
+        self.record_logs = record_logs
+        self._resetResults()
+        self.logs: List[GameLog] = []
 
         self.done = False
         self._pretty_results_cached: Optional[str] = None
 
         self.show_progress = show_progress
+        # Numbers of games and moves played so far, while the games are played. Only counted if
+        # they are shown or exported, see run().
+        self.progress: Optional[ProgressCounters] = None
+        # Counters of `progress`, of which the ones at `_progress_slot` are bumped after every game
+        self._progress = None
+        self._progress_slot = 0
+        self.workers = max(1, workers)
+        # Game k is always played with the seed gameSeed(k), no matter how the games are distributed
+        self.seed = seed if seed is not None else randrange(maxsize) # random.randrange, sys.maxsize
+        self.tracer = tracer
+        self.timer = timer
+        self.fast = fast and tracer is None and timer is None
+        self.batch = batch and tracer is None and timer is None
+        self._fast_game = FastGame(self.players) if self.fast and FastGame.supports(self.players) else None
 
         self.t_start: float = -1.0  # Zeitpunkt an dem die Simulation gestartet wurde
         self.t_end: float = -1.0
@@ -55,18 +106,139 @@ class Evaluation:
         if len(self.players) < 2:
             logging.warning(f"Running evaluation with only {len(self.players)} players.")
 
+        if self._initial_players is None:
+            self._initial_players = copy.deepcopy(self.players)
         self.t_start = time.time()
-        prg = 0
-        prg_steps = c.PROGRESS_BAR_WIDTH
-
-        if self.show_progress:
-            printProgress(0, prg_steps, end="\r")
-        for i in range(self.n_repetitions):
+        parallel = self.workers > 1 and self.n_repetitions > 1 and self.tracer is None and self.timer is None
+        n_workers = min(self.workers, self.n_repetitions)
+        if self.show_progress or self.metrics is not None:
+            # Every worker process counts its progress in a slot of its own
+            self.progress = ProgressCounters(n_slots=n_workers if parallel else 1, n_players=len(self.players))
+            self._progress = self.progress.counters
+        with ExitStack() as stack:
             if self.show_progress:
-                if prg < (prg := i * prg_steps // self.n_repetitions):
-                    printProgress(prg, prg_steps, end=(
-                        "\r" if i < self.n_repetitions - 1 else "\n"))
-            game = Game(self.players, disable_assign_ids=True)
+                stack.enter_context(ProgressReporter(self.progress, self.n_repetitions))  # type: ignore
+            if self.metrics is not None:
+                stack.enter_context(self.metrics.exporting(self))
+            executor = None
+            if parallel:
+                # The worker processes are started once and reused if the games are played in several steps
+                # Every worker keeps its copies of the players for all the games it plays
+                executor = stack.enter_context(ProcessPoolExecutor(
+                        max_workers=n_workers, initializer=_initWorker,
+                        initargs=(self._progress, multiprocessing.Value("i", 0), self.players, self.seed, self.fast, self.batch)))
+            if self.precision is None:
+                self._runRange(0, self.n_repetitions, executor)
+            else:
+                self._runUntilPrecise(executor)
+        self._progress = None
+        self.t_end = time.time()
+        self.done = True
+
+    def _resetResults(self) -> None:
+        """Start counting the results of the games from zero"""
+        # Speichert, wie oft jeder Spieler gewonnen hat. Der Index entspricht der id der jeweiligen Spieler.
+        self.games_won = [0 for _ in range(len(self.players))]
+        # Distribution of the indexes of the moves at which the player won
+        self.win_rounds: Dict[Optional[int], Histogram] = {p.id: Histogram() for p in self.players}
+        # Store how many times the player was kicked for each reason
+        self.loss_reason: Dict[Optional[int], Dict[KICK_REASON, int]] = {p.id: {reason: 0 for reason in KICK_REASON} for p in self.players}
+        # Shared by all games unless full logs are recorded; it counts kicks directly into self.loss_reason
+        self._counting_log = CountingLog(self.loss_reason)
+
+    def gameSeed(self, game_index: int) -> int:
+        """Return the seed of the game with the given index"""
+        return deriveSeed(self.seed, game_index)
+
+    def replay(self, game_index: int) -> Game:
+        """Play a single game of this Evaluation again, with the same seed and seating.
+
+        The game is played with fresh copies of the players, in the state they were in before
+        the Evaluation was run. For players that learn from previous games, e.g. TrackingPlayer,
+        this means that the game may not be exactly the same as in the full run.
+        The returned Game keeps a full GameLog.
+
+        :param game_index: Index of the game, starting at 0
+        """
+        if self.batch:
+            raise ValueError("Games of a batch simulation can't be replayed")
+        if not 0 <= game_index < self.n_repetitions:
+            raise ValueError(f"Game index must be between 0 and {self.n_repetitions - 1}, got {game_index}")
+        # Until the Evaluation is run, the players are still in their initial state
+        players = copy.deepcopy(self._initial_players if self._initial_players is not None else self.players)
+        game = Game(players, seed=self.gameSeed(game_index), disable_assign_ids=True, tracer=self.tracer,
+                    game_index=game_index, observations=self.shareObservations(players))
+        game.init()
+        game.run()
+        return game
+
+    def _runRange(self, start: int, stop: int, executor: Optional[ProcessPoolExecutor]) -> None:
+        """Play the games with indices in [start, stop), in worker processes if an executor is given"""
+        if executor is not None:
+            self._runParallel(start, stop, executor)
+        else:
+            self._runGames(start, stop)
+        self.games_played = stop
+
+    def _runUntilPrecise(self, executor: Optional[ProcessPoolExecutor]) -> None:
+        """Play games in steps until all win rates are precise enough or n_repetitions games were played"""
+        n_workers = self.workers if executor is not None else 1
+        step = c.PRECISION_CHECK_INTERVAL * n_workers
+        if self.batch:
+            # Batch simulations are played in whole blocks, see _runBatch()
+            step = ceil(step / c.BATCH_BLOCK_SIZE) * c.BATCH_BLOCK_SIZE
+        while self.games_played < self.n_repetitions:
+            self._runRange(self.games_played, min(self.games_played + step, self.n_repetitions), executor)
+            if self.isPrecise():
+                break
+
+    def isPrecise(self) -> bool:
+        """Check whether the confidence interval of every player's win rate is narrower than `precision`"""
+        assert self.precision is not None
+        for p in self.players:
+            low, high = self.winRateInterval(p.id)
+            if high - low >= self.precision:
+                return False
+        return True
+
+    def winRateInterval(self, player_id: int) -> Tuple[float, float]:
+        """Return the 95 % confidence interval of a player's win rate"""
+        return wilsonInterval(self.games_won[player_id], self.games_played)
+
+    def _runGames(self, start: int, stop: int) -> None:
+        """Play the games with indices from `start` up to (excluding) `stop`"""
+        progress = self._progress
+        games_counter = self._progress_slot * slotSize(len(self.players)) + GAMES
+        moves_counter = self._progress_slot * slotSize(len(self.players)) + MOVES
+        # Results that were already added to the progress counters
+        published = self._resultCounts() if progress is not None else None
+        if self.batch:
+            for block_start in range(start, stop, c.BATCH_BLOCK_SIZE):
+                block_stop = min(block_start + c.BATCH_BLOCK_SIZE, stop)
+                n_moves = self._runBatch(block_start, block_stop)
+                if progress is not None:
+                    progress[games_counter] += block_stop - block_start
+                    progress[moves_counter] += n_moves
+                    self._publishResults(published)
+            return
+
+        for i in range(stop - start):
+            if published is not None and i % c.RESULTS_PUBLISH_INTERVAL == 0:
+                self._publishResults(published)
+            if self._fast_game is not None:
+                self._fast_game.play(self.gameSeed(start + i))
+                self.evalFastGame(self._fast_game)
+                if progress is not None:
+                    progress[games_counter] += 1
+                    progress[moves_counter] += self._fast_game.n_moves
+                continue
+            if self.record_logs:
+                log = None  # Game creates a GameLog
+            else:
+                log = self._counting_log
+                log.reset()
+            game = Game(self.players, seed=self.gameSeed(start + i), disable_assign_ids=True, tracer=self.tracer, log=log,
+                        game_index=start + i, observations=self.observations, timer=self.timer)
             game.init()
             game.run()
             if game.running:
@@ -74,35 +246,120 @@ class Evaluation:
                     "Error: Game is still running but should have stopped.")
             else:
                 self.evalLog(game)
+            if progress is not None:
+                progress[games_counter] += 1
+                progress[moves_counter] += game.log.countRounds()
+        if published is not None:
+            self._publishResults(published)
 
-        self.t_end = time.time()
-        self.done = True
+    def _resultCounts(self) -> List[int]:
+        """Return the wins of every player, followed by the kicks of every player for each reason"""
+        return [*self.games_won, *(self.loss_reason[player_id][reason]
+                                   for player_id in range(len(self.players)) for reason in KICK_REASON)]
+
+    def _publishResults(self, published: List[int]) -> None:
+        """Add the results since the last call to the slot of this process in the progress counters.
+
+        :param published: Results that were added at the last call, see _resultCounts(). Is updated.
+        """
+        progress = self._progress
+        assert progress is not None
+        offset = self._progress_slot * slotSize(len(self.players)) + N_COUNTERS
+        counts = self._resultCounts()
+        for i, (count, old) in enumerate(zip(counts, published)):
+            if count != old:
+                progress[offset + i] += count - old
+        published[:] = counts
+
+    def _runBatch(self, start: int, stop: int) -> int:
+        """Play the games with indices in [start, stop) with a BatchSimulation and return the number of moves played.
+
+        The games must be one block: `start` is a multiple of BATCH_BLOCK_SIZE, and the block
+        is only cut short at the last game. All games of a block are played at once with the
+        seed of its first game, so no matter how the blocks are distributed, they have the same
+        results."""
+        assert start % c.BATCH_BLOCK_SIZE == 0 and stop - start <= c.BATCH_BLOCK_SIZE
+        # batchsim depends on numpy, which is only needed if batch simulation is requested
+        from batchsim import BatchSimulation
+        try:
+            sim = BatchSimulation(self.players, stop - start, batch_size=c.BATCH_BLOCK_SIZE, seed=self.gameSeed(start))
+        except ValueError as e:
+            raise BatchNotSupported(str(e)) from e
+        sim.run()
+        self.mergeResults(sim.games_won, sim.win_rounds, sim.loss_reason)
+        return round(sum(rounds.mean * rounds.n for rounds in sim.win_rounds.values()))
+
+    def _runParallel(self, start: int, stop: int, executor: ProcessPoolExecutor) -> None:
+        """Distribute the games with indices in [start, stop) across worker processes and merge their counters.
+
+        While the games are played, the workers publish their results in the progress counters."""
+        # Batch simulations are split into whole blocks only, see _runBatch()
+        unit = c.BATCH_BLOCK_SIZE if self.batch else 1
+        n_units = ceil((stop - start) / unit)
+        n_workers = min(self.workers, n_units)
+        # Split games as evenly as possible
+        chunk_units = [n_units // n_workers + (i < n_units % n_workers) for i in range(n_workers)]
+        bounds = [min(start + sum(chunk_units[:i]) * unit, stop) for i in range(n_workers + 1)]
+        futures = [executor.submit(_runWorker, chunk_start, chunk_stop) for chunk_start, chunk_stop in zip(bounds, bounds[1:])]
+        for future in as_completed(futures):
+            self.mergeResults(*future.result())
+
+    def mergeResults(self, games_won: List[int], win_rounds: Dict[Optional[int], Histogram],
+                     loss_reason: Dict[Optional[int], Dict[KICK_REASON, int]]) -> None:
+        """Add counters collected by another Evaluation of the same players to this one"""
+        for i, n in enumerate(games_won):
+            self.games_won[i] += n
+        for player_id, rounds in win_rounds.items():
+            self.win_rounds[player_id].merge(rounds)
+        for player_id, reasons in loss_reason.items():
+            for reason, n in reasons.items():
+                self.loss_reason[player_id][reason] += n
 
     def evalLog(self, game: Game):
-        if (winner_id := game.log.winner_id):
+        if (winner_id := game.log.winner_id) is not None:
             self.games_won[winner_id] += 1
-            self.win_rounds[winner_id].append(game.log.countRounds())
-        for event in game.log.getEvents():
-            if isinstance(event, EventKick):
-                self.loss_reason[event.player_id][event.reason] += 1
+            self.win_rounds[winner_id].add(game.log.countRounds())
+        if isinstance(game.log, GameLog):
+            if self.record_logs:
+                self.logs.append(game.log)
+            # A CountingLog has already counted the kicks while the game was played
+            for event in game.log.getEvents():
+                if isinstance(event, EventKick):
+                    self.loss_reason[event.player_id][event.reason] += 1
+
+    def evalFastGame(self, game: FastGame):
+        winner_id = game.winner_id
+        self.games_won[winner_id] += 1
+        self.win_rounds[winner_id].add(game.n_moves)
+        for player_id, reason in zip(game.kick_ids[:game.n_kicks], game.kick_reasons[:game.n_kicks]):
+            self.loss_reason[player_id][reason] += 1
 
     def getPlayerStats(self, player_id) -> Tuple[float, ...]:
         win_rate: float = 0.
         average_win_round: float = 0.
-        rounds_won = len(self.win_rounds[player_id])
+        rounds_won = self.games_won[player_id]
         loss_reasons_freq: List[float] = [0.0 for _ in KICK_REASON]
-        rounds_lost = self.n_repetitions - rounds_won
+        rounds_lost = self.games_played - rounds_won
         # `if`s are necessary in order to avoid division by zero
-        if self.n_repetitions > 0:
-            win_rate = self.games_won[player_id] / self.n_repetitions
+        if self.games_played > 0:
+            win_rate = rounds_won / self.games_played
         if rounds_won > 0:
-            average_win_round = sum(self.win_rounds[player_id]) / rounds_won
+            average_win_round = self.win_rounds[player_id].mean
         if rounds_lost > 0:
             loss_reasons_freq = [self.loss_reason[player_id][reason] / rounds_lost for reason in KICK_REASON]
 
         # TODO: Unpacking this tuple is bad; just return the tuple itself
         return win_rate, average_win_round, *loss_reasons_freq
 
+    def getPlayerErrors(self, player_id) -> Tuple[float, ...]:
+        """Return the standard errors of the statistics returned by getPlayerStats(), in the same order"""
+        rounds_won = self.games_won[player_id]
+        rounds_lost = self.games_played - rounds_won
+        win_rate_error = proportionStdError(rounds_won, self.games_played)
+        win_round_error = self.win_rounds[player_id].stdError()
+        loss_reasons_error = [proportionStdError(self.loss_reason[player_id][reason], rounds_lost) for reason in KICK_REASON]
+        return win_rate_error, win_round_error, *loss_reasons_error
+
     def getWinRates(self) -> List[float]:
         """Return win rate of players"""
         return [self.getPlayerStats(p.id)[0] for p in self.players]
@@ -111,6 +368,13 @@ class Evaluation:
         """Return frequency for each loss reason of all players"""
         return [self.getPlayerStats(p.id)[2:] for p in self.players]
 
+    def getGameLengths(self) -> Histogram:
+        """Return the distribution of the number of moves of all games"""
+        game_lengths = Histogram()
+        for rounds in self.win_rounds.values():
+            game_lengths.merge(rounds)
+        return game_lengths
+
     def prettyResults(self, force_rerender=False, sort_by_winrate=True) -> str:
         if self._pretty_results_cached is None or force_rerender:
             self._pretty_results_cached = self._renderPrettyResults(
@@ -120,42 +384,157 @@ class Evaluation:
     def _renderPrettyResults(self, sort_by_winrate=True) -> str:
         """Format simulation results into human-readable text"""
         assert self.done
-        pretty_string = f"Ran simulation in {self.t_end-self.t_start:.3f} seconds\n"
+        pretty_string = f"Ran simulation in {self.t_end-self.t_start:.3f} seconds (seed {self.seed})\n"
+        if self.precision is not None:
+            stopped = "reached" if self.isPrecise() else "not reached"
+            pretty_string += f"Played {self.games_played} of at most {self.n_repetitions} games, precision {self.precision} {stopped}\n"
         table: List[List[str]] = [
                 ["player", "win rate", "avg. win move", "loss causes", "", "", ""],
                 ["", "", "", "lie", "false acc", "worse", "no rep"]
         ]
-        player_stats: List[Tuple[str, Tuple[float, ...]]] = [(repr(p), self.getPlayerStats(p.id)[:6]) for p in self.players]
+        player_stats: List[Tuple[str, Tuple[float, ...], Tuple[float, ...]]] = [
+                (repr(p), self.getPlayerStats(p.id)[:6], self.getPlayerErrors(p.id)[:6]) for p in self.players]
         if sort_by_winrate:
             # Sort by first element of the stats tuple, which is win rate
             player_stats.sort(key=lambda row: row[1][1], reverse=True) # type: ignore
-        player_stats_formatted = [[name, *[f"{el:.2f}" for el in stats]] for name, stats in player_stats]
+        # Every value is followed by the half-width of its 95 % confidence interval
+        player_stats_formatted = [[name, *[f"{el:.2f} ±{Z_95 * err:.2f}" for el, err in zip(stats, errors)]]
+                                  for name, stats, errors in player_stats]
         table.extend(player_stats_formatted)
         pretty_string += formatTable(table)
+        pretty_string += "± 95 % confidence interval, i.e. 1.96 standard errors\n"
+        if self.timer is not None:
+            pretty_string += "\nDecision times\n" + self.timer.pretty()
         return pretty_string
 
     def saveResultsToDisk(self, log_path=None):
         assert self.done
         # disk.writeLog
         writeLog(self.t_start, self.players,
-                 self.n_repetitions, self.prettyResults(), log_path=log_path)
+                 self.games_played, self.prettyResults(), log_path=log_path)
+
+    def getClassStats(self) -> Tuple[List[str], List[Tuple[float, ...]], List[Tuple[float, ...]]]:
+        """Average the statistics of the players of each class.
+
+        Returns the names of the classes, the mean of getPlayerStats() over the players of each
+        class and the standard errors of those means, in the order the classes first appear."""
+        by_class: Dict[str, List[Player]] = {}
+        for p in self.players:
+            by_class.setdefault(p.__class__.__name__, []).append(p)
+        names, stats, errors = [], [], []
+        for class_name, members in by_class.items():
+            k = len(members)
+            names.append(f"{class_name} (x{k})")
+            member_stats = zip(*[self.getPlayerStats(p.id) for p in members])
+            stats.append(tuple(sum(values) / k for values in member_stats))
+            # Standard error of the mean of k independent estimates
+            member_errors = zip(*[self.getPlayerErrors(p.id) for p in members])
+            errors.append(tuple(sqrt(sum(err * err for err in values)) / k for values in member_errors))
+        return names, stats, errors
+
+    def _plotData(self) -> Tuple[List[str], List[Tuple[float, ...]], List[Tuple[float, ...]]]:
+        """Return names, statistics and 95 % confidence half-widths of the bars to plot.
+
+        Tables with more than PLOT_MAX_PLAYERS players are aggregated per player class, so that
+        the plots stay readable."""
+        if len(self.players) > c.PLOT_MAX_PLAYERS:
+            names, stats, errors = self.getClassStats()
+        else:
+            names = [f"{p.__class__.__name__} {p.id}" for p in self.players]
+            stats = [self.getPlayerStats(p.id) for p in self.players]
+            errors = [self.getPlayerErrors(p.id) for p in self.players]
+        return names, stats, [tuple(Z_95 * err for err in row) for row in errors]
+
+    def _figureArguments(self) -> Dict[str, Tuple[tuple, Dict[str, Any]]]:
+        """Return the arguments for each of the functions in plot.FIGURES"""
+        names, stats, errors = self._plotData()
+        game_lengths = self.getGameLengths()
+        return {
+            "win_rate": ((names, [s[0] for s in stats]), {"errors": [e[0] for e in errors]}),
+            "loss_reason": ((names, [s[2:] for s in stats]), {"errors": [e[2:] for e in errors]}),
+            "game_length": ((list(game_lengths.counts), game_lengths.overflow), {}),
+        }
 
     def plotWinRate(self):
-        # plot.plotWinRate
-        plotWinRate(
-            [f"{p.__class__.__name__} {p.id}" for p in self.players], self.getWinRates())
+        # plot depends on matplotlib and numpy, which take long to import and are only needed
+        # if a plot is requested
+        from plot import plotWinRate
+        args, kwargs = self._figureArguments()["win_rate"]
+        plotWinRate(*args, **kwargs)
 
     def plotLossReason(self):
-        # plot.plotLossReason
-        plotLossReason(
-            [f"{p.__class__.__name__} {p.id}" for p in self.players], self.getLossReasons())
+        from plot import plotLossReason
+        args, kwargs = self._figureArguments()["loss_reason"]
+        plotLossReason(*args, **kwargs)
 
     def plotWRandLR(self):
-        # plot.plotWRandLR
-        player_names = [f"{p.__class__.__name__} {p.id}" for p in self.players]
-        plotWRandLR(player_names, self.getWinRates(), self.getLossReasons())
+        from plot import plotWRandLR
+        names, stats, errors = self._plotData()
+        plotWRandLR(names, [s[0] for s in stats], [s[2:] for s in stats],
+                    win_errors=[e[0] for e in errors], loss_errors=[e[2:] for e in errors])
+
+    def plotGameLength(self):
+        from plot import plotGameLength
+        args, kwargs = self._figureArguments()["game_length"]
+        plotGameLength(*args, **kwargs)
+
+    def plotToFiles(self, out_dir: str, formats: Sequence[str] = ("png",),
+                    figure_names: Sequence[str] = FIGURE_NAMES) -> multiprocessing.Process:
+        """Render plots to files without a display, in a background process.
+
+        :param out_dir: Directory to write the files to, e.g. `win_rate.png`
+        :param formats: File formats, see plotfiles.FORMATS
+        :param figure_names: Figures to render, see plotfiles.FIGURE_NAMES
+        :return: The process that renders the plots
+        """
+        figures = self._figureArguments()
+        return renderInBackground({name: figures[name] for name in figure_names}, out_dir, formats)
 
     def assignIds(self, players) -> None:
         for i, player in enumerate(players):
             player.id = i
 
+    @staticmethod
+    def shareObservations(players: List[Player]) -> Optional[ObservationService]:
+        """Create an ObservationService and share it with all players that use one.
+
+        Returns None if no player uses observations."""
+        if not any(p.uses_observations for p in players):
+            return None
+        observations = ObservationService()
+        for player in players:
+            if player.uses_observations:
+                player.shareObservations(observations)
+        return observations
+
+
+# Evaluation of the players of this worker process, see _initWorker()
+_worker_ev: Optional[Evaluation] = None
+
+
+def _initWorker(progress, next_slot, players: List[Player], seed: int, fast: bool, batch: bool) -> None:
+    """Set up a worker process. Is called once in every process of the pool.
+
+    The players are received as pickled copies, so every worker plays with players of its own.
+    They are kept for all the games the worker plays, so players that learn from previous
+    games do so in every step of a run with `precision`, too.
+
+    :param progress: Counters of the parent's ProgressReporter, or None
+    :param next_slot: Shared value from which each worker takes the index of its slot
+    """
+    global _worker_ev
+    _worker_ev = Evaluation(players, 0, deepcopy=False, seed=seed, fast=fast, batch=batch)
+    with next_slot.get_lock():
+        _worker_ev._progress_slot = next_slot.value
+        next_slot.value += 1
+    _worker_ev._progress = progress
+
+
+def _runWorker(start: int, stop: int) -> Tuple[
+        List[int], Dict[Optional[int], Histogram], Dict[Optional[int], Dict[KICK_REASON, int]]]:
+    """Play the games with indices in [start, stop) inside a worker process and return their counters"""
+    assert _worker_ev is not None
+    _worker_ev._resetResults()
+    _worker_ev._runGames(start, stop)
+    return _worker_ev.games_won, _worker_ev.win_rounds, _worker_ev.loss_reason
+
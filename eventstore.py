@@ -0,0 +1,144 @@
+from __future__ import annotations
+import struct
+from typing import Optional, TYPE_CHECKING
+
+import numpy as np
+
+from gameevent import Event, EventThrow, EventKick, EVENT_TYPES, KICK_REASON
+from tracing import Tracer
+
+if TYPE_CHECKING:
+    from game import Game
+
+# The file starts with a magic string and a format version, followed by the records
+MAGIC = b"MXEV"
+VERSION = 1
+HEADER = struct.Struct("<4sI")
+
+# One packed record per Event. Ranks, reasons and player ids are -1 if they don't apply.
+RECORD = struct.Struct("<IiiBbbb")
+EVENT_DTYPE = np.dtype([
+    ("game", "<u4"),    # Index of the game in its Evaluation
+    ("move", "<i4"),    # Index of the move in the game
+    ("player", "<i4"),  # Id of the player the event relates to
+    ("type", "u1"),     # Index of the event type in EVENT_TYPES
+    ("actual", "i1"),   # Rank of the actual throw
+    ("stated", "i1"),   # Rank of the stated throw
+    ("reason", "i1"),   # Index of the kick reason in KICK_REASON
+])
+assert EVENT_DTYPE.itemsize == RECORD.size
+
+EVENT_TYPE_CODES = {event_type: i for i, event_type in enumerate(EVENT_TYPES)}
+KICK_REASON_CODES = {reason: i for i, reason in enumerate(KICK_REASON)}
+
+
+class EventStoreWriter(Tracer):
+    """Stream the events of Games to a file of packed records.
+
+    Being a Tracer, a writer can be passed to Game or Evaluation, which then calls
+    event() for every Event. Records are buffered and written in blocks.
+    """
+
+    def __init__(self, path: str, buffer_size: int = 1 << 16) -> None:
+        """
+        :param path: File to write to. Existing files are overwritten.
+        :param buffer_size: Number of bytes to collect before writing them to the file
+        """
+        self.path = path
+        self.buffer_size = buffer_size
+        self._buffer = bytearray()
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(MAGIC, VERSION))
+        self.n_events = 0
+
+    def event(self, game: Game, event: Event) -> None:
+        self.write(game.index, game.move_index, event)
+
+    def write(self, game_index: int, move_index: int, event: Event) -> None:
+        """Append a record of an Event"""
+        actual = stated = reason = -1
+        if isinstance(event, EventThrow):
+            actual = event.throw_actual.rank if event.throw_actual is not None else -1
+            stated = event.throw_stated.rank if event.throw_stated is not None else -1
+        elif isinstance(event, EventKick):
+            reason = KICK_REASON_CODES[event.reason]
+        player = event.player_id if event.player_id is not None else -1
+        self._buffer += RECORD.pack(game_index, move_index, player, EVENT_TYPE_CODES[event.event_type],
+                                    actual, stated, reason)
+        self.n_events += 1
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        self._file.write(self._buffer)
+        self._buffer.clear()
+        self._file.flush()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self) -> EventStoreWriter:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class EventStore:
+    """Read a file written by EventStoreWriter.
+
+    The file is memory-mapped, so only the parts that are accessed are loaded into memory.
+    `events` is a NumPy structured array with the fields of EVENT_DTYPE.
+    """
+    events: np.ndarray
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as file:
+            header = file.read(HEADER.size)
+            file.seek(0, 2)
+            n_bytes = file.tell() - HEADER.size
+        if len(header) != HEADER.size:
+            raise ValueError(f"{path} is too short to be an event store")
+        magic, version = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an event store")
+        if version != VERSION:
+            raise ValueError(f"Unsupported event store version {version} (expected {VERSION})")
+        if n_bytes % EVENT_DTYPE.itemsize != 0:
+            raise ValueError(f"{path} is truncated: {n_bytes} bytes of events aren't a whole number of events")
+        if n_bytes:
+            self.events = np.memmap(path, dtype=EVENT_DTYPE, mode="r", offset=HEADER.size)
+        else:
+            # Empty files can't be memory-mapped
+            self.events = np.empty(0, dtype=EVENT_DTYPE)
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def game(self, game_index: int) -> np.ndarray:
+        """Return the events of one game.
+
+        This assumes the games were written in order, as Evaluation does."""
+        games = self.events["game"]
+        start, stop = np.searchsorted(games, [game_index, game_index + 1])
+        return self.events[start:stop]
+
+    def ofType(self, event_type: EVENT_TYPES, events: Optional[np.ndarray] = None) -> np.ndarray:
+        """Return all events of a type
+
+        :param events: Events to select from. Defaults to all events."""
+        events = self.events if events is None else events
+        return events[events["type"] == EVENT_TYPE_CODES[event_type]]
+
+    def countKicks(self) -> np.ndarray:
+        """Count kicks per player and reason.
+
+        Returns a table with one row per player id and one column per KICK_REASON."""
+        kicks = self.ofType(EVENT_TYPES.KICK)
+        n_players = int(kicks["player"].max()) + 1 if len(kicks) else 0
+        counts = np.zeros((n_players, len(KICK_REASON)), dtype=np.int64)
+        np.add.at(counts, (kicks["player"], kicks["reason"]), 1)
+        return counts
@@ -0,0 +1,235 @@
+import copy
+from math import factorial
+import time
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+
+import constants as c
+from formatting import formatTable
+from gameevent import KICK_REASON
+from player import Player
+from strategytable import StrategyTable, StrategyNotCompilable, compileStrategy
+from utils import PROB_BY_NUM
+
+# Reasons for which players can be kicked in games of stateless players, in the order of the
+# columns of the kick tables. Compiled strategies always respond, so NO_RESPONSE can't happen.
+REASONS = (KICK_REASON.LYING, KICK_REASON.FALSE_ACCUSATION, KICK_REASON.FAILED_TO_BEAT_PREDECESSOR)
+_LYING, _FALSE_ACCUSATION, _FAILED = range(len(REASONS))
+# Number of values of the last stated rank: -1 (nothing to beat) and the 21 ranks, stored at rank + 1
+_N_LAST = c.N_THROW_VALUES + 1
+# Maximum number of distinct seatings to average over, beyond which solving takes too long
+MAX_SEATINGS = 200000
+
+
+class _Strategy:
+    """The parts of a StrategyTable that the solver needs, indexed by the last stated rank + 1"""
+
+    def __init__(self, table: StrategyTable) -> None:
+        prob = np.array(PROB_BY_NUM)
+        # Probability of doubting. There's nothing to doubt in the first move of a round.
+        self.doubt = np.concatenate(([0.0], table.doubt))
+        # table.stated[my_rank, last + 1, stated], weighted by the probability of my_rank
+        stated = table.stated * prob[:, None, None]
+        # Probability of stating each rank, and of stating the rank that was actually thrown
+        stated_any = stated.sum(axis=0)
+        stated_true = np.stack([stated[r, :, r] for r in range(c.N_THROW_VALUES)], axis=-1)
+        # Only ranks higher than the last stated one beat it
+        beats = np.arange(c.N_THROW_VALUES)[None, :] >= np.arange(_N_LAST)[:, None]
+        not_doubt = (1 - self.doubt)[:, None]
+        # advance[last + 1, stated, truthful]: probability of going on with the stated rank,
+        # having told the truth or lied
+        self.advance = np.stack([(stated_any - stated_true) * beats, stated_true * beats], axis=-1) * not_doubt[..., None]
+        # Probability of failing to beat the last stated rank
+        self.fail = (stated_any * ~beats).sum(axis=1) * not_doubt[:, 0]
+
+
+class ExactEvaluation:
+    """Compute the exact results of games between stateless players, without simulating them.
+
+    Between two kicks, the state of a game is given by the seat whose turn it is, the last
+    stated rank and whether it was the truth. The last stated rank grows with every move, so
+    the outcome of a round can be computed backwards from Mäxchen. After a kick, the game
+    starts over with the remaining players. The results of each game are computed by dynamic
+    programming over these rounds, and averaged over all seatings and first players, which
+    are random in Game.
+
+    Only the strategies of the players matter, so the results for a ring of strategies are
+    computed once and shared between all seatings and subsets of players in which it occurs.
+    The players must be stateless, see strategytable.compileStrategy(). The number of
+    seatings grows factorially with the number of players of different types.
+    """
+
+    players: List[Player]
+    # Probability that each player wins, indexed by id
+    win_rate: np.ndarray
+    # Expected number of moves of each game times 1 if the player wins it, else 0, indexed by id.
+    # getPlayerStats() divides it by the win rate.
+    win_moves: np.ndarray
+    # Probability that each player is kicked for each of REASONS, shape (players, reasons)
+    kick_rate: np.ndarray
+
+    def __init__(self, players: List[Player]) -> None:
+        self.players = [copy.copy(p) for p in players]
+        for i, player in enumerate(self.players):
+            player.id = i
+        # Players with equal strategies share an index in self._strategies
+        self._strategy_ids: List[int] = []
+        self._strategies: List[_Strategy] = []
+        compiled: Dict[Tuple[type, str], int] = {}
+        for p in self.players:
+            key = (type(p), repr(sorted((k, v) for k, v in vars(p).items() if k != "id")))
+            if key not in compiled:
+                try:
+                    table = compileStrategy(p)
+                except StrategyNotCompilable as e:
+                    raise ValueError(f"ExactEvaluation can't solve games with {p!r}: {e}") from e
+                compiled[key] = len(self._strategies)
+                self._strategies.append(_Strategy(table))
+            self._strategy_ids.append(compiled[key])
+        # Results of _solveRing() for every ring of strategies that was solved
+        self._rings: Dict[Tuple[int, ...], Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+        self.done = False
+        self.t_start = self.t_end = -1.0
+
+    def run(self) -> None:
+        n = len(self.players)
+        if n < 2:
+            raise ValueError(f"ExactEvaluation needs at least two players, got {n}")
+        counts = [self._strategy_ids.count(s) for s in range(len(self._strategies))]
+        n_seatings = factorial(n)
+        for count in counts:
+            n_seatings //= factorial(count)
+        if n_seatings > MAX_SEATINGS:
+            raise ValueError(f"Too many distinct seatings to solve exactly ({n_seatings} > {MAX_SEATINGS})")
+
+        self.t_start = time.time()
+        # Every distinct order of strategies, starting at the first player, is equally likely
+        wins = np.zeros(len(counts))
+        moves = np.zeros(len(counts))
+        kicks = np.zeros((len(counts), len(REASONS)))
+        for ring in _distinctPermutations(list(counts)):
+            ring_wins, ring_moves, ring_kicks = self._solveRing(ring)
+            strategies = np.array(ring)
+            np.add.at(wins, strategies, ring_wins)
+            np.add.at(moves, strategies, ring_moves)
+            np.add.at(kicks, strategies, ring_kicks)
+        # Players with the same strategy are interchangeable, so they share the results equally
+        per_player = np.array([n_seatings * count for count in counts], dtype=float)
+        ids = np.array(self._strategy_ids)
+        self.win_rate = (wins / per_player)[ids]
+        self.win_moves = (moves / per_player)[ids]
+        self.kick_rate = (kicks / per_player[:, None])[ids]
+        self.t_end = time.time()
+        self.done = True
+
+    def _solveRing(self, ring: Tuple[int, ...]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Solve the rest of a game for the strategies of the alive players in seating order.
+
+        The player at position 0 has the first move. Returns, by position, the probability of
+        winning, the expected number of moves times the indicator of winning and the
+        probability of being kicked for each reason.
+        """
+        if ring in self._rings:
+            return self._rings[ring]
+        m = len(ring)
+        prob, moves = self._solveRound(ring)
+        wins = np.zeros(m)
+        win_moves = np.zeros(m)
+        kicks = np.zeros((m, len(REASONS)))
+        for kicked, reason in zip(*np.nonzero(prob)):
+            p, p_moves = prob[kicked, reason], moves[kicked, reason]
+            kicks[kicked, reason] += p
+            # After a lie was revealed, the player after the one who doubted has the first move,
+            # otherwise the player after the kicked one
+            start = kicked + 2 if reason == _LYING else kicked + 1
+            positions = [(start + i) % m for i in range(m) if (start + i) % m != kicked]
+            if m == 2:
+                wins[positions[0]] += p
+                win_moves[positions[0]] += p_moves
+                continue
+            rest_wins, rest_moves, rest_kicks = self._solveRing(tuple(ring[x] for x in positions))
+            wins[positions] += p * rest_wins
+            # Moves of this round and of the rest of the game, in games the player wins
+            win_moves[positions] += p_moves * rest_wins + p * rest_moves
+            kicks[positions] += p * rest_kicks
+        self._rings[ring] = wins, win_moves, kicks
+        return wins, win_moves, kicks
+
+    def _solveRound(self, ring: Tuple[int, ...]) -> Tuple[np.ndarray, np.ndarray]:
+        """Compute how a round that starts at position 0 ends.
+
+        Returns the probability that the player at each position is kicked for each reason,
+        and the expected number of moves of the round times the indicator of that outcome.
+        """
+        m = len(ring)
+        n_outcomes = m * len(REASONS)
+        doubt = np.array([self._strategies[s].doubt for s in ring])
+        advance = np.array([self._strategies[s].advance for s in ring])
+        fail = np.array([self._strategies[s].fail for s in ring])
+        positions = np.arange(m)
+        following = (positions + 1) % m
+        preceding = (positions - 1) % m
+        # value[position, last + 1, truthful] holds the probabilities of the outcomes from that
+        # state, followed by the expected numbers of moves times the same indicators
+        value = np.zeros((m, _N_LAST, 2, 2 * n_outcomes))
+        for last in range(_N_LAST - 1, -1, -1):
+            # Stated ranks must be higher than the last one, and set the next value of `last`
+            go_on = np.einsum("psu,psuk->pk", advance[:, last, last:], value[following, last + 1:])
+            kicked = np.zeros((m, 2, n_outcomes))
+            # Doubting the truth kicks the doubter, doubting a lie the previous player
+            kicked[positions, 1, positions * len(REASONS) + _FALSE_ACCUSATION] += doubt[:, last]
+            kicked[positions, 0, preceding * len(REASONS) + _LYING] += doubt[:, last]
+            kicked[positions, :, positions * len(REASONS) + _FAILED] += fail[:, last, None]
+            prob = kicked + go_on[:, None, :n_outcomes]
+            value[:, last, :, :n_outcomes] = prob
+            # Every outcome that is reached from here takes this move, plus the moves after it
+            value[:, last, :, n_outcomes:] = prob + go_on[:, None, n_outcomes:]
+        start = value[0, 0, 0]
+        return start[:n_outcomes].reshape(m, len(REASONS)), start[n_outcomes:].reshape(m, len(REASONS))
+
+    def getPlayerStats(self, player_id) -> Tuple[float, ...]:
+        """Return the same statistics as Evaluation.getPlayerStats(), as exact values"""
+        assert self.done
+        win_rate = float(self.win_rate[player_id])
+        average_win_round = float(self.win_moves[player_id] / win_rate) if win_rate > 0 else 0.0
+        loss_rate = 1 - win_rate
+        kick_rates = dict(zip(REASONS, self.kick_rate[player_id]))
+        loss_reasons_freq = [float(kick_rates.get(reason, 0.0) / loss_rate) if loss_rate > 0 else 0.0
+                             for reason in KICK_REASON]
+        return win_rate, average_win_round, *loss_reasons_freq
+
+    def prettyResults(self, sort_by_winrate=True) -> str:
+        """Format the results like Evaluation.prettyResults()"""
+        assert self.done
+        pretty_string = f"Solved exactly in {self.t_end - self.t_start:.3f} seconds " \
+                        f"({len(self._rings)} distinct rings of players)\n"
+        table: List[List[str]] = [
+                ["player", "win rate", "avg. win move", "loss causes", "", "", ""],
+                ["", "", "", "lie", "false acc", "worse", "no rep"]
+        ]
+        player_stats = [(repr(p), self.getPlayerStats(p.id)[:6]) for p in self.players]
+        if sort_by_winrate:
+            player_stats.sort(key=lambda row: row[1][0], reverse=True)
+        table.extend([[name, *[f"{el:.4f}" for el in stats]] for name, stats in player_stats])
+        return pretty_string + formatTable(table)
+
+
+def _distinctPermutations(counts: List[int]) -> Iterator[Tuple[int, ...]]:
+    """Generate every distinct sequence that contains each index i exactly counts[i] times"""
+    n = sum(counts)
+    sequence: List[int] = []
+
+    def extend() -> Iterator[Tuple[int, ...]]:
+        if len(sequence) == n:
+            yield tuple(sequence)
+            return
+        for i, count in enumerate(counts):
+            if count:
+                counts[i] -= 1
+                sequence.append(i)
+                yield from extend()
+                sequence.pop()
+                counts[i] += 1
+
+    return extend()
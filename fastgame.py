@@ -0,0 +1,141 @@
+from random import Random, randrange
+from sys import maxsize
+from typing import List, Optional
+
+from game import TooFewPlayers
+from gameevent import KICK_REASON
+from player import Player
+from throw import DICE_RANKS
+
+
+class FastGame:
+    """Implement the rules of Game on plain Throw ranks.
+
+    Throws are represented by their rank (0 to 20, or -1 for 'no throw') and no Events,
+    log or log messages are created. Only the counters that Evaluation needs are kept:
+    the winner, the number of moves and who was kicked for which reason.
+
+    The PRNG is used in exactly the same order as in Game, so a FastGame and a Game
+    with the same seed and players have the same outcome.
+
+    One instance can play any number of games; the per-game state is stored in
+    lists that are allocated once and reset at the start of every game.
+    """
+
+    players: List[Player]
+    # Id of the player who won the last game
+    winner_id: Optional[int]
+    # Number of moves of the last game
+    n_moves: int
+    # Ids of the kicked players and the reasons for which they were kicked, in order.
+    # Only the first `n_kicks` entries belong to the last game.
+    kick_ids: List[int]
+    kick_reasons: List[KICK_REASON]
+    n_kicks: int
+
+    def __init__(self, players: List[Player], shuffle_players: bool = True) -> None:
+        if not self.supports(players):
+            raise ValueError("FastGame only supports rank based players that don't listen to events")
+        self.players = players
+        self.shuffle_players = shuffle_players
+        n = len(players)
+        self._ids = [p.id for p in players]
+        self._get_doubt = [p.getDoubtRank for p in players]
+        self._get_throw_stated = [p.getThrowStatedRank for p in players]
+        # Seat -> index in self.players
+        self._seating = list(range(n))
+        self._alive = [True] * n
+        # Ring of alive seats as a doubly linked list, see Game
+        self._next_seat = [0] * n
+        self._prev_seat = [0] * n
+        self.winner_id = None
+        self.n_moves = 0
+        self.kick_ids = [0] * n
+        self.kick_reasons = [KICK_REASON.NO_RESPONSE] * n
+        self.n_kicks = 0
+
+    @staticmethod
+    def supports(players: List[Player]) -> bool:
+        """Check whether all players can take part in a FastGame"""
+        return all(p.isRankBased() and not p.listens_to_events for p in players)
+
+    def play(self, seed: int = None) -> None:
+        """Play a whole game.
+
+        :param seed: Seed for the PRNG. A random one is used if not specified."""
+        rng = Random(seed if seed is not None else randrange(maxsize))
+        n = len(self.players)
+        if n < 2:
+            raise TooFewPlayers(n)
+        seating = self._seating
+        seating[:] = range(n)
+        if self.shuffle_players:
+            # Shuffling the indices consumes the PRNG the same way as shuffling the players
+            rng.shuffle(seating)
+        alive = self._alive
+        alive[:] = [True] * n
+        next_seat = self._next_seat
+        prev_seat = self._prev_seat
+        for i in range(n):
+            next_seat[i] = i + 1
+            prev_seat[i] = i - 1
+        next_seat[-1] = 0
+        prev_seat[0] = n - 1
+        get_doubt = self._get_doubt
+        get_throw_stated = self._get_throw_stated
+        ids = self._ids
+        kick_ids = self.kick_ids
+        kick_reasons = self.kick_reasons
+        n_kicks = 0
+
+        current = rng.randrange(0, n)
+        n_alive = n
+        last_stated = last_actual = -1
+        i_move = -1
+        while True:
+            i_move += 1
+            player = seating[current]
+            kicked = -1
+            if last_stated < 0:
+                doubt: Optional[bool] = False
+            else:
+                doubt = get_doubt[player](last_stated, i_move, rng)
+
+            if doubt is None:
+                kicked, reason = current, KICK_REASON.NO_RESPONSE
+            elif doubt:
+                if last_stated == last_actual:
+                    kicked, reason = current, KICK_REASON.FALSE_ACCUSATION
+                else:
+                    # Previous alive player lied
+                    kicked = prev_seat[current]
+                    reason = KICK_REASON.LYING
+            else:
+                actual = DICE_RANKS[rng.randrange(36)]
+                stated = get_throw_stated[player](actual, last_stated, i_move, rng)
+                if stated is None:
+                    kicked, reason = current, KICK_REASON.NO_RESPONSE
+                elif last_stated < 0 or stated > last_stated:
+                    last_stated = stated
+                    last_actual = actual
+                else:
+                    kicked, reason = current, KICK_REASON.FAILED_TO_BEAT_PREDECESSOR
+
+            if kicked >= 0:
+                alive[kicked] = False
+                next_seat[prev_seat[kicked]] = next_seat[kicked]
+                prev_seat[next_seat[kicked]] = prev_seat[kicked]
+                n_alive -= 1
+                last_stated = last_actual = -1
+                kick_ids[n_kicks] = ids[seating[kicked]]
+                kick_reasons[n_kicks] = reason
+                n_kicks += 1
+                if n_alive == 1:
+                    break
+
+            # A kicked seat keeps its links, so this also works if the current player was just kicked
+            current = next_seat[current]
+
+        self.winner_id = ids[seating[current if alive[current] else next_seat[current]]]
+        self.n_moves = i_move + 1
+        self.n_kicks = n_kicks
@@ -27,12 +27,18 @@ def formatTable(table: List[List[str]], spaces: int = 2) -> str:
     return output
 
 
-def printProgress(prg: int, total: int, end: str = "\n"):
+def progressBar(prg: int, total: int) -> str:
     """Simple progress bar.
 
     :param total: Inner width of the progress bar
     :param prg: Progress
+    """
+    return "[" + "#" * prg + "." * (total - prg) + "]"
+
+
+def printProgress(prg: int, total: int, end: str = "\n"):
+    """Print a progress bar, see progressBar().
+
     :param end: Optional. str to print after the progress bar
     """
-    output = "[" + "#" * prg + "." * (total - prg) + "]"
-    print(output, end=end)
+    print(progressBar(prg, total), end=end)
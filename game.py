@@ -3,12 +3,15 @@ from copy import copy
 from random import Random, randrange
 from sys import maxsize
 from contextlib import suppress
-from typing import List, Set, Optional
+from typing import Callable, Dict, List, Set, Optional, Union
 
-from gamelog import GameLog
+from gamelog import GameLog, CountingLog
 import gameevent
+from tracing import Tracer
+from observation import ObservationService
+from timing import DecisionTimer
 from player import Player
-from throw import Throw, NoneThrow
+from throw import Throw, NoneThrow, DICE_THROWS
 
 class TooFewPlayers(Exception):
     """Is raised when too few players have been provided to the Game class"""
@@ -32,6 +35,12 @@ class Game:
 
     players: List[Player]  # All players participating in the game
     alive_players: List[bool] # For each player, store if they are still in the game (i. e. if they're 'alive')
+    # The alive players form a ring, stored as a doubly linked list over the seat indices: _next_seat[i]
+    # and _prev_seat[i] are the next and previous alive seats of seat i. A kicked seat keeps the
+    # links it had when it was removed, which still lead to alive seats.
+    _next_seat: List[int]
+    _prev_seat: List[int]
+    _n_alive: int
     current_player: int  # Index of the player who's turn it is currently
     last_throw_actual: Optional[Throw] # The result the last player actually threw
     last_throw_stated: Optional[Throw] # The result the last player said they threw
@@ -39,13 +48,42 @@ class Game:
     _initialized: bool
     _running: bool
     # Log for tracking everything that happens in a game
-    log: GameLog
+    log: Union[GameLog, CountingLog]
     # Pseudo-random number generator
     rng: Random # random.Random
-
-    def __init__(self, players: List[Player], seed: int = None, shuffle_players: bool = True, disable_assign_ids: bool = False) -> None:
-        self.players = players
+    # Receives log messages and events. Tracing is disabled if this is None.
+    tracer: Optional[Tracer]
+    # Index of the game in the Evaluation it belongs to
+    index: int
+    # Public statistics about the players, which are updated with every event
+    observations: Optional[ObservationService]
+    # Measures how long players take for their decisions. Timing is disabled if this is None.
+    timer: Optional[DecisionTimer]
+    # getDoubt() and getThrowStated() of the player on each seat, wrapped by the timer if there is one
+    _get_doubt: List[Callable]
+    _get_throw_stated: List[Callable]
+    # For each event type, the onEvent() methods of the players subscribed to it, in seating order
+    _listeners: Dict[gameevent.EVENT_TYPES, List[Callable]]
+
+    def __init__(self, players: List[Player], seed: int = None, shuffle_players: bool = True, disable_assign_ids: bool = False,
+                 tracer: Optional[Tracer] = None, log: Union[GameLog, CountingLog, None] = None, game_index: int = 0,
+                 observations: Optional[ObservationService] = None, timer: Optional[DecisionTimer] = None) -> None:
+        """
+        :param observations: Statistics to update with every event. Players that should read
+          them must be given the same service via Player.shareObservations().
+        :param timer: Measures the duration of every call to getDoubt(), getThrowStated() and onEvent()
+        :param game_index: Index of the game in the Evaluation it belongs to
+        :param log: Log to write the events of the game to. By default, a new GameLog is created,
+          which stores every event.
+        """
+        # Copy the list so that shuffling doesn't change the seating order of the caller's list,
+        # which would make the seating of a game depend on the games played before it
+        self.players = list(players)
         self.alive_players = [True for _ in self.players]
+        n = len(self.players)
+        self._next_seat = [(i + 1) % n for i in range(n)]
+        self._prev_seat = [(i - 1) % n for i in range(n)]
+        self._n_alive = n
         if disable_assign_ids:
             # If assigning unique IDs was disabled, check if the ones the players have are unique
             # If they are not, exit
@@ -60,13 +98,15 @@ class Game:
         self.last_throw_actual = None
         self._initialized = False
         self._running = False
-
-        self.log = GameLog(self.players)
+        self.tracer = tracer
+        self.index = game_index
+        self.observations = observations
+        self.timer = timer
 
         # Initialize PRNG. Use seed if specified, otherwise generate a new seed.
         # The important part is not the randomness source but that the seed is known
         # so that the game can be reproduced later.
-        self._seed = seed if seed else randrange(maxsize) # random.randrange, sys.maxsize
+        self._seed = seed if seed is not None else randrange(maxsize) # random.randrange, sys.maxsize
         self.rng = Random(self._seed)
 
         # Yes, the order of self.players changes, while self.alive_players stays the same.
@@ -75,6 +115,20 @@ class Game:
         if shuffle_players:
             self.rng.shuffle(self.players)
 
+        # Created after shuffling, so that the log lists the players in the order they are seated
+        self.log = log if log is not None else GameLog(self.players)
+        self._get_doubt = [self._playerMethod(p, "getDoubt") for p in self.players]
+        self._get_throw_stated = [self._playerMethod(p, "getThrowStated") for p in self.players]
+        # Built once, so that passing on an event only visits the players subscribed to its type
+        self._listeners = {event_type: [self._playerMethod(p, "onEvent") for p in self.players if p.subscribesTo(event_type)]
+                           for event_type in gameevent.EVENT_TYPES}
+
+    def _playerMethod(self, player: Player, method: str) -> Callable:
+        """Return a bound method of a player, which is timed if the game has a timer"""
+        if self.timer is not None:
+            return self.timer.timed(player, method)
+        return getattr(player, method)
+
     @property
     def running(self) -> bool:
         return self._running
@@ -94,7 +148,8 @@ class Game:
         Then, set some flags and select a random player to start the game.
         """
         if len(self.players) == self.countAlivePlayers() > 1:
-            logging.info("=== Game initialized ===")
+            if self.tracer is not None:
+                self.tracer.message("=== Game initialized ===")
             self.current_player = self.rng.randrange(0, len(self.players))
             self._initialized = True
             self._running = True
@@ -126,7 +181,8 @@ class Game:
             return
 
         self.move_index += 1
-        logging.info(f"Move {self.move_index} | {self.countAlivePlayers()} players left")
+        if self.tracer is not None:
+            self.tracer.message(f"Move {self.move_index} | {self.countAlivePlayers()} players left")
         self.log.newRound()
         self.handlePlayerMove()
         
@@ -139,13 +195,19 @@ class Game:
             self._running = False
         elif alive_players == 1:
             # Spiel ist vorbei
-            logging.info(f"One player left, game is over")
-            logging.info(f"{repr(self.players[0])} won")
-            assert isinstance(self.players[0].id, int)
-            self.happen(gameevent.EventFinish(self.players[0].id))
+            if self.tracer is not None:
+                self.tracer.message(f"One player left, game is over")
+            # Either the current player is the winner, or they were just kicked and link to the winner
+            winner = self.players[self.nextAlivePlayer(self.current_player)]
+            if self.tracer is not None:
+                self.tracer.message(f"{repr(winner)} won")
+            assert isinstance(winner.id, int)
+            self.happen(gameevent.EventFinish(winner.id))
             self._running = False
 
-        self.current_player = self.nextAlivePlayer(self.current_player + 1)
+        # The current player is either alive or was kicked during this move, so their link
+        # leads directly to the next alive player
+        self.current_player = self._next_seat[self.current_player]
 
     def handlePlayerMove(self) -> None:
         """Perform a move with the player who's turn it currently is.
@@ -167,46 +229,51 @@ class Game:
             doubt_predecessor = False
         else:
             # Ask the current player whether they accept or doubt their predecessor's throw result.
-            doubt_predecessor = self.players[self.current_player].getDoubt(self.last_throw_stated, self.move_index, self.rng)
+            doubt_predecessor = self._get_doubt[self.current_player](self.last_throw_stated, self.move_index, self.rng)
 
         if doubt_predecessor is None:
             # Player didn't answer
-            logging.info(
-                    f"{repr(self.players[self.current_player])} will be removed (got no response when asked for doubt)")
+            if self.tracer is not None:
+                self.tracer.message(f"{repr(self.players[self.current_player])} will be removed (got no response when asked for doubt)")
             self.kickPlayer(self.current_player, gameevent.KICK_REASON.NO_RESPONSE)
         elif doubt_predecessor:
             # Player doubts their predecessor
-            logging.info(f"{repr(self.players[self.current_player])} chose to doubt their predecessor.")
+            if self.tracer is not None:
+                self.tracer.message(f"{repr(self.players[self.current_player])} chose to doubt their predecessor.")
             self.happen(gameevent.EventDoubt(self.players[self.current_player].id)) # type: ignore
             if self.last_throw_stated == self.last_throw_actual:
                 # Previous player told the truth -> current player is in the wrong, kick them
                 playerToKick = self.current_player
                 self.kickPlayer(playerToKick, gameevent.KICK_REASON.FALSE_ACCUSATION)
-                logging.info(f"Previous player was wrongfully doubted, {repr(self.players[playerToKick])} will be removed")
+                if self.tracer is not None:
+                    self.tracer.message(f"Previous player was wrongfully doubted, {repr(self.players[playerToKick])} will be removed")
             else:
                 # Previous player lied -> current player is right, kick previous player
-                playerToKick = self.prevAlivePlayer(self.current_player - 1)
+                playerToKick = self._prev_seat[self.current_player]
                 self.kickPlayer(playerToKick, gameevent.KICK_REASON.LYING)
-                logging.info(f"Previous player was rightfully doubted, {repr(self.players[playerToKick])} will be removed")
+                if self.tracer is not None:
+                    self.tracer.message(f"Previous player was rightfully doubted, {repr(self.players[playerToKick])} will be removed")
 
         else:
             # Player accepts their predecessors result
             # Now, it's their turn to throw dice
             if self.last_throw_stated is not None:
-                logging.info(f"{repr(self.players[self.current_player])} chose not to doubt their predecessor.")
+                if self.tracer is not None:
+                    self.tracer.message(f"{repr(self.players[self.current_player])} chose not to doubt their predecessor.")
             # Generate a random dice throw
             currentThrow = self.randomThrow()
             # Ask the player what result they want to tell to the other players
-            throwStated = self.players[self.current_player].getThrowStated(currentThrow, self.last_throw_stated,
+            throwStated = self._get_throw_stated[self.current_player](currentThrow, self.last_throw_stated,
                     self.move_index, self.rng)
             if throwStated is None:
                 # Player didn't answer
                 self.kickPlayer(self.current_player, gameevent.KICK_REASON.NO_RESPONSE)
-                logging.info(f"{repr(self.players[self.current_player])} will be removed (got no response when asked for Throw)")
+                if self.tracer is not None:
+                    self.tracer.message(f"{repr(self.players[self.current_player])} will be removed (got no response when asked for Throw)")
             else:
                 # Player did answer
-                logging.info(
-                        f"{repr(self.players[self.current_player])} threw {str(currentThrow)}, states they threw {throwStated}")
+                if self.tracer is not None:
+                    self.tracer.message(f"{repr(self.players[self.current_player])} threw {str(currentThrow)}, states they threw {throwStated}")
                 # This is the only way mypy will accept that self.players[self.current_player].id is not None....
                 id_ = self.players[self.current_player].id
                 assert isinstance(id_, int)
@@ -219,14 +286,15 @@ class Game:
                 else:
                     if throwStated > self.last_throw_stated:
                         # Beats predecessor
-                        logging.info(
-                                f"Stated current throw {throwStated} beats stated previous throw {self.last_throw_stated}")
+                        if self.tracer is not None:
+                            self.tracer.message(f"Stated current throw {throwStated} beats stated previous throw {self.last_throw_stated}")
                         self.last_throw_stated = throwStated
                         self.last_throw_actual = currentThrow
                     else:
                         # Does not beat predecessor
                         self.kickPlayer(self.current_player, gameevent.KICK_REASON.FAILED_TO_BEAT_PREDECESSOR)
-                        logging.info(f"Stated current throw {throwStated} doesn't beat stated previous throw {self.last_throw_stated}")
+                        if self.tracer is not None:
+                            self.tracer.message(f"Stated current throw {throwStated} doesn't beat stated previous throw {self.last_throw_stated}")
 
     def kickPlayer(self, i: int, reason: gameevent.KICK_REASON) -> None:
         """Remove a player from the game.
@@ -240,28 +308,43 @@ class Game:
         id_ = self.players[i].id
         assert isinstance(id_, int)
         self.alive_players[i] = False
+        # Unlink the seat from the ring of alive players
+        prev_seat, next_seat = self._prev_seat[i], self._next_seat[i]
+        self._next_seat[prev_seat] = next_seat
+        self._prev_seat[next_seat] = prev_seat
+        self._n_alive -= 1
 
         self.last_throw_stated = None
         self.last_throw_actual = None 
 
         self.happen(gameevent.EventKick(id_, reason))
-        logging.info("Value to beat has been reset.")
+        if self.tracer is not None:
+            self.tracer.message("Value to beat has been reset.")
 
     def happen(self, event: gameevent.Event) -> None:
         """Write an event to the log and alert other players.
 
-        For each player, if they have the attribute listens_to_events set to True,
-        their onEvent method will be called.
+        The onEvent method of every player that subscribes to the type of the event
+        (see Player.subscribesTo) will be called, and that of the ObservationService if it
+        subscribes to the type.
 
         :param event: Event that has occured"""
         self.log.happen(event)
+        if self.tracer is not None:
+            self.tracer.event(self, event)
+        if self.observations is not None and event.event_type in self.observations.subscribed_events:
+            self.observations.onEvent(event)
 
+        listeners = self._listeners[event.event_type]
+        if not listeners:
+            return
         if isinstance(event, gameevent.EventThrow):
-            # Delete the value of the actual throw, so that other players can't know what it was
-            event.throw_actual = NoneThrow()
-        for player in self.players:
-            if player.listens_to_events:
-                player.onEvent(event)
+            # Pass on a copy without the actual throw, so that other players can't know what it was.
+            # The log keeps the original.
+            event = gameevent.EventThrow(event.player_id, NoneThrow(), event.throw_stated)
+            event.is_truthful = None
+        for on_event in listeners:
+            on_event(event)
 
     def assignIds(self) -> None:
         """Assign a unique ID to each player"""
@@ -286,10 +369,10 @@ class Game:
 
         :param start: Index at which to start looking for an alive player.
           Can be a negative value."""
-        assert any(self.alive_players), "Cannot find an alive player; none are left"
+        assert self._n_alive > 0, "Cannot find an alive player; none are left"
         start %= len(self.players)
         while not self.alive_players[start]:
-            start = (start + 1) % len(self.players)
+            start = self._next_seat[start]
         return start
     
     def prevAlivePlayer(self, start):
@@ -297,19 +380,20 @@ class Game:
 
         :param start: Index at which to start looking for an alive player.
           Can be a negative value."""
-        assert any(self.alive_players), "Cannot find an alive player; none are left"
+        assert self._n_alive > 0, "Cannot find an alive player; none are left"
         start %= len(self.players)
         while not self.alive_players[start]:
-            start = (start - 1) % len(self.players)
+            start = self._prev_seat[start]
         return start
 
 
     def countAlivePlayers(self):
         """Return the number of players still in the game"""
-        return sum(self.alive_players)
+        return self._n_alive
 
     def randomThrow(self) -> Throw:
         """Generate a random Throw.
 
         This uses the instance's PRNG to ensure reproducibility."""
-        return Throw(self.rng.randint(1, 6), self.rng.randint(1, 6))
+        # A single draw from the 36 equally likely outcomes of rolling two dice
+        return DICE_THROWS[self.rng.randrange(36)]
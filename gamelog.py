@@ -1,10 +1,10 @@
 # Necessary for type hints of methods that include their own class
 from __future__ import annotations
-from typing import Optional, List
+from typing import Optional, List, Dict
 from contextlib import suppress
 import copy
 
-from gameevent import Event, EventFinish, EventAbort
+from gameevent import Event, EventFinish, EventAbort, EVENT_TYPES, KICK_REASON
 from player import Player
 
 
@@ -81,3 +81,54 @@ class GameLog:
         """Gibt die Anzahl der Runden des Spiels an."""
         return len(self.moves)
 
+
+class CountingLog:
+    """Log that only keeps the counters an Evaluation needs instead of storing every Event.
+
+    Kicks are counted directly in the `loss_reason` table that is passed in, which is shared by
+    all games of an Evaluation. The same instance can be used for any number of games by calling
+    reset() before each one, so no memory is allocated per game or per move.
+    """
+    # Same layout as Evaluation.loss_reason: {player_id: {reason: count}}
+    loss_reason: Dict[Optional[int], Dict[KICK_REASON, int]]
+    n_rounds: int
+    winner_id: Optional[int]
+    finished: bool
+
+    def __init__(self, loss_reason: Dict[Optional[int], Dict[KICK_REASON, int]]) -> None:
+        self.loss_reason = loss_reason
+        self.reset()
+
+    def reset(self) -> None:
+        """Prepare for a new game"""
+        self.n_rounds = 0
+        self.winner_id = None
+        self.finished = False
+
+    def happen(self, event: Event) -> None:
+        """Count an event"""
+        event_type = event.event_type
+        if event_type is EVENT_TYPES.KICK:
+            self.loss_reason[event.player_id][event.reason] += 1  # type: ignore
+        elif event_type is EVENT_TYPES.FINISH:
+            self.winner_id = event.player_id
+            self.finished = True
+        elif event_type is EVENT_TYPES.ABORT:
+            self.finished = True
+
+    def newRound(self) -> None:
+        self.n_rounds += 1
+
+    def pretty(self) -> str:
+        """Return a summary of the game, since the individual Events are not stored"""
+        lines = [f"Game with {self.n_rounds} round(s), winner: " + ("none" if self.winner_id is None else f"player with id {self.winner_id}")]
+        if not self.finished:
+            lines.append("Note: Game has not finished.")
+        return "\n".join(lines)
+
+    def hasFinished(self) -> bool:
+        """Determine whether the Game that this log corresponds to has finished"""
+        return self.finished
+
+    def countRounds(self) -> int:
+        return self.n_rounds
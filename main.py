@@ -1,9 +1,12 @@
-from evaluate import Evaluation
+from evaluate import Evaluation, BatchNotSupported
 from argp import ArgumentParser
 from player import FLAGS_TO_PLAYERS
 from game import TooFewPlayers
 import logging
 from disk import existsPathToFile
+from tracing import LogTracer, MultiTracer
+from timing import DecisionTimer
+from metrics import MetricsExporter, MetricsError
 
 logging.basicConfig(format='[%(levelname)s] %(message)s', level=logging.ERROR)
 
@@ -29,8 +32,8 @@ def main():
         parser.printHelp()
         logging.error("You must specify at least one player")
         exit(1)
+    log_path = None
     if not parser.getFlag("no-write").set:
-        log_path = None
         log_path_flag = parser.getFlag("out-file")
         if log_path_flag.set:
             log_path = log_path_flag.value
@@ -38,19 +41,72 @@ def main():
                 logging.error(f"Can't write to {log_path}: Directory doesn't exist.")
                 exit(1)
  
+    if parser.getFlag("exact").set:
+        solveExactly(players)
+        return
+
+    tracers = []
+    if parser.getFlag("verbose").set:
+        # Log every move of every game
+        logging.getLogger().setLevel(logging.INFO)
+        tracers.append(LogTracer())
+    event_store = None
+    event_store_flag = parser.getFlag("event-store")
+    if event_store_flag.set:
+        if not existsPathToFile(event_store_flag.value):
+            logging.error(f"Can't write to {event_store_flag.value}: Directory doesn't exist.")
+            exit(1)
+        # eventstore depends on numpy, so only import it when needed
+        from eventstore import EventStoreWriter
+        event_store = EventStoreWriter(event_store_flag.value)
+        tracers.append(event_store)
+    tracer = (tracers[0] if len(tracers) == 1 else MultiTracer(tracers)) if tracers else None
+
+    metrics = None
+    metrics_port, metrics_file = parser.getFlag("metrics-port"), parser.getFlag("metrics-file")
+    if metrics_port.set or metrics_file.set:
+        if metrics_file.set and not existsPathToFile(metrics_file.value):
+            logging.error(f"Can't write to {metrics_file.value}: Directory doesn't exist.")
+            exit(1)
+        metrics = MetricsExporter(port=metrics_port.value, path=metrics_file.value)
+
     # Perform the Evaluation
     ev = Evaluation(players, parser.n_reps,
-                    show_progress=not parser.getFlag("quiet").set)
+                    show_progress=not parser.getFlag("quiet").set,
+                    workers=parser.getFlag("jobs").value or 1,
+                    seed=parser.getFlag("seed").value,
+                    batch=parser.getFlag("batch").set,
+                    tracer=tracer,
+                    precision=parser.getFlag("precision").value,
+                    metrics=metrics,
+                    timer=DecisionTimer() if parser.getFlag("time-decisions").set else None)
+    if parser.getFlag("replay").set:
+        replay(ev, parser.getFlag("replay").value)
+        return
     try:
         ev.run()
     except TooFewPlayers as e:
         print(e.message)
         exit(1)
+    except BatchNotSupported as e:
+        print(e)
+        exit(1)
+    except MetricsError as e:
+        logging.error(e)
+        exit(1)
+    finally:
+        if event_store is not None:
+            event_store.close()
 
-    ev.saveResultsToDisk(log_path=log_path)
+    if not parser.getFlag("no-write").set:
+        ev.saveResultsToDisk(log_path=log_path)
     print(ev.prettyResults(sort_by_winrate=not parser.getFlag("no-sort").set, force_rerender=True))
 
     # Plot the results
+    plot_out = parser.getFlag("plot-out")
+    if plot_out.set:
+        plotToFiles(ev, plot_out.value)
+        return
     if parser.getFlag("plot-all").set:
         ev.plotWRandLR()
     else:
@@ -58,6 +114,55 @@ def main():
             ev.plotWinRate()
         if parser.getFlag("plot-loss-reason").set:
             ev.plotLossReason()
+    if parser.getFlag("plot-game-length").set:
+        ev.plotGameLength()
+
+
+def solveExactly(players):
+    """Print the exact results of the games between the players instead of simulating them"""
+    # exact depends on numpy, so only import it when needed
+    from exact import ExactEvaluation
+    try:
+        ev = ExactEvaluation(players)
+        ev.run()
+    except ValueError as e:
+        print(e)
+        exit(1)
+    print(ev.prettyResults(sort_by_winrate=not parser.getFlag("no-sort").set))
+
+
+def plotToFiles(ev: Evaluation, out_dir: str):
+    """Render the requested plots, or all of them if none was requested, to files"""
+    requested = {
+        "win_rate": parser.getFlag("plot-all").set or parser.getFlag("plot-win-rate").set,
+        "loss_reason": parser.getFlag("plot-all").set or parser.getFlag("plot-loss-reason").set,
+        "game_length": parser.getFlag("plot-game-length").set,
+    }
+    figure_names = [name for name, is_requested in requested.items() if is_requested] or list(requested)
+    formats = (parser.getFlag("format").value or "png").split(",")
+    try:
+        process = ev.plotToFiles(out_dir, formats, figure_names)
+    except (ValueError, OSError) as e:
+        logging.error(e)
+        exit(1)
+    process.join()
+    if process.exitcode != 0:
+        logging.error(f"Writing the plots to {out_dir} failed")
+        exit(1)
+
+
+def replay(ev: Evaluation, game_index: int):
+    """Replay a single game of an Evaluation and print its log"""
+    if not parser.getFlag("seed").set:
+        logging.error("--replay requires the seed of the simulation (--seed)")
+        exit(1)
+    try:
+        game = ev.replay(game_index)
+    except (ValueError, TooFewPlayers) as e:
+        print(getattr(e, "message", e))
+        exit(1)
+    print(f"Game {game_index} (seed {game.seed}):")
+    print(game.log.pretty())
 
 
 if __name__ == '__main__':
@@ -0,0 +1,161 @@
+from contextlib import contextmanager
+import os
+import threading
+from typing import Iterator, List, Optional, TYPE_CHECKING
+
+import constants as c
+from gameevent import KICK_REASON
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+    from evaluate import Evaluation
+
+# Prefix of the names of all metrics
+PREFIX = "maexchen"
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsError(Exception):
+    """Is raised when the metrics can't be published, e.g. because the port is in use"""
+    pass
+
+
+def renderMetrics(ev: "Evaluation") -> str:
+    """Describe the state of a running Evaluation in the Prometheus text format.
+
+    Only reads counters that the Evaluation keeps anyway, so it can be called from another
+    thread while the games are played. While it runs, they are read from the shared progress
+    counters: the numbers of games and moves played are updated after every game, and the
+    per-player results every RESULTS_PUBLISH_INTERVAL games of each process. Win rates are
+    relative to the games whose results were published.
+    """
+    lines: List[str] = []
+
+    def metric(name: str, metric_type: str, help_str: str, samples: List[str]) -> None:
+        lines.append(f"# HELP {PREFIX}_{name} {help_str}")
+        lines.append(f"# TYPE {PREFIX}_{name} {metric_type}")
+        lines.extend(f"{PREFIX}_{name}{sample}" for sample in samples)
+
+    progress = ev.progress
+    if progress is not None:
+        wins = {p.id: progress.wins(p.id) for p in ev.players}
+        kicks = {p.id: {reason: progress.kicks(p.id, reason) for reason in KICK_REASON} for p in ev.players}
+    else:
+        wins = {p.id: ev.games_won[p.id] for p in ev.players}
+        kicks = ev.loss_reason
+    # Every game has exactly one winner
+    n_evaluated = sum(wins.values())
+    games = progress.games() if progress is not None else n_evaluated
+    metric("games_completed_total", "counter", "Number of games played so far", [f" {games}"])
+    metric("games_evaluated_total", "counter", "Number of games whose results are included in the per-player metrics",
+           [f" {n_evaluated}"])
+    metric("games_target", "gauge", "Number of games to play at most", [f" {ev.n_repetitions}"])
+    if progress is not None:
+        elapsed = progress.elapsed()
+        metric("moves_completed_total", "counter", "Number of moves played so far", [f" {progress.moves()}"])
+        metric("games_per_second", "gauge", "Average number of games played per second", [f" {games / elapsed:.3f}"])
+        metric("moves_per_second", "gauge", "Average number of moves played per second", [f" {progress.moves() / elapsed:.3f}"])
+
+    labels = {p.id: f'player="{p.id}",class="{p.__class__.__name__}"' for p in ev.players}
+    metric("wins_total", "counter", "Number of games won by each player",
+           [f"{{{labels[p.id]}}} {wins[p.id]}" for p in ev.players])
+    metric("win_rate", "gauge", "Fraction of the evaluated games won by each player",
+           [f"{{{labels[p.id]}}} {wins[p.id] / n_evaluated if n_evaluated else 0.0:.6f}" for p in ev.players])
+    metric("kicks_total", "counter", "Number of times each player was kicked, by reason",
+           [f'{{{labels[p.id]},reason="{reason.name}"}} {kicks[p.id][reason]}'
+            for p in ev.players for reason in KICK_REASON])
+    return "\n".join(lines) + "\n"
+
+
+class MetricsExporter:
+    """Publish the metrics of a running Evaluation, see renderMetrics().
+
+    The metrics are served over HTTP at `http://<host>:<port>/metrics`, or written to a file
+    every `interval` seconds, or both. Either runs in a daemon thread, so the games are played
+    as usual. Pass the exporter to Evaluation, which starts and stops it in run().
+    """
+
+    def __init__(self, port: Optional[int] = None, path: Optional[str] = None, host: str = "127.0.0.1",
+                 interval: float = c.METRICS_INTERVAL) -> None:
+        """
+        :param port: Port to serve the metrics on, 0 for any free port
+        :param path: File to write the metrics to. It is replaced atomically, so readers
+          never see a partially written file.
+        :param host: Address to serve the metrics on, only the local machine by default
+        :param interval: Seconds between two writes of the file
+        """
+        if port is None and path is None:
+            raise ValueError("MetricsExporter needs a port or a path")
+        self.port = port
+        self.path = path
+        self.host = host
+        self.interval = interval
+        self.server: Optional["ThreadingHTTPServer"] = None
+
+    @contextmanager
+    def exporting(self, ev: "Evaluation") -> Iterator["MetricsExporter"]:
+        """Publish the metrics of `ev` while the context is active"""
+        threads = []
+        stop = threading.Event()
+        if self.port is not None:
+            # Only needed if the metrics are served, so it doesn't slow down the start of every run
+            from http.server import ThreadingHTTPServer
+            try:
+                self.server = ThreadingHTTPServer((self.host, self.port), _handlerFor(ev))
+            except OSError as e:
+                raise MetricsError(f"Can't serve metrics at {self.host}:{self.port}: {e.strerror}") from e
+            # Port 0 picks any free port
+            self.port = self.server.server_address[1]
+            threads.append(threading.Thread(target=self.server.serve_forever, name="metrics-http", daemon=True))
+        if self.path is not None:
+            threads.append(threading.Thread(target=self._writePeriodically, args=(ev, stop), name="metrics-file", daemon=True))
+        for thread in threads:
+            thread.start()
+        try:
+            yield self
+        finally:
+            stop.set()
+            if self.server is not None:
+                self.server.shutdown()
+                self.server.server_close()
+                self.server = None
+            for thread in threads:
+                thread.join()
+            if self.path is not None:
+                # The final results
+                self.write(ev)
+
+    def write(self, ev: "Evaluation") -> None:
+        """Write the current metrics to the file"""
+        assert self.path is not None
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as file:
+            file.write(renderMetrics(ev))
+        os.replace(tmp_path, self.path)
+
+    def _writePeriodically(self, ev: "Evaluation", stop: threading.Event) -> None:
+        while not stop.wait(self.interval):
+            self.write(ev)
+
+
+def _handlerFor(ev: "Evaluation"):
+    from http.server import BaseHTTPRequestHandler
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = renderMetrics(ev).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args) -> None:
+            # Don't print a line for every scrape
+            pass
+
+    return MetricsHandler
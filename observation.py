@@ -0,0 +1,120 @@
+from array import array
+from typing import Dict, FrozenSet, Iterable, Optional, Sequence
+
+import constants as c
+import gameevent
+from gameevent import EVENT_TYPES, KICK_REASON
+
+
+class ObservationService:
+    """Keep statistics about what players did in public.
+
+    Only things that every player can see are tracked: the throws players state and whether
+    they were caught lying or wrongly accused of lying. Players that base their decisions on
+    these statistics, e.g. CounterThresPlayer and TrackingPlayer, read them from a service
+    instead of collecting them themselves. Evaluation creates one service, shares it with all
+    those players and has its Games feed it every event, so the statistics are computed once
+    no matter how many players read them.
+    """
+
+    # Indices in the tables of throw_summaries
+    SUMMARY_TOTAL = 0  # Total number of throws
+    SUMMARY_MAX = 1  # Count of the most frequent throw
+    SUMMARY_ARGMAX = 2  # Rank of the most frequent throw
+    SUMMARY_TIED = 3  # 1 if more than one throw has the maximum count, else 0
+
+    # Indices in the tables of truth_counts
+    TRUTHS = 0
+    LIES = 1
+
+    # Types of the Events that change the statistics
+    subscribed_events = frozenset({EVENT_TYPES.THROW, EVENT_TYPES.KICK})
+
+    # Tables are only created for players once something about them is observed, and are
+    # stored as arrays of unsigned ints, so that large tables of mostly idle players stay small.
+    # For each player, how often they stated each throw, indexed by the rank of the throw
+    # { player0Id: array('I', [0, 0, 0, 0, ..., 0]),
+    #   player1Id: array('I', [0, 0, 0, 0, ..., 0]),
+    #                         ^--- 21 entries --^
+    # ... }
+    throw_counts: Dict[int, array]
+    # Summary of each table in throw_counts that is kept up to date with every throw, so that no
+    # decision needs to scan a table. See the SUMMARY_* constants for the meaning of each entry.
+    throw_summaries: Dict[int, array]
+    # For each player, how often they were found to tell the truth and to lie
+    truth_counts: Dict[int, array]
+    # The last player to state a throw since the value to beat was reset
+    last_player_id: Optional[int]
+
+    def __init__(self, ignored_ids: Iterable[Optional[int]] = ()) -> None:
+        """
+        :param ignored_ids: Ids of players not to keep statistics about, e.g. the id of the
+          player that owns the service
+        """
+        self._ignored: FrozenSet[Optional[int]] = frozenset(ignored_ids)
+        self.throw_counts = {}
+        self.throw_summaries = {}
+        self.truth_counts = {}
+        self.last_player_id = None
+
+    def observes(self, player_id: Optional[int]) -> bool:
+        """Check whether statistics are kept about a player"""
+        return player_id is not None and player_id not in self._ignored
+
+    def throwCounts(self, player_id: int) -> Sequence[int]:
+        """Return how often a player stated each throw, indexed by rank"""
+        return self.throw_counts.get(player_id, _NO_THROWS)
+
+    def throwSummary(self, player_id: int) -> Sequence[int]:
+        """Return the summary of a player's throw counts, see the SUMMARY_* constants"""
+        return self.throw_summaries.get(player_id, _NO_SUMMARY)
+
+    def truthCounts(self, player_id: int) -> Sequence[int]:
+        """Return how often a player was found to tell the truth and to lie"""
+        return self.truth_counts.get(player_id, _NO_TRUTHS)
+
+    def onEvent(self, event: gameevent.Event) -> None:
+        if event.event_type == EVENT_TYPES.THROW:
+            self.trackThrow(event.player_id, event.throw_stated.rank)  # type: ignore
+            self.last_player_id = event.player_id
+        elif event.event_type == EVENT_TYPES.KICK:
+            if event.reason == KICK_REASON.LYING:  # type: ignore
+                # The kicked player was the last one to state a throw
+                self._trackTruth(event.player_id, self.LIES)
+            elif event.reason == KICK_REASON.FALSE_ACCUSATION:  # type: ignore
+                self._trackTruth(self.last_player_id, self.TRUTHS)
+            self.last_player_id = None
+
+    def trackThrow(self, player_id: int, rank: int) -> None:
+        """Count a throw stated by a player and update the summary of their statistics"""
+        p_counts = self.throw_counts.get(player_id)
+        if p_counts is None:
+            if not self.observes(player_id):
+                return
+            p_counts = self.throw_counts[player_id] = array("I", _NO_THROWS)
+            self.throw_summaries[player_id] = array("I", _NO_SUMMARY)
+        p_counts[rank] += 1
+        count = p_counts[rank]
+        summary = self.throw_summaries[player_id]
+        summary[self.SUMMARY_TOTAL] += 1
+        # Counts only ever increase, so the maximum can be updated with the changed count alone
+        if count > summary[self.SUMMARY_MAX]:
+            summary[self.SUMMARY_MAX] = count
+            summary[self.SUMMARY_ARGMAX] = rank
+            summary[self.SUMMARY_TIED] = 0
+        elif count == summary[self.SUMMARY_MAX]:
+            summary[self.SUMMARY_TIED] = 1
+
+    def _trackTruth(self, player_id: Optional[int], index: int) -> None:
+        p_counts = self.truth_counts.get(player_id)  # type: ignore
+        if p_counts is None:
+            if not self.observes(player_id):
+                return
+            p_counts = self.truth_counts[player_id] = array("I", _NO_TRUTHS)  # type: ignore
+        p_counts[index] += 1
+
+
+# Statistics of players about whom nothing has been observed yet
+_NO_THROWS = (0,) * c.N_THROW_VALUES
+_NO_SUMMARY = (0, 0, 0, 0)
+_NO_TRUTHS = (0, 0)
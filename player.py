@@ -1,10 +1,11 @@
 # Necessary for type hints of methods that include their own class
 from __future__ import annotations
-from typing import List, Optional
+from typing import Dict, FrozenSet, List, Optional, Sequence
 import random
 
 import constants as c
 import gameevent
+from observation import ObservationService
 from throw import Throw
 from utils import probLT, probGE
 
@@ -22,6 +23,15 @@ class Player:
     # TODO: This might not be necessary anymore since the order of players during a game
     # doesn't change
     id: Optional[int]
+    # Whether the class implements getDoubtRank() and getThrowStatedRank(). Players that do
+    # and don't listen to events can be simulated by the faster fastgame.FastGame. Subclasses
+    # inherit it, so use isRankBased() to check it.
+    rank_based: bool = False
+    # Types of the Events that onEvent() is called for, if the player listens to events at all.
+    # None means all types. Game only passes on events of these types.
+    subscribed_events: Optional[FrozenSet[gameevent.EVENT_TYPES]] = None
+    # Whether the player reads statistics about other players from an ObservationService
+    uses_observations: bool = False
 
     def __init__(self, player_id: int = None, listens_to_events: bool = False):
         self.id = player_id
@@ -29,6 +39,10 @@ class Player:
         self.listens_to_events = listens_to_events
         # Whether the instances onInit() method has been called
         self._initialized: bool = False
+        # Statistics about the other players, if the class uses them
+        self.observations: Optional[ObservationService] = None
+        # Whether the player must feed its events to `observations` itself
+        self._owns_observations = False
 
     def __str__(self):
         return f"{self.__class__.__name__} with id {self.id}"
@@ -53,12 +67,51 @@ class Player:
         """
         raise NotImplementedError
 
+    def getDoubtRank(self, lastRank: int, iMove: int, rng: random.Random) -> Optional[bool]:
+        """Same as getDoubt(), but the previous player's throw is passed as its rank
+
+        Must make the same decision and use `rng` in the same way as getDoubt().
+        """
+        raise NotImplementedError
+
+    def getThrowStatedRank(self, myRank: int, lastRank: int, iMove: int, rng: random.Random) -> Optional[int]:
+        """Same as getThrowStated(), but all throws are passed and returned as their ranks
+
+        A `lastRank` of -1 means there is no previous throw to beat.
+        Must make the same decision and use `rng` in the same way as getThrowStated().
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def isRankBased(cls) -> bool:
+        """Check whether getDoubtRank() and getThrowStatedRank() decide like getDoubt() and getThrowStated().
+
+        A subclass of a rank based class that overrides only getDoubt() or getThrowStated()
+        would still have the rank methods of its parent, so it doesn't count as rank based."""
+        return cls.rank_based and all(_definingClass(cls, method) is _definingClass(cls, f"{method}Rank")
+                                      for method in ("getDoubt", "getThrowStated"))
+
+    def subscribesTo(self, event_type: gameevent.EVENT_TYPES) -> bool:
+        """Check whether onEvent() should be called for Events of a type"""
+        return self.listens_to_events and (self.subscribed_events is None or event_type in self.subscribed_events)
+
     def onInit(self, players: list[Player]) -> None:
         """Is called at the start of an Evaluation.
 
         :param players: List of all players in the Evaluation
         """
         self._initialized = True
+        if self.uses_observations:
+            # Keep statistics about the other players ourselves, unless a shared service is provided
+            self.observations = ObservationService(ignored_ids=[self.id])
+            self._owns_observations = True
+
+    def shareObservations(self, observations: ObservationService) -> None:
+        """Read statistics from a service that is fed by someone else, usually the Game.
+
+        Must be called after onInit()."""
+        self.observations = observations
+        self._owns_observations = False
 
     def onEvent(self, event: gameevent.Event) -> None:
         """Is called by Game on every event that occurs.
@@ -79,6 +132,11 @@ class Player:
             raise PlayerNotInitialized()
 
 
+def _definingClass(cls: type, name: str) -> type:
+    """Return the class in the MRO of `cls` that defines the attribute `name`"""
+    return next(base for base in cls.__mro__ if name in base.__dict__)
+
+
 class DummyPlayer(Player):
     """Very basic player model.
 
@@ -86,6 +144,7 @@ class DummyPlayer(Player):
     Only lies if necessary, that is, if DummyPlayer's throw doesn't beat the previous one.
     Otherwise just tells the truth.
     """
+    rank_based = True
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -109,7 +168,18 @@ class DummyPlayer(Player):
                 # Just state we threw the next highest Throw
                 return lastThrow + 1
 
+    def getDoubtRank(self, lastRank: int, iMove: int, rng: random.Random) -> Optional[bool]:
+        return lastRank == c.MAEXCHEN_RANK
+
+    def getThrowStatedRank(self, myRank: int, lastRank: int, iMove: int, rng: random.Random) -> Optional[int]:
+        if lastRank < 0 or myRank > lastRank:
+            return myRank
+        else:
+            return lastRank + 1
+
 class AdvancedDummyPlayer(Player):
+    rank_based = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -128,9 +198,23 @@ class AdvancedDummyPlayer(Player):
             else:
                 return Throw(rng.choice(c.THROW_VALUES[lastThrow.rank + 1:-1]))
 
+    def getDoubtRank(self, lastRank: int, iMove: int, rng: random.Random) -> Optional[bool]:
+        return lastRank == c.MAEXCHEN_RANK or lastRank == c.RANK_66
+
+    def getThrowStatedRank(self, myRank: int, lastRank: int, iMove: int, rng: random.Random) -> Optional[int]:
+        if lastRank < 0 or myRank > lastRank:
+            return myRank
+        elif lastRank == c.RANK_66:
+            return c.MAEXCHEN_RANK
+        else:
+            # Random.choice() draws the same index from a range as from the equivalent list
+            return rng.choice(range(lastRank + 1, c.N_THROW_VALUES - 1))
+
 class CounterDummyPlayer(Player):
     """Designed to exploit the flaws in DummyPlayer's strategy"""
 
+    subscribed_events = frozenset({gameevent.EVENT_TYPES.THROW, gameevent.EVENT_TYPES.KICK})
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, listens_to_events=True, **kwargs)
 
@@ -171,6 +255,8 @@ class ShowOffPlayer(Player):
     to throw Mäxchen.
     """
 
+    rank_based = True
+
     def __init__(self, player_id=None) -> None:
         super().__init__(player_id)
 
@@ -184,13 +270,20 @@ class ShowOffPlayer(Player):
         #Randomly choose a double or Mäxchen in order to beat the previous player
         rank_11 = c.THROW_RANK_BY_VALUE[11]
         if lastThrow is None:
-            return Throw(random.choice(c.THROW_VALUES[rank_11:]))
+            return Throw(rng.choice(c.THROW_VALUES[rank_11:]))
         else:
-            return Throw(random.choice(c.THROW_VALUES[max(lastThrow.rank + 1, rank_11):]))
+            return Throw(rng.choice(c.THROW_VALUES[max(lastThrow.rank + 1, rank_11):]))
+
+    def getDoubtRank(self, lastRank: int, iMove: int, rng: random.Random) -> Optional[bool]:
+        return lastRank == c.MAEXCHEN_RANK
+
+    def getThrowStatedRank(self, myRank: int, lastRank: int, iMove: int, rng: random.Random) -> Optional[int]:
+        return rng.choice(range(max(lastRank + 1, c.RANK_11), c.N_THROW_VALUES))
 
 
 class RandomPlayer(Player):
     """Acts completely randomly"""
+    rank_based = True
 
     def __init__(self, *args, doubtChance: float = 0.5, **kwargs):
         super().__init__(*args, **kwargs)
@@ -202,6 +295,12 @@ class RandomPlayer(Player):
     def getThrowStated(self, myThrow: Throw, lastThrow: Optional[Throw], iMove: int, rng: random.Random) -> Optional[Throw]:
         return Throw(rng.choice(c.THROW_VALUES))
 
+    def getDoubtRank(self, lastRank: int, iMove: int, rng: random.Random) -> Optional[bool]:
+        return rng.random() < self.doubtChance
+
+    def getThrowStatedRank(self, myRank: int, lastRank: int, iMove: int, rng: random.Random) -> Optional[int]:
+        return rng.choice(range(c.N_THROW_VALUES))
+
 
 class ThresholdPlayer(Player):
     """Doubts or trusts depending on certain constant thresholds.
@@ -211,7 +310,8 @@ class ThresholdPlayer(Player):
     announce we threw `lieThreshold`. Therefore, we never state anything than that threshold
     as our throw.
     """
-    
+    rank_based = True
+
     def __init__(self, player_id: int = None, doubtThreshold: int = 61, lieThreshold: int = 61):
         super().__init__(player_id)
         if isinstance(doubtThreshold, int):
@@ -243,6 +343,15 @@ class ThresholdPlayer(Player):
             # Anderer Zug
             return lastThrow + 1
 
+    def getDoubtRank(self, lastRank: int, iMove: int, rng: random.Random) -> Optional[bool]:
+        return lastRank >= self.doubtThreshold.rank
+
+    def getThrowStatedRank(self, myRank: int, lastRank: int, iMove: int, rng: random.Random) -> Optional[int]:
+        if lastRank < 0 or myRank > lastRank:
+            return max(myRank, self.lieThreshold.rank)
+        else:
+            return lastRank + 1
+
 class CounterThresPlayer(Player):
     """Designed to exploit the flaws in ThresholdPlayer's strategy
 
@@ -251,15 +360,17 @@ class CounterThresPlayer(Player):
     which corresponds to their supposed threshold is doubted.
     """
 
+    subscribed_events = frozenset({gameevent.EVENT_TYPES.THROW, gameevent.EVENT_TYPES.KICK})
+    uses_observations = True
+
+    SUMMARY_TOTAL = ObservationService.SUMMARY_TOTAL
+    SUMMARY_MAX = ObservationService.SUMMARY_MAX
+    SUMMARY_ARGMAX = ObservationService.SUMMARY_ARGMAX
+    SUMMARY_TIED = ObservationService.SUMMARY_TIED
+
     def __init__(self, *args, minDataPoints=5, freqThres=0.5, **kwargs):
         super().__init__(*args, listens_to_events=True, **kwargs)
 
-        # Statistic about the frequency of other players throws
-        # { player0Id: [0, 0, 0, 0, ..., 0],
-        #   player1Id: [0, 0, 0, 0, ..., 0],
-        #              ^--- 21 entries --^
-        # ... }
-        self.throwStats: Dict[int, List[int]] = {}
         # The last player to state a throw
         self.lastPlayerId = None
 
@@ -270,15 +381,21 @@ class CounterThresPlayer(Player):
         # they are a ThresPlayer
         self.freqThres = freqThres
 
-    def onInit(self, players: list[Player]) -> None:
-        super().onInit(players)
-        # Create empty table for each player
-        self.throwStats = {player.id: [0 for _ in range(c.N_THROW_VALUES)] for player in players if player is not self}
+    @property
+    def throwStats(self) -> Dict[int, Sequence[int]]:
+        """Statistic about the frequency of other players throws, see ObservationService.throw_counts"""
+        return self.observations.throw_counts  # type: ignore
+
+    @property
+    def throwSummary(self) -> Dict[int, Sequence[int]]:
+        """Summary of each table in throwStats, see ObservationService.throw_summaries"""
+        return self.observations.throw_summaries  # type: ignore
 
     def onEvent(self, event: gameevent.Event) -> None:
+        if self._owns_observations:
+            self.observations.onEvent(event)  # type: ignore
         if isinstance(event, gameevent.EventThrow):
             if event.player_id != self.id:
-                self.throwStats[event.player_id][event.throw_stated.rank] += 1
                 self.lastPlayerId = event.player_id
         elif event.event_type == gameevent.EVENT_TYPES.KICK:
             self.lastPlayerId = None
@@ -287,8 +404,9 @@ class CounterThresPlayer(Player):
         if lastThrow.is_maexchen:
             return True
         elif self.existsAssumption(self.lastPlayerId):
-            # Decide based on data that was collected about the last player
-            if self.mostFreqThrow(self.lastPlayerId)[0] == lastThrow:
+            # Decide based on data that was collected about the last player.
+            # If an assumption exists, there is exactly one most frequent throw.
+            if self.observations.throwSummary(self.lastPlayerId)[self.SUMMARY_ARGMAX] == lastThrow.rank:  # type: ignore
                 # Last player acted according to assumption 
                 return True
         # No assumption exists or it couldn't be confirmed
@@ -315,17 +433,20 @@ class CounterThresPlayer(Player):
 
         :param player_id: The ID of the player to assess
         """
-        return self.totalThrowsTracked(player_id) > self.minDataPoints\
+        summary = self.observations.throwSummary(player_id)  # type: ignore
+        return summary[self.SUMMARY_TOTAL] > self.minDataPoints\
                 and self.mostFreqThrowFreq(player_id) > self.freqThres\
-                and len(self.mostFreqThrowIndices(player_id)) == 1
+                and not summary[self.SUMMARY_TIED]
 
     def mostFreqThrowIndices(self, player_id: int) -> List[int]:
         """Return the indices of the most frequent throw(s) of a player.
         
         The index of a throw in table which holds the statistics about a player
         corresponds to the rank of that throw."""
-        p_stats = self.throwStats[player_id]
-        max_freq = max(p_stats)
+        _, max_freq, argmax, tied = self.observations.throwSummary(player_id)  # type: ignore
+        if max_freq and not tied:
+            return [argmax]
+        p_stats = self.observations.throwCounts(player_id)  # type: ignore
         return [i for i, freq in enumerate(p_stats) if freq == max_freq]
 
     def mostFreqThrow(self, player_id: int) -> List[int]:
@@ -336,26 +457,24 @@ class CounterThresPlayer(Player):
         """Calculate the frequency of a players most frequent throw"""
         # Avoid ZeroDivision by checking total number of tracked throws first
         if (total_throws := self.totalThrowsTracked(player_id)):
-            return max(self.throwStats[player_id]) / total_throws
+            return self.observations.throwSummary(player_id)[self.SUMMARY_MAX] / total_throws  # type: ignore
         else:
             # No data collected for this specific player
             return 0.0
 
     def totalThrowsTracked(self, player_id: int) -> int:
         """Count the number of data points collected about a player"""
-        return sum(self.throwStats[player_id])
+        return self.observations.throwSummary(player_id)[self.SUMMARY_TOTAL]  # type: ignore
 
 class TrackingPlayer(Player):
     """Tracks other players tendency to tell the truth or lie"""
 
+    subscribed_events = frozenset({gameevent.EVENT_TYPES.THROW, gameevent.EVENT_TYPES.KICK})
+    uses_observations = True
+
     def __init__(self, *args, credLevel=0.5, **kwargs):
         super().__init__(*args, listens_to_events=True, **kwargs)
 
-        # Statistic about other player's truthfulness
-        # {player0Id: [count_truths, count_lies],
-        # {player1Id: [count_truths, count_lies],
-        #  ...}
-        self.playerStats: Dict[int, List[int]] = {}
         # Store last and second to last Throw so that
         # we can deduce the previous players strategy
         self.lastThrow: Optional[Throw] = None
@@ -378,44 +497,25 @@ class TrackingPlayer(Player):
         else:
             return lastThrow + 1
 
-    def onInit(self, players: list[Player]) -> None:
-        super().onInit(players)
-        # Create empty table for each player
-        self.playerStats = {player.id: [0, 0] for player in players if player is not self}
+    @property
+    def playerStats(self) -> Dict[int, Sequence[int]]:
+        """Statistic about other player's truthfulness, see ObservationService.truth_counts
+
+        {player0Id: [count_truths, count_lies],
+         player1Id: [count_truths, count_lies],
+         ...}"""
+        return self.observations.truth_counts  # type: ignore
 
     def onEvent(self, event: gameevent.Event) -> None:
+        if self._owns_observations:
+            self.observations.onEvent(event)  # type: ignore
         if isinstance(event, gameevent.EventThrow):
             self.secondLastThrow = self.lastThrow
             self.lastThrow = event.throw_stated
             self.lastPlayerId = event.player_id
         if isinstance(event, gameevent.EventKick):
-            if event.reason == gameevent.KICK_REASON.LYING:
-                if event.player_id != self.id:
-                    self.trackPlayerLie(event.player_id)
-            elif event.reason == gameevent.KICK_REASON.FALSE_ACCUSATION:
-                if self.lastPlayerId != self.id:
-                    self.trackPlayerTruth(self.lastPlayerId)
             self.lastThrow = self.secondLastThrow = self.lastPlayerId = None
 
-    def trackPlayerLie(self, player_id: int) -> None:
-        """Track that the last player lied"""
-        self._savePlayerStat(player_id, 1)
-
-    def trackPlayerTruth(self, player_id: int) -> None:
-        """Track that the last player told the truth"""
-        self._savePlayerStat(player_id, 0)
-
-    def _savePlayerStat(self, player_id: int, event: int) -> None:
-        """Store an event regarding a player.
-
-        An event can be either that player lying or telling the truth.
-
-        :param player_id: The ID of the player
-        :param event: What the player did: 0 = telling the truth, 1 = lying
-        """
-        self._assertInitialized()
-        self.playerStats[player_id][event] += 1
-
     def getPlayerCredibility(self, player_id: int) -> float:
         """Calculate a players credibility.
 
@@ -424,7 +524,7 @@ class TrackingPlayer(Player):
 
         :param player_id: The ID of the player
         """
-        truths, lies = self.playerStats[player_id]
+        truths, lies = self.observations.truthCounts(player_id)  # type: ignore
         return truths / (truths + lies) if self.existPlayerStats(player_id) else None 
 
     def existPlayerStats(self, player_id: int) -> bool:
@@ -435,8 +535,8 @@ class TrackingPlayer(Player):
         if player_id in self.playerStats:
             return any(self.playerStats[player_id])
         else:
-            # TODO: This should be unreachable, maybe throw an Exception instead
-            # If this block is reached, that must be a bug
+            # The ObservationService only creates the counts of a player once they were found to
+            # tell the truth or lie, so this is the usual case early on
             return False
 
     def shouldDoubt(self, playerThrow: Throw) -> bool:
@@ -1,4 +1,5 @@
-from typing import List
+import os
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 import matplotlib.pyplot as plt
 from matplotlib.figure import Figure
@@ -19,12 +20,32 @@ def plotLossReason(*args, **kwargs):
     figure = _lossReasonFig(*args, **kwargs) 
     plt.show()
  
-def plotWRandLR(player_names: List[str], win_rates: List[float], loss_reasons: List[List[float]], win_y_range=None, loss_y_range=[0., 1.]):
-    win_rate_figure = _winRateFig(player_names, win_rates, win_y_range, fig_index=0)
-    loss_reason_figure = _lossReasonFig(player_names, loss_reasons, loss_y_range, fig_index=1)
+def plotGameLength(*args, **kwargs):
+    figure = _gameLengthFig(*args, **kwargs)
     plt.show()
+
+def plotWRandLR(player_names: List[str], win_rates: List[float], loss_reasons: List[List[float]], win_y_range=None, loss_y_range=[0., 1.],
+                win_errors=None, loss_errors=None):
+    win_rate_figure = _winRateFig(player_names, win_rates, win_y_range, fig_index=0, errors=win_errors)
+    loss_reason_figure = _lossReasonFig(player_names, loss_reasons, loss_y_range, fig_index=1, errors=loss_errors)
+    plt.show()
+
+def saveFigures(figures: Dict[str, Tuple[tuple, Dict[str, Any]]], out_dir: str, formats: Sequence[str]) -> None:
+    """Render figures to files instead of showing them.
+
+    :param figures: For each figure to render, e.g. "win_rate", the arguments of its plot
+      function, as in `{"win_rate": ((player_names, win_rates), {"errors": errors})}`
+    :param out_dir: Directory to write the files to, as `<figure name>.<format>`
+    :param formats: File formats supported by matplotlib, e.g. ["png", "svg"]
+    """
+    for name, (args, kwargs) in figures.items():
+        figure = FIGURES[name](*args, **kwargs)
+        for file_format in formats:
+            figure.savefig(os.path.join(out_dir, f"{name}.{file_format}"), format=file_format)
+        # Free the figure, since no window holds on to it
+        plt.close(figure)
     
-def _winRateFig(player_names: List[str], values: List[float], y_range=None, fig_index=None) -> Figure:
+def _winRateFig(player_names: List[str], values: List[float], y_range=None, fig_index=None, errors: Optional[List[float]] = None) -> Figure:
     fig = plt.figure(fig_index)
     window = pylab.gcf()
     window.canvas.manager.set_window_title("Win rate for each player")
@@ -34,15 +55,20 @@ def _winRateFig(player_names: List[str], values: List[float], y_range=None, fig_
     plt.yticks(np.arange(0, 1.0, 0.1))
     if y_range:
         plt.ylim(y_range)
-    ax.bar(x_positions, values)
+    ax.bar(x_positions, values, yerr=errors)
 
     return fig
 
-def _lossReasonFig(player_names: List[str], values: List[List[float]], y_range=[0, 1], fig_index=None) -> Figure:
+def _lossReasonFig(player_names: List[str], values: List[List[float]], y_range=[0, 1], fig_index=None,
+                   errors: Optional[List[List[float]]] = None) -> Figure:
     # Allow only for three values per player
     values = [player_stats[:3] for player_stats in values]
     # Flip table so bars are grouped per player, not by category
     values = list(zip(*values)) # type: ignore
+    if errors is not None:
+        errors = list(zip(*[player_errors[:3] for player_errors in errors])) # type: ignore
+    else:
+        errors = [None] * 3 # type: ignore
 
     fig = plt.figure(fig_index)
     window = pylab.gcf()
@@ -52,9 +78,39 @@ def _lossReasonFig(player_names: List[str], values: List[List[float]], y_range=[
     plt.yticks(np.arange(0, 1.1, 0.1))
     plt.ylim(y_range)
     plt.xticks(positions, player_names)
-    ax.bar(positions - 1, values[0], width=1)
-    ax.bar(positions,     values[1], width=1)
-    ax.bar(positions + 1, values[2], width=1)
+    ax.bar(positions - 1, values[0], width=1, yerr=errors[0])
+    ax.bar(positions,     values[1], width=1, yerr=errors[1])
+    ax.bar(positions + 1, values[2], width=1, yerr=errors[2])
     ax.legend(labels = loss_categories)
 
     return fig
+
+def _gameLengthFig(counts: Sequence[int], overflow: int = 0, fig_index=None) -> Figure:
+    """Bar chart of the fraction of games that took each number of moves.
+
+    :param counts: counts[k] is the number of games that took k moves
+    :param overflow: Number of games that took len(counts) moves or more, shown as the last bar
+    """
+    n_games = sum(counts) + overflow
+    fractions = np.array(counts, dtype=float) / max(n_games, 1)
+
+    fig = plt.figure(fig_index)
+    window = pylab.gcf()
+    window.canvas.manager.set_window_title("Distribution of the number of moves per game")
+    ax = fig.add_axes(axis_rect)
+    ax.bar(np.arange(len(counts)), fractions, width=1)
+    if overflow:
+        ax.bar([len(counts)], [overflow / n_games], width=1, label=f">= {len(counts)} moves")
+        ax.legend()
+    ax.set_xlabel("Moves")
+    ax.set_ylabel("Fraction of games")
+
+    return fig
+
+
+# Functions that create each figure, by the name under which saveFigures() writes it
+FIGURES: Dict[str, Callable[..., Figure]] = {
+    "win_rate": _winRateFig,
+    "loss_reason": _lossReasonFig,
+    "game_length": _gameLengthFig,
+}
@@ -0,0 +1,33 @@
+import multiprocessing
+import os
+from typing import Any, Dict, Sequence, Tuple
+
+# Names of the figures that can be rendered, see plot.FIGURES
+FIGURE_NAMES = ("win_rate", "loss_reason", "game_length")
+# File formats that figures can be rendered to
+FORMATS = ("png", "svg", "pdf", "jpg", "eps")
+
+
+def renderInBackground(figures: Dict[str, Tuple[tuple, Dict[str, Any]]], out_dir: str,
+                       formats: Sequence[str]) -> multiprocessing.Process:
+    """Render figures to files in a separate process, so that the caller can go on simulating.
+
+    The figures are passed on to plot.saveFigures(). `out_dir` is created if it doesn't exist.
+    The process is not a daemon, so the interpreter waits for it to finish before exiting;
+    join() it to wait earlier.
+    """
+    for file_format in formats:
+        if file_format not in FORMATS:
+            raise ValueError(f"Unsupported plot format '{file_format}', must be one of {', '.join(FORMATS)}")
+    os.makedirs(out_dir, exist_ok=True)
+    process = multiprocessing.Process(target=_render, args=(figures, out_dir, list(formats)))
+    process.start()
+    return process
+
+
+def _render(figures: Dict[str, Tuple[tuple, Dict[str, Any]]], out_dir: str, formats: Sequence[str]) -> None:
+    # Select a backend that doesn't need a display before pyplot is imported by plot
+    import matplotlib
+    matplotlib.use("Agg")
+    from plot import saveFigures
+    saveFigures(figures, out_dir, formats)
@@ -0,0 +1,128 @@
+import multiprocessing
+import sys
+import threading
+import time
+from typing import Optional, TextIO
+
+import constants as c
+from formatting import progressBar
+from gameevent import KICK_REASON
+
+# Layout of the counters of each process that plays games. They are followed by the results
+# of the games, see ProgressCounters.
+GAMES = 0
+MOVES = 1
+N_COUNTERS = 2
+
+
+def slotSize(n_players: int) -> int:
+    """Return the number of counters of each process, for games between `n_players` players"""
+    return N_COUNTERS + n_players * (1 + len(KICK_REASON))
+
+
+class ProgressCounters:
+    """Numbers of games and moves played so far, counted by every process that plays games.
+
+    Every process gets a slot in `counters`, which lives in shared memory so that worker
+    processes can write to it. After each game, a process only adds to the number of games
+    and moves in its own slot, without any locking. Other threads, e.g. of a ProgressReporter,
+    read all slots to get the totals.
+
+    After the numbers of games and moves, each slot holds the number of wins of every player,
+    followed by the number of kicks of every player for each KICK_REASON. Processes add their
+    results to them every RESULTS_PUBLISH_INTERVAL games, so that the results of worker
+    processes can be followed before they are done.
+    """
+
+    def __init__(self, n_slots: int = 1, n_players: int = 0) -> None:
+        """
+        :param n_slots: Number of processes that play games and count their progress
+        :param n_players: Number of players whose results are counted, with ids 0, ..., n_players - 1
+        """
+        self.n_players = n_players
+        self.slot_size = slotSize(n_players)
+        self.counters = multiprocessing.RawArray("q", self.slot_size * n_slots)
+        self.t_start = time.perf_counter()
+
+    def games(self) -> int:
+        """Return the number of games played so far by all processes"""
+        return sum(self.counters[GAMES::self.slot_size])
+
+    def moves(self) -> int:
+        """Return the number of moves played so far by all processes"""
+        return sum(self.counters[MOVES::self.slot_size])
+
+    def wins(self, player_id: int) -> int:
+        """Return the number of published games that a player won"""
+        return sum(self.counters[N_COUNTERS + player_id::self.slot_size])
+
+    def kicks(self, player_id: int, reason: KICK_REASON) -> int:
+        """Return the number of published games in which a player was kicked for a reason"""
+        offset = N_COUNTERS + self.n_players + player_id * len(KICK_REASON) + list(KICK_REASON).index(reason)
+        return sum(self.counters[offset::self.slot_size])
+
+    def elapsed(self) -> float:
+        """Return the number of seconds since the counters were created"""
+        return max(time.perf_counter() - self.t_start, 1e-9)
+
+
+class ProgressReporter:
+    """Show the progress of a simulation, sampled from a background thread.
+
+    A thread reads the ProgressCounters every `interval` seconds and prints a progress bar with
+    the throughput and an estimate of the remaining time. Use as a context manager, which
+    starts and stops the thread:
+
+        with ProgressReporter(progress, n_games):
+            ...  # Bump progress.counters[GAMES] and progress.counters[MOVES]
+    """
+
+    def __init__(self, progress: ProgressCounters, total_games: int, interval: float = c.PROGRESS_INTERVAL,
+                 stream: TextIO = sys.stdout) -> None:
+        """
+        :param progress: Counters that the processes playing games bump
+        :param total_games: Number of games that will be played at most
+        :param interval: Seconds between two updates of the progress bar
+        :param stream: Where to print the progress bar
+        """
+        self.progress = progress
+        self.total_games = total_games
+        self.interval = interval
+        self.stream = stream
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "ProgressReporter":
+        self._thread = threading.Thread(target=self._report, name="progress", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        assert self._thread is not None
+        self._thread.join()
+        print(self.line(), file=self.stream, flush=True)
+
+    def _report(self) -> None:
+        while not self._stop.wait(self.interval):
+            print(self.line(), end="\r", file=self.stream, flush=True)
+
+    def line(self) -> str:
+        """Return the progress bar with the current throughput and estimated remaining time"""
+        games, moves = self.progress.games(), self.progress.moves()
+        elapsed = self.progress.elapsed()
+        games_per_sec = games / elapsed
+        if games_per_sec > 0:
+            eta = formatDuration(max(self.total_games - games, 0) / games_per_sec)
+        else:
+            eta = "?"
+        prg = games * c.PROGRESS_BAR_WIDTH // max(self.total_games, 1)
+        return (f"{progressBar(prg, c.PROGRESS_BAR_WIDTH)} {games}/{self.total_games} games  "
+                f"{games_per_sec:.0f} games/s  {moves / elapsed:.0f} moves/s  ETA {eta}")
+
+
+def formatDuration(seconds: float) -> str:
+    """Format a duration as hours, minutes and seconds, e.g. 1:02:03"""
+    minutes, seconds = divmod(round(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02}:{seconds:02}"
@@ -0,0 +1,131 @@
+from array import array
+import math
+from typing import Iterable, Sequence, Tuple
+
+import constants as c
+from utils import Z_95
+
+
+class RunningStats:
+    """Mean and variance of a stream of numbers, updated in constant time and memory.
+
+    Uses Welford's algorithm, which, unlike keeping a sum and a sum of squares, doesn't lose
+    precision when the variance is small compared to the mean. Accumulators of separate
+    streams, e.g. of games played in different worker processes, can be merged.
+    """
+
+    def __init__(self, values: Iterable[float] = ()) -> None:
+        self.n = 0
+        self.mean = 0.0
+        # Sum of the squared differences from the current mean
+        self.m2 = 0.0
+        for x in values:
+            self.add(x)
+
+    def add(self, x: float) -> None:
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+
+    def merge(self, other: "RunningStats") -> None:
+        """Add all values of another accumulator to this one (Chan et al.)"""
+        if other.n == 0:
+            return
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta * delta * self.n * other.n / n
+        self.n = n
+
+    def variance(self) -> float:
+        """Return the sample variance, or 0 if there are fewer than two values"""
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    def stdError(self) -> float:
+        """Return the standard error of the mean"""
+        return math.sqrt(self.variance() / self.n) if self.n > 0 else 0.0
+
+    def interval(self, z: float = Z_95) -> Tuple[float, float]:
+        """Return the confidence interval of the mean, by default at the 95 % level"""
+        half_width = z * self.stdError()
+        return self.mean - half_width, self.mean + half_width
+
+
+class Histogram(RunningStats):
+    """Distribution of a stream of non-negative integers, e.g. the numbers of moves games took.
+
+    Every value below `n_buckets` has a bucket of its own, larger values are counted together
+    in `overflow`. The buckets are only allocated up to the largest value seen so far, so the
+    memory used is bounded by `n_buckets` no matter how many values are added. Mean and
+    variance are exact, including overflowing values; percentiles that fall into the
+    overflow are reported as `n_buckets`.
+    """
+
+    def __init__(self, values: Iterable[int] = (), n_buckets: int = c.HISTOGRAM_BUCKETS) -> None:
+        self.n_buckets = n_buckets
+        # counts[v] is how often the value v was added
+        self.counts = array("Q")
+        self.overflow = 0
+        super().__init__(values)
+
+    def add(self, x: int) -> None:  # type: ignore
+        super().add(x)
+        self._count(x, 1)
+
+    def addCounts(self, counts: Sequence[int]) -> None:
+        """Add every value v counts[v] times, in time proportional to len(counts)"""
+        group = RunningStats()
+        group.n = sum(counts)
+        if group.n == 0:
+            return
+        group.mean = sum(v * k for v, k in enumerate(counts)) / group.n
+        group.m2 = sum(k * (v - group.mean) ** 2 for v, k in enumerate(counts))
+        RunningStats.merge(self, group)
+        for v, k in enumerate(counts):
+            if k:
+                self._count(v, k)
+
+    def merge(self, other: "Histogram") -> None:  # type: ignore
+        super().merge(other)
+        for v, k in enumerate(other.counts):
+            if k:
+                self._count(v, k)
+        self.overflow += other.overflow
+
+    def _count(self, x: int, k: int) -> None:
+        if x >= self.n_buckets:
+            self.overflow += k
+            return
+        if x >= len(self.counts):
+            self.counts.extend([0] * (x + 1 - len(self.counts)))
+        self.counts[x] += k
+
+    def percentile(self, q: float) -> int:
+        """Return the smallest value that at least q percent of the values are less than or equal to"""
+        rank = q / 100 * self.n
+        seen = 0
+        for v, k in enumerate(self.counts):
+            seen += k
+            if k and seen >= rank:
+                return v
+        return self.n_buckets
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Histogram):
+            return NotImplemented
+        return self.counts == other.counts and self.overflow == other.overflow
+
+    def __repr__(self) -> str:
+        return f"Histogram(n={self.n}, mean={self.mean:.2f}, overflow={self.overflow})"
+
+
+def proportionStdError(successes: int, n: int) -> float:
+    """Return the standard error of a proportion, e.g. a win rate.
+
+    The mean and variance of a stream of zeros and ones follow from the number of ones, so
+    proportions need no RunningStats; counting is enough to keep them up to date."""
+    if n == 0:
+        return 0.0
+    p = successes / n
+    return math.sqrt(p * (1 - p) / n)
@@ -0,0 +1,214 @@
+import copy
+import random
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+import constants as c
+from player import Player
+from throw import Throw, throwByRank
+
+# Inputs at which a strategy is probed, in addition to every pair of ranks. A stateless
+# strategy must not depend on the index of the move.
+PROBE_MOVES = (0, 1, 2, 7, 100)
+# Number of equally spaced points at which a call of random() is evaluated before
+# searching for the exact thresholds in between
+PROBE_GRID = 64
+# Precision of the thresholds of random() that are found by bisection
+PROBE_PRECISION = 1e-12
+# Maximum number of times a strategy may be evaluated to explore its random draws, per input
+MAX_RUNS = 10000
+
+# Distribution over the outcomes of a decision, e.g. {True: 0.25, False: 0.75}
+Distribution = Dict[Any, float]
+
+
+class StrategyNotCompilable(Exception):
+    """Is raised when the decisions of a player can't be described by a StrategyTable"""
+    pass
+
+
+class _NewDraw(Exception):
+    """Is raised by _ProbeRandom when a strategy draws more random numbers than were scripted"""
+    pass
+
+
+class _ProbeRandom(random.Random):
+    """A PRNG that returns scripted values, so that all possible draws can be enumerated.
+
+    Every integer draw (choice(), randrange(), randint(), shuffle(), ...) goes through
+    _randbelow(), floats come from random(). When the script runs out, the kind of the next
+    draw is recorded in `new_draw` and _NewDraw is raised.
+    """
+
+    def __init__(self, script: List[Any]) -> None:
+        super().__init__(0)
+        self.script = script
+        self.n_draws = 0
+        self.new_draw: Optional[Tuple[str, int]] = None
+
+    def _next(self, kind: str, n: int = 0) -> Any:
+        if self.n_draws < len(self.script):
+            value = self.script[self.n_draws]
+            self.n_draws += 1
+            return value
+        self.new_draw = (kind, n)
+        raise _NewDraw()
+
+    def _randbelow(self, n: int) -> int:  # type: ignore
+        return self._next("int", n)
+
+    def random(self) -> float:
+        return self._next("float")
+
+    def getrandbits(self, k: int) -> int:
+        raise StrategyNotCompilable("Strategies that call getrandbits() can't be compiled")
+
+
+def _explore(decide: Callable[[random.Random], Any], script: List[Any], runs: List[int]) -> Distribution:
+    """Compute the distribution of the outcomes of `decide`, given the draws in `script`"""
+    runs[0] += 1
+    if runs[0] > MAX_RUNS:
+        raise StrategyNotCompilable(f"Strategy draws too many random numbers (explored {MAX_RUNS} paths)")
+    rng = _ProbeRandom(script)
+    try:
+        return {decide(rng): 1.0}
+    except _NewDraw:
+        pass
+    kind, n = rng.new_draw  # type: ignore
+    result: Distribution = {}
+    if kind == "int":
+        # All n values are equally likely
+        for value in range(n):
+            _addDistribution(result, _explore(decide, script + [value], runs), 1 / n)
+        return result
+
+    # random() is assumed to be compared with thresholds, so that the outcome is piecewise
+    # constant in the drawn value. Evaluate it on a grid and bisect where the outcome changes.
+    def at(u: float) -> Distribution:
+        return _explore(decide, script + [u], runs)
+
+    points = [i / PROBE_GRID for i in range(PROBE_GRID)] + [1.0 - PROBE_PRECISION]
+    outcomes = [at(u) for u in points]
+    start = 0.0
+    for i in range(len(points) - 1):
+        if outcomes[i] == outcomes[i + 1]:
+            continue
+        low, high = points[i], points[i + 1]
+        while high - low > PROBE_PRECISION:
+            mid = (low + high) / 2
+            if at(mid) == outcomes[i]:
+                low = mid
+            else:
+                high = mid
+        _addDistribution(result, outcomes[i], high - start)
+        start = high
+    _addDistribution(result, outcomes[-1], 1.0 - start)
+    return result
+
+
+def _addDistribution(target: Distribution, dist: Distribution, weight: float) -> None:
+    for outcome, p in dist.items():
+        target[outcome] = target.get(outcome, 0.0) + p * weight
+
+
+def _distribution(decide: Callable[[random.Random], Any]) -> Distribution:
+    """Return the distribution of the outcomes of a decision that may draw random numbers"""
+    dist = _explore(decide, [], [0])
+    # Drop outcomes that only come up due to rounding of the thresholds
+    return {outcome: p for outcome, p in dist.items() if p > 2 * PROBE_PRECISION}
+
+
+class StrategyTable:
+    """The decisions of a stateless player, tabulated for every possible situation.
+
+    `doubt[last_rank]` is the probability that the player doubts a stated throw of rank
+    `last_rank`. `stated[my_rank, last_rank + 1]` is the distribution of the rank the player
+    states after throwing `my_rank`; a `last_rank` of -1 means there is no throw to beat.
+    Rows for throws that the player always doubts are never used and left empty.
+    `stated_cdf` holds the same distributions, accumulated along the last axis.
+    """
+
+    doubt: np.ndarray  # Shape (N_THROW_VALUES,)
+    stated: np.ndarray  # Shape (N_THROW_VALUES, N_THROW_VALUES + 1, N_THROW_VALUES)
+    stated_cdf: np.ndarray
+
+    def __init__(self, doubt: np.ndarray, stated: np.ndarray) -> None:
+        self.doubt = doubt
+        self.stated = stated
+        self.stated_cdf = np.cumsum(stated, axis=-1)
+
+    def isDeterministic(self) -> bool:
+        """Check whether the player makes every decision without drawing random numbers"""
+        stated_max = self.stated.max(axis=-1)
+        return bool(np.all((self.doubt == 0) | (self.doubt == 1)) and np.all((stated_max == 0) | (stated_max == 1)))
+
+    def sampleDoubt(self, last_rank: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """Draw doubt decisions for an array of stated ranks"""
+        return rng.random(len(last_rank)) < self.doubt[last_rank]
+
+    def sampleStated(self, my_rank: np.ndarray, last_rank: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """Draw the stated ranks for arrays of own and previous ranks"""
+        cdf = self.stated_cdf[my_rank, last_rank + 1]
+        u = rng.random(len(my_rank))
+        # Guard against the last entry of a cdf being slightly less than 1
+        return np.minimum((u[:, None] >= cdf).sum(axis=1), c.N_THROW_VALUES - 1)
+
+
+def compileStrategy(player: Player) -> StrategyTable:
+    """Probe a player in every situation and tabulate their decisions.
+
+    The player must be stateless: their decisions may only depend on their own throw, the
+    previous player's stated throw and the random numbers they draw. Players that listen to
+    events, change their attributes while deciding, depend on the index of the move or
+    don't always answer raise StrategyNotCompilable.
+
+    :param player: An initialized player instance. The parameters of the instance, e.g. the
+      thresholds of a ThresholdPlayer, are part of the compiled table.
+    """
+    if player.listens_to_events:
+        raise StrategyNotCompilable(f"{player.__class__.__name__} listens to events, so it isn't stateless")
+    state = copy.deepcopy(vars(player))
+    n = c.N_THROW_VALUES
+
+    doubt = np.zeros(n)
+    for last_rank in range(n):
+        last = throwByRank(last_rank)
+        dist = _probe(player, lambda rng, i_move: player.getDoubt(last, i_move, rng))
+        if set(dist) - {True, False}:
+            raise StrategyNotCompilable(f"getDoubt() of {player!r} returned {set(dist) - {True, False}}")
+        doubt[last_rank] = dist.get(True, 0.0)
+
+    stated = np.zeros((n, n + 1, n))
+    for my_rank in range(n):
+        mine = throwByRank(my_rank)
+        for last_rank in range(-1, n):
+            if last_rank >= 0 and doubt[last_rank] == 1:
+                # The player never has to beat a throw they always doubt
+                continue
+            last: Optional[Throw] = throwByRank(last_rank) if last_rank >= 0 else None
+            dist = _probe(player, lambda rng, i_move: player.getThrowStated(mine, last, i_move, rng))
+            for throw, p in dist.items():
+                if not isinstance(throw, Throw):
+                    raise StrategyNotCompilable(f"getThrowStated() of {player!r} returned {throw!r}")
+                stated[my_rank, last_rank + 1, throw.rank] += p
+
+    if vars(player) != state:
+        raise StrategyNotCompilable(f"{player!r} changed its attributes while deciding, so it isn't stateless")
+    return StrategyTable(doubt, stated)
+
+
+def _probe(player: Player, decide: Callable[[random.Random, int], Any]) -> Distribution:
+    """Return the distribution of a decision, checking that it doesn't depend on the move index"""
+    dist = None
+    for i_move in PROBE_MOVES:
+        dist_move = _distribution(lambda rng: decide(rng, i_move))
+        if dist is None:
+            dist = dist_move
+        elif not _sameDistribution(dist, dist_move):
+            raise StrategyNotCompilable(f"Decisions of {player!r} depend on the index of the move")
+    return dist  # type: ignore
+
+
+def _sameDistribution(a: Distribution, b: Distribution) -> bool:
+    return a.keys() == b.keys() and all(abs(a[k] - b[k]) < 1e-9 for k in a)
@@ -0,0 +1,82 @@
+import unittest
+
+from batchsim import BatchSimulation
+from evaluate import Evaluation, BatchNotSupported
+from player import Player, DummyPlayer, AdvancedDummyPlayer, CounterDummyPlayer, ShowOffPlayer, RandomPlayer, ThresholdPlayer
+
+
+class CautiousPlayer(Player):
+    """A stateless player without a vectorized strategy"""
+    def getDoubt(self, lastThrow, iMove, rng):
+        return lastThrow.is_maexchen or (lastThrow.rank >= 15 and rng.random() < 0.8)
+
+    def getThrowStated(self, myThrow, lastThrow, iMove, rng):
+        if lastThrow is None or myThrow > lastThrow:
+            return myThrow
+        return lastThrow + 1
+
+
+class TestBatchSimulation(unittest.TestCase):
+    def setUp(self):
+        self.players = [DummyPlayer(), AdvancedDummyPlayer(), ShowOffPlayer(), RandomPlayer(), ThresholdPlayer()]
+        for i, player in enumerate(self.players):
+            player.id = i
+
+    def test_supports(self):
+        self.assertTrue(BatchSimulation.supports(self.players))
+        self.assertFalse(BatchSimulation.supports([*self.players, CounterDummyPlayer()]))
+
+    def test_counts(self):
+        n_games = 1000
+        sim = BatchSimulation(self.players, n_games, batch_size=300, seed=0)
+        sim.run()
+        self.assertEqual(sum(sim.games_won), n_games)
+        self.assertEqual(sum(rounds.n for rounds in sim.win_rounds.values()), n_games)
+        n_kicks = sum(n for reasons in sim.loss_reason.values() for n in reasons.values())
+        self.assertEqual(n_kicks, n_games * (len(self.players) - 1))
+
+    def test_reproducible(self):
+        results = []
+        for _ in range(2):
+            sim = BatchSimulation(self.players, 500, seed=3)
+            sim.run()
+            results.append((sim.games_won, sim.loss_reason))
+        self.assertEqual(results[0], results[1])
+
+    def test_same_statistics(self):
+        # Batch simulation uses different random numbers than Game, so the results
+        # can only be compared statistically
+        n_games = 20000
+        batch = Evaluation(self.players, n_games, seed=5, batch=True)
+        batch.run()
+        reference = Evaluation(self.players, n_games, seed=5)
+        reference.run()
+        for win_rate_batch, win_rate_ref in zip(batch.getWinRates(), reference.getWinRates()):
+            self.assertAlmostEqual(win_rate_batch, win_rate_ref, delta=0.02)
+        for reasons_batch, reasons_ref in zip(batch.getLossReasons(), reference.getLossReasons()):
+            for freq_batch, freq_ref in zip(reasons_batch, reasons_ref):
+                self.assertAlmostEqual(freq_batch, freq_ref, delta=0.03)
+
+    def test_compiled(self):
+        players = [*self.players, CautiousPlayer()]
+        n_games = 20000
+        batch = Evaluation(players, n_games, seed=6, batch=True)
+        batch.run()
+        reference = Evaluation(players, n_games, seed=6)
+        reference.run()
+        for win_rate_batch, win_rate_ref in zip(batch.getWinRates(), reference.getWinRates()):
+            self.assertAlmostEqual(win_rate_batch, win_rate_ref, delta=0.02)
+
+    def test_workers(self):
+        # The results don't depend on how the games are distributed
+        serial = Evaluation(self.players, 10000, seed=3, batch=True)
+        serial.run()
+        for kwargs in ({"workers": 2}, {"workers": 3, "precision": 1e-5}):
+            ev = Evaluation(self.players, 10000, seed=3, batch=True, **kwargs)
+            ev.run()
+            self.assertEqual(ev.games_won, serial.games_won)
+            self.assertEqual(ev.loss_reason, serial.loss_reason)
+
+    def test_not_supported(self):
+        with self.assertRaises(BatchNotSupported):
+            Evaluation([*self.players, CounterDummyPlayer()], 10, batch=True).run()
@@ -0,0 +1,43 @@
+import subprocess
+import sys
+import unittest
+
+from bench.run import Scenario, runScenario, compare, measureStartup, STARTUP_BUDGET
+
+
+class TestBench(unittest.TestCase):
+    def test_run(self):
+        result = runScenario(Scenario("test", {"dummy": 2, "tracking": 1}, 20, repeat=1))
+        self.assertEqual(result["n_players"], 3)
+        self.assertGreater(result["games_per_sec"], 0)
+        self.assertGreater(result["moves_per_sec"], result["games_per_sec"])
+
+    def test_compare(self):
+        baseline = {"scenarios": {"a": {"games_per_sec": 100.0, "peak_rss_kib": 1000}}}
+        same = {"scenarios": {"a": {"games_per_sec": 95.0, "peak_rss_kib": 1050}}}
+        self.assertEqual(compare(baseline, same), [])
+        slower = {"scenarios": {"a": {"games_per_sec": 80.0, "peak_rss_kib": 1000}, "b": {"games_per_sec": 1.0}}}
+        regressions = compare(baseline, slower)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("games_per_sec", regressions[0])
+        larger = {"scenarios": {"a": {"games_per_sec": 100.0, "peak_rss_kib": 1200}}}
+        self.assertEqual(len(compare(baseline, larger)), 1)
+
+    def test_startup_budget(self):
+        self.assertEqual(compare({"scenarios": {}}, {"scenarios": {}, "startup_sec": STARTUP_BUDGET / 2}), [])
+        self.assertEqual(len(compare({"scenarios": {}}, {"scenarios": {}, "startup_sec": STARTUP_BUDGET * 2})), 1)
+
+
+class TestStartup(unittest.TestCase):
+    def test_no_heavy_imports(self):
+        # Plotting libraries, numpy and the HTTP server of the metrics must only be imported when they are needed
+        code = "import sys, evaluate; print(' '.join(m for m in ('matplotlib', 'numpy', 'http.server') if m in sys.modules))"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), "")
+
+    def test_measure(self):
+        self.assertGreater(measureStartup(repeat=1), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
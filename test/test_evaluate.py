@@ -1,10 +1,16 @@
+import os
+import tempfile
 import unittest
 from typing import List
 import logging
+import multiprocessing
 
 from player import Player, DummyPlayer, AdvancedDummyPlayer, CounterDummyPlayer, ShowOffPlayer, RandomPlayer, ThresholdPlayer, TrackingPlayer, CounterThresPlayer
+import evaluate
 from evaluate import Evaluation
 from formatting import formatTable
+from stats import Histogram
+from utils import wilsonInterval
 
 logging.basicConfig(format='[%(levelname)s] %(message)s', level=logging.WARN)
 
@@ -21,6 +27,50 @@ class TestEvaluate(unittest.TestCase):
         ev.run()
         print(ev.prettyResults())
 
+    def test_parallel(self):
+        n_games = 200
+        players = [DummyPlayer(), AdvancedDummyPlayer(), RandomPlayer()]
+        ev = Evaluation(players, n_games, workers=2)
+        ev.run()
+        self.assertEqual(sum(ev.games_won), n_games)
+        self.assertEqual(sum(rounds.n for rounds in ev.win_rounds.values()), n_games)
+        # Every game ends with all players but one having been kicked
+        n_kicks = sum(n for reasons in ev.loss_reason.values() for n in reasons.values())
+        self.assertEqual(n_kicks, n_games * (len(players) - 1))
+        game_lengths = ev.getGameLengths()
+        self.assertEqual(game_lengths.n, n_games)
+        self.assertEqual(sum(game_lengths.counts) + game_lengths.overflow, n_games)
+
+    def test_seed(self):
+        players = [DummyPlayer(), AdvancedDummyPlayer(), ShowOffPlayer(), RandomPlayer()]
+        serial = Evaluation(players, 200, seed=42)
+        serial.run()
+        # Results must not depend on the number of workers the games were distributed across
+        parallel = Evaluation(players, 200, seed=42, workers=3)
+        parallel.run()
+        self.assertEqual(serial.games_won, parallel.games_won)
+        self.assertEqual(serial.loss_reason, parallel.loss_reason)
+        self.assertEqual(serial.win_rounds, parallel.win_rounds)
+        for player_id, rounds in serial.win_rounds.items():
+            self.assertAlmostEqual(rounds.mean, parallel.win_rounds[player_id].mean)
+        self.assertEqual(serial.gameSeed(7), Evaluation(players, 0, seed=42).gameSeed(7))
+        self.assertNotEqual(serial.gameSeed(7), serial.gameSeed(8))
+
+    def test_errors(self):
+        ev = Evaluation([DummyPlayer(), RandomPlayer(), ThresholdPlayer()], 500, seed=2)
+        ev.run()
+        for p in ev.players:
+            errors = ev.getPlayerErrors(p.id)
+            self.assertEqual(len(errors), len(ev.getPlayerStats(p.id)))
+            self.assertTrue(all(err >= 0 for err in errors))
+        self.assertGreater(ev.getPlayerErrors(0)[0], 0)
+        self.assertIn("±", ev.prettyResults())
+
+    def test_winner_counted(self):
+        ev = Evaluation([DummyPlayer(), DummyPlayer()], 100)
+        ev.run()
+        self.assertEqual(sum(ev.games_won), 100)
+
 class TestOnInitPlayer(Player):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -74,3 +124,119 @@ class TestCounterThres(unittest.TestCase):
 
         print(formatTable(table))
 
+
+class TestLogs(unittest.TestCase):
+    def test_record_logs(self):
+        players = [DummyPlayer(), CounterDummyPlayer(), TrackingPlayer()]
+        counting = Evaluation(players, 100, seed=2)
+        counting.run()
+        self.assertEqual(counting.logs, [])
+        recording = Evaluation(players, 100, seed=2, record_logs=True)
+        recording.run()
+        self.assertEqual(len(recording.logs), 100)
+        self.assertEqual(counting.games_won, recording.games_won)
+        self.assertEqual(counting.win_rounds, recording.win_rounds)
+        self.assertEqual(counting.loss_reason, recording.loss_reason)
+
+class TestReplay(unittest.TestCase):
+    def test_replay(self):
+        players = [DummyPlayer(), AdvancedDummyPlayer(), ShowOffPlayer(), RandomPlayer(), CounterDummyPlayer()]
+        ev = Evaluation(players, 30, seed=11, record_logs=True)
+        ev.run()
+        for game_index in (0, 17, 29):
+            game = ev.replay(game_index)
+            self.assertEqual([repr(p) for p in game.log.players], [repr(p) for p in ev.logs[game_index].players])
+            self.assertEqual([repr(e) for e in game.log.getEvents()], [repr(e) for e in ev.logs[game_index].getEvents()])
+        with self.assertRaises(ValueError):
+            ev.replay(30)
+
+    def test_replay_fast(self):
+        # Games played by FastGame are replayed by Game
+        players = [DummyPlayer(), AdvancedDummyPlayer(), ThresholdPlayer()]
+        ev = Evaluation(players, 20, seed=4)
+        ev.run()
+        win_rounds = {p.id: Histogram() for p in ev.players}
+        for game_index in range(20):
+            game = ev.replay(game_index)
+            win_rounds[game.log.winner_id].add(game.log.countRounds())
+        self.assertEqual(win_rounds, ev.win_rounds)
+
+class TestPlotData(unittest.TestCase):
+    def test_class_stats(self):
+        players = [DummyPlayer() for _ in range(20)] + [RandomPlayer()]
+        ev = Evaluation(players, 200, seed=6)
+        ev.run()
+        names, stats, errors = ev.getClassStats()
+        self.assertEqual(names, ["DummyPlayer (x20)", "RandomPlayer (x1)"])
+        self.assertAlmostEqual(stats[0][0] * 20 + stats[1][0], 1.0)
+        self.assertEqual(stats[1], ev.getPlayerStats(20))
+        self.assertAlmostEqual(errors[1][0], ev.getPlayerErrors(20)[0])
+        # Too many players to plot one bar each
+        self.assertEqual(ev._plotData()[0], names)
+
+    def test_plot_to_files(self):
+        ev = Evaluation([DummyPlayer(), RandomPlayer()], 50, seed=6)
+        ev.run()
+        with tempfile.TemporaryDirectory() as out_dir:
+            process = ev.plotToFiles(os.path.join(out_dir, "plots"), ["png"], ["win_rate", "game_length"])
+            process.join()
+            self.assertEqual(process.exitcode, 0)
+            self.assertEqual(sorted(os.listdir(os.path.join(out_dir, "plots"))), ["game_length.png", "win_rate.png"])
+        with self.assertRaises(ValueError):
+            ev.plotToFiles(out_dir, ["gif"])
+
+
+class TestPrecision(unittest.TestCase):
+    def test_stops_early(self):
+        ev = Evaluation([RandomPlayer(), RandomPlayer()], 100000, seed=5, precision=0.1)
+        ev.run()
+        self.assertLess(ev.games_played, ev.n_repetitions)
+        self.assertEqual(sum(ev.games_won), ev.games_played)
+        self.assertTrue(ev.isPrecise())
+        # The results are the same as those of a simulation of exactly that many games
+        reference = Evaluation([RandomPlayer(), RandomPlayer()], ev.games_played, seed=5)
+        reference.run()
+        self.assertEqual(ev.games_won, reference.games_won)
+
+    def test_cap(self):
+        ev = Evaluation([DummyPlayer(), RandomPlayer()], 1500, seed=5, precision=1e-4, workers=2)
+        ev.run()
+        self.assertEqual(ev.games_played, 1500)
+        self.assertFalse(ev.isPrecise())
+        self.assertIn("not reached", ev.prettyResults())
+
+    def test_workers_keep_players(self):
+        # Players that learn from previous games keep what they learned in every step
+        evaluate._initWorker(None, multiprocessing.Value("i", 0), [TrackingPlayer(), DummyPlayer(), RandomPlayer()], 1, True, False)
+        observations = evaluate._worker_ev.observations
+        games_won, _, _ = evaluate._runWorker(0, 50)
+        self.assertEqual(sum(games_won), 50)
+        n_throws = sum(summary[0] for summary in observations.throw_summaries.values())
+        games_won, _, _ = evaluate._runWorker(50, 100)
+        # Only the results of the games of the step are returned
+        self.assertEqual(sum(games_won), 50)
+        self.assertIs(evaluate._worker_ev.observations, observations)
+        self.assertGreater(sum(summary[0] for summary in observations.throw_summaries.values()), n_throws)
+
+    def test_wilson_interval(self):
+        self.assertEqual(wilsonInterval(0, 0), (0.0, 1.0))
+        low, high = wilsonInterval(0, 100)
+        self.assertAlmostEqual(low, 0.0)
+        self.assertGreater(high, 0.0)
+        low, high = wilsonInterval(500, 1000)
+        self.assertAlmostEqual((low + high) / 2, 0.5)
+        self.assertAlmostEqual(high - low, 2 * 1.96 * 0.5 / 1000 ** 0.5, places=3)
+
+
+class TestFast(unittest.TestCase):
+    def test_same_results(self):
+        players = [DummyPlayer(), AdvancedDummyPlayer(), ShowOffPlayer(), RandomPlayer(), ThresholdPlayer()]
+        fast = Evaluation(players, 300, seed=1)
+        reference = Evaluation(players, 300, seed=1, fast=False)
+        self.assertIsNotNone(fast._fast_game)
+        self.assertIsNone(reference._fast_game)
+        fast.run()
+        reference.run()
+        self.assertEqual(fast.games_won, reference.games_won)
+        self.assertEqual(fast.win_rounds, reference.win_rounds)
+        self.assertEqual(fast.loss_reason, reference.loss_reason)
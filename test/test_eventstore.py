@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+
+from evaluate import Evaluation
+from eventstore import EventStore, EventStoreWriter, KICK_REASON_CODES
+from gameevent import EVENT_TYPES, EventKick, EventThrow, KICK_REASON
+from player import DummyPlayer, AdvancedDummyPlayer, TrackingPlayer
+
+
+class TestEventStore(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "events.bin")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_empty(self):
+        EventStoreWriter(self.path).close()
+        self.assertEqual(len(EventStore(self.path)), 0)
+
+    def test_evaluation(self):
+        players = [DummyPlayer(), AdvancedDummyPlayer(), TrackingPlayer()]
+        with EventStoreWriter(self.path, buffer_size=64) as writer:
+            ev = Evaluation(players, 50, seed=0, tracer=writer, record_logs=True)
+            ev.run()
+        store = EventStore(self.path)
+        self.assertEqual(len(store), writer.n_events)
+        self.assertEqual(len(store), sum(len(log.getEvents()) for log in ev.logs))
+
+        # Compare one game with its log
+        events = ev.logs[7].getEvents()
+        records = store.game(7)
+        self.assertEqual(len(records), len(events))
+        for event, record in zip(events, records):
+            self.assertEqual(record["player"], event.player_id)
+            if isinstance(event, EventKick):
+                self.assertEqual(record["reason"], KICK_REASON_CODES[event.reason])
+            if isinstance(event, EventThrow):
+                self.assertEqual(record["stated"], event.throw_stated.rank)
+                self.assertGreaterEqual(record["actual"], 0)
+
+        self.assertEqual(len(store.ofType(EVENT_TYPES.FINISH)), 50)
+        kicks = store.countKicks()
+        for player_id, reasons in ev.loss_reason.items():
+            for i, reason in enumerate(KICK_REASON):
+                self.assertEqual(kicks[player_id, i], reasons[reason])
+
+    def test_invalid(self):
+        with open(self.path, "wb") as file:
+            file.write(b"not an event store")
+        with self.assertRaises(ValueError):
+            EventStore(self.path)
+
+    def test_truncated(self):
+        with open(self.path, "wb") as file:
+            file.write(b"MX")
+        with self.assertRaises(ValueError):
+            EventStore(self.path)
+        # A partially written event at the end
+        with EventStoreWriter(self.path) as writer:
+            ev = Evaluation([DummyPlayer(), AdvancedDummyPlayer()], 2, seed=0, tracer=writer)
+            ev.run()
+        with open(self.path, "ab") as file:
+            file.write(b"\0" * 5)
+        with self.assertRaises(ValueError):
+            EventStore(self.path)
@@ -0,0 +1,63 @@
+import math
+import unittest
+
+from evaluate import Evaluation
+from exact import ExactEvaluation, REASONS, _distinctPermutations
+from gameevent import KICK_REASON
+from player import DummyPlayer, AdvancedDummyPlayer, RandomPlayer, ThresholdPlayer, CounterDummyPlayer
+
+
+class TestExactEvaluation(unittest.TestCase):
+    def test_symmetric(self):
+        ev = ExactEvaluation([DummyPlayer(), DummyPlayer(), DummyPlayer()])
+        ev.run()
+        for p in ev.players:
+            self.assertAlmostEqual(ev.win_rate[p.id], 1 / 3)
+
+    def test_probabilities_sum_to_one(self):
+        ev = ExactEvaluation([DummyPlayer(), RandomPlayer(), ThresholdPlayer(), AdvancedDummyPlayer(), DummyPlayer()])
+        ev.run()
+        self.assertAlmostEqual(ev.win_rate.sum(), 1)
+        for p in ev.players:
+            self.assertAlmostEqual(ev.win_rate[p.id] + ev.kick_rate[p.id].sum(), 1)
+            stats = ev.getPlayerStats(p.id)
+            self.assertAlmostEqual(sum(stats[2:]), 1)
+            self.assertEqual(stats[2 + list(KICK_REASON).index(KICK_REASON.NO_RESPONSE)], 0.0)
+        # Players with the same strategy have the same results
+        self.assertEqual(ev.getPlayerStats(0), ev.getPlayerStats(4))
+
+    def test_matches_simulation(self):
+        players = [DummyPlayer(), RandomPlayer(), ThresholdPlayer(doubtThreshold=55, lieThreshold=62)]
+        exact = ExactEvaluation(players)
+        exact.run()
+        n = 20000
+        simulated = Evaluation(players, n, show_progress=False, seed=7, batch=True)
+        simulated.run()
+        for player_id in range(len(players)):
+            expected = exact.getPlayerStats(player_id)
+            actual = simulated.getPlayerStats(player_id)
+            # Within five standard errors of the exact win rate
+            std_error = math.sqrt(expected[0] * (1 - expected[0]) / n)
+            self.assertAlmostEqual(actual[0], expected[0], delta=5 * std_error)
+            self.assertAlmostEqual(actual[1], expected[1], delta=0.2)
+            for reason in REASONS:
+                i = 2 + list(KICK_REASON).index(reason)
+                self.assertAlmostEqual(actual[i], expected[i], delta=0.03)
+
+    def test_stateful(self):
+        with self.assertRaises(ValueError):
+            ExactEvaluation([DummyPlayer(), CounterDummyPlayer()])
+
+    def test_too_few_players(self):
+        with self.assertRaises(ValueError):
+            ExactEvaluation([DummyPlayer()]).run()
+
+    def test_distinct_permutations(self):
+        rings = list(_distinctPermutations([2, 1, 1]))
+        self.assertEqual(len(rings), 12)
+        self.assertEqual(len(set(rings)), 12)
+        self.assertTrue(all(sorted(ring) == [0, 0, 1, 2] for ring in rings))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+from evaluate import Evaluation
+from fastgame import FastGame
+from game import Game, TooFewPlayers
+from player import DummyPlayer, AdvancedDummyPlayer, CounterDummyPlayer, ShowOffPlayer, RandomPlayer, ThresholdPlayer
+from gameevent import EventKick
+
+
+class AlwaysDoubtingPlayer(DummyPlayer):
+    """Overrides getDoubt() but not getDoubtRank()"""
+    def getDoubt(self, lastThrow, iMove, rng):
+        return True
+
+
+class TestFastGame(unittest.TestCase):
+    def setUp(self):
+        self.players = [DummyPlayer(), AdvancedDummyPlayer(), ShowOffPlayer(), RandomPlayer(),
+                        ThresholdPlayer(), ThresholdPlayer(doubtThreshold=66, lieThreshold=44)]
+        for i, player in enumerate(self.players):
+            player.id = i
+
+    def test_supports(self):
+        self.assertTrue(FastGame.supports(self.players))
+        self.assertFalse(FastGame.supports([*self.players, CounterDummyPlayer()]))
+        with self.assertRaises(ValueError):
+            FastGame([*self.players, CounterDummyPlayer()])
+
+    def test_supports_subclass(self):
+        self.assertFalse(FastGame.supports([*self.players, AlwaysDoubtingPlayer()]))
+        ev = Evaluation([DummyPlayer(), AlwaysDoubtingPlayer()], 10)
+        self.assertIsNone(ev._fast_game)
+
+    def test_too_few(self):
+        with self.assertRaises(TooFewPlayers):
+            FastGame([DummyPlayer(player_id=0)]).play(0)
+
+    def test_same_as_game(self):
+        fast_game = FastGame(self.players)
+        for seed in range(300):
+            game = Game(self.players, seed=seed, disable_assign_ids=True)
+            game.init()
+            game.run()
+            fast_game.play(seed)
+            self.assertEqual(fast_game.winner_id, game.log.winner_id)
+            self.assertEqual(fast_game.n_moves, game.log.countRounds())
+            kicks = [(e.player_id, e.reason) for e in game.log.getEvents() if isinstance(e, EventKick)]
+            self.assertEqual(list(zip(fast_game.kick_ids, fast_game.kick_reasons))[:fast_game.n_kicks], kicks)
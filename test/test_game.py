@@ -1,6 +1,7 @@
 # TODO: Do `from unittest import TestCase` instead
 import unittest
 import logging
+from random import Random
 
 from game import Game, TooFewPlayers, DuplicateId
 from player import Player, DummyPlayer, AdvancedDummyPlayer, CounterDummyPlayer, ShowOffPlayer, RandomPlayer, ThresholdPlayer, TrackingPlayer
@@ -19,6 +20,20 @@ class TestInit(unittest.TestCase):
         Game([DummyPlayer(), DummyPlayer()], shuffle_players=False)
         Game([DummyPlayer(), DummyPlayer()], shuffle_players=True)
 
+        # The list passed to Game must keep its order
+        players = [DummyPlayer(player_id=i) for i in range(10)]
+        Game(players, seed=1, shuffle_players=True)
+        self.assertEqual([p.id for p in players], list(range(10)))
+
+    def test_reproducible(self):
+        logs = []
+        for _ in range(2):
+            game = Game([DummyPlayer(player_id=i) for i in range(4)], seed=0, disable_assign_ids=True)
+            game.init()
+            game.run()
+            logs.append([repr(e) for e in game.log.getEvents()])
+        self.assertEqual(logs[0], logs[1])
+
     def test_duplicate(self):
         # This should not work
         with self.assertRaises(DuplicateId):
@@ -56,6 +71,31 @@ class TestNPlayers(unittest.TestCase):
         self.game.run()
 
 
+    def test_large_table(self):
+        game = Game([DummyPlayer() for _ in range(2000)], seed=0)
+        game.init()
+        game.run()
+        self.assertTrue(game.log.hasFinished())
+        self.assertEqual(game.countAlivePlayers(), 1)
+
+
+class TestAlivePlayers(unittest.TestCase):
+    def test_next_prev(self):
+        n = 50
+        game = Game([DummyPlayer() for _ in range(n)], seed=0)
+        rng = Random(0)
+        for i in rng.sample(range(n), n - 1):
+            game.kickPlayer(i, gameevent.KICK_REASON.LYING)
+            alive = [j for j in range(n) if game.alive_players[j]]
+            self.assertEqual(game.countAlivePlayers(), len(alive))
+            for start in range(-n, 2 * n):
+                # Compare with a linear search
+                expected_next = next(j % n for j in range(start, start + n) if game.alive_players[j % n])
+                expected_prev = next(j % n for j in range(start, start - n, -1) if game.alive_players[j % n])
+                self.assertEqual(game.nextAlivePlayer(start), expected_next)
+                self.assertEqual(game.prevAlivePlayer(start), expected_prev)
+
+
 class TestPlayerIds(unittest.TestCase):
     """Testet das verhalten der Game Klasse hinsichtlich dem vergeben einzigartiger ids"""
 
@@ -123,6 +163,26 @@ class TestEventListening(unittest.TestCase):
         game.init()
         game.run()
 
+    def test_subscriptions(self):
+        class KickListenerPlayer(DummyPlayer):
+            subscribed_events = frozenset({gameevent.EVENT_TYPES.KICK})
+
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.listens_to_events = True
+                self.events = []
+
+            def onEvent(self, event):
+                self.events.append(event)
+
+        listener = KickListenerPlayer()
+        game = Game([DummyPlayer(), RandomPlayer(), listener], seed=1)
+        game.init()
+        game.run()
+        self.assertEqual(len(listener.events), 2)
+        self.assertTrue(all(e.event_type == gameevent.EVENT_TYPES.KICK for e in listener.events))
+        self.assertFalse(game._listeners[gameevent.EVENT_TYPES.DOUBT])
+
 
 class TestTrackingPlayer(unittest.TestCase):
     def test_tracking(self):
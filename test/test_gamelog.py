@@ -1,8 +1,8 @@
 import unittest
 
 from player import DummyPlayer, ShowOffPlayer
-from gamelog import GameLog
-from gameevent import EventAbort, EventFinish
+from gamelog import GameLog, CountingLog
+from gameevent import EventAbort, EventFinish, EventKick, KICK_REASON
 
 
 class TestGameLog(unittest.TestCase):
@@ -36,3 +36,26 @@ class TestGameLog(unittest.TestCase):
         log = GameLog(players)
         log.happen(EventAbort())
         self.assertTrue(log.hasFinished())
+
+
+class TestCountingLog(unittest.TestCase):
+    def test_counting(self):
+        loss_reason = {i: {reason: 0 for reason in KICK_REASON} for i in range(2)}
+        log = CountingLog(loss_reason)
+        self.assertFalse(log.hasFinished())
+        log.newRound()
+        log.newRound()
+        log.happen(EventKick(0, KICK_REASON.LYING))
+        log.happen(EventFinish(1))
+        self.assertTrue(log.hasFinished())
+        self.assertEqual(log.countRounds(), 2)
+        self.assertEqual(log.winner_id, 1)
+        self.assertEqual(loss_reason[0][KICK_REASON.LYING], 1)
+        log.pretty()
+
+        log.reset()
+        self.assertFalse(log.hasFinished())
+        self.assertEqual(log.countRounds(), 0)
+        self.assertIsNone(log.winner_id)
+        # Counters are kept across games
+        self.assertEqual(loss_reason[0][KICK_REASON.LYING], 1)
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+from urllib.request import urlopen
+
+from evaluate import Evaluation
+from metrics import MetricsError, MetricsExporter, renderMetrics
+from player import DummyPlayer, RandomPlayer
+
+
+def parseMetrics(text):
+    """Return the samples of a Prometheus text exposition as {name{labels}: value}"""
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+class TestRender(unittest.TestCase):
+    def test_render(self):
+        ev = Evaluation([DummyPlayer(), RandomPlayer()], 100, seed=1)
+        ev.run()
+        samples = parseMetrics(renderMetrics(ev))
+        self.assertEqual(samples["maexchen_games_completed_total"], 100)
+        self.assertEqual(samples["maexchen_games_evaluated_total"], 100)
+        self.assertEqual(samples['maexchen_wins_total{player="0",class="DummyPlayer"}'], ev.games_won[0])
+        self.assertAlmostEqual(samples['maexchen_win_rate{player="1",class="RandomPlayer"}'], ev.games_won[1] / 100, places=5)
+        n_kicks = sum(v for k, v in samples.items() if k.startswith("maexchen_kicks_total"))
+        self.assertEqual(n_kicks, 100)
+
+
+class TestExporter(unittest.TestCase):
+    def test_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "metrics.prom")
+            ev = Evaluation([DummyPlayer(), RandomPlayer()], 100, seed=1, metrics=MetricsExporter(path=path), workers=2)
+            ev.run()
+            with open(path) as file:
+                samples = parseMetrics(file.read())
+            self.assertEqual(samples["maexchen_games_completed_total"], 100)
+            self.assertGreater(samples["maexchen_moves_completed_total"], 100)
+            self.assertEqual(os.listdir(tmp_dir), ["metrics.prom"])
+
+    def test_http(self):
+        exporter = MetricsExporter(port=0)
+        ev = Evaluation([DummyPlayer(), RandomPlayer()], 10, seed=1)
+        ev.run()
+        with exporter.exporting(ev):
+            with urlopen(f"http://127.0.0.1:{exporter.port}/metrics") as response:
+                self.assertIn("text/plain", response.headers["Content-Type"])
+                samples = parseMetrics(response.read().decode())
+        self.assertEqual(samples["maexchen_games_completed_total"], 10)
+
+    def test_port_in_use(self):
+        ev = Evaluation([DummyPlayer(), RandomPlayer()], 10, seed=1)
+        exporter = MetricsExporter(port=0)
+        with exporter.exporting(ev):
+            with self.assertRaises(MetricsError):
+                with MetricsExporter(port=exporter.port).exporting(ev):
+                    pass
+
+    def test_needs_target(self):
+        with self.assertRaises(ValueError):
+            MetricsExporter()
+
+
+if __name__ == '__main__':
+    unittest.main()
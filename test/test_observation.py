@@ -0,0 +1,95 @@
+import unittest
+
+from evaluate import Evaluation
+from game import Game
+import gameevent
+from observation import ObservationService
+from player import DummyPlayer, RandomPlayer, ThresholdPlayer, CounterThresPlayer, TrackingPlayer
+from throw import Throw
+
+
+class TestObservationService(unittest.TestCase):
+    def test_throws(self):
+        obs = ObservationService(ignored_ids=[2])
+        obs.onEvent(gameevent.EventThrow(0, None, Throw(31)))
+        obs.onEvent(gameevent.EventThrow(0, None, Throw(31)))
+        obs.onEvent(gameevent.EventThrow(1, None, Throw(32)))
+        # Players that aren't observed are ignored
+        obs.onEvent(gameevent.EventThrow(2, None, Throw(32)))
+        self.assertEqual(obs.throw_counts[0][Throw(31).rank], 2)
+        self.assertEqual(list(obs.throwSummary(0)), [2, 2, Throw(31).rank, 0])
+        self.assertEqual(list(obs.throwSummary(1)), [1, 1, Throw(32).rank, 0])
+        self.assertNotIn(2, obs.throw_counts)
+        self.assertEqual(sum(obs.throwCounts(2)), 0)
+
+    def test_truths(self):
+        obs = ObservationService()
+        obs.onEvent(gameevent.EventThrow(0, None, Throw(31)))
+        obs.onEvent(gameevent.EventKick(1, gameevent.KICK_REASON.FALSE_ACCUSATION))
+        obs.onEvent(gameevent.EventThrow(1, None, Throw(31)))
+        obs.onEvent(gameevent.EventThrow(2, None, Throw(21)))
+        obs.onEvent(gameevent.EventKick(2, gameevent.KICK_REASON.LYING))
+        self.assertEqual({player_id: list(counts) for player_id, counts in obs.truth_counts.items()}, {0: [1, 0], 2: [0, 1]})
+        self.assertEqual(list(obs.truthCounts(1)), [0, 0])
+        self.assertIsNone(obs.last_player_id)
+
+    def test_lazy(self):
+        # Tables are only created for players that were actually observed
+        obs = ObservationService()
+        self.assertEqual(obs.throwSummary(5)[ObservationService.SUMMARY_TOTAL], 0)
+        obs.onEvent(gameevent.EventThrow(5, None, Throw(31)))
+        self.assertEqual(list(obs.throw_counts), [5])
+        self.assertFalse(obs.truth_counts)
+
+
+class RecordingService(ObservationService):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.event_types = set()
+
+    def onEvent(self, event):
+        self.event_types.add(event.event_type)
+        super().onEvent(event)
+
+
+class TestShared(unittest.TestCase):
+    def test_subscribed_events(self):
+        # Game only passes on the types of events that change the statistics
+        obs = RecordingService()
+        game = Game([DummyPlayer(), RandomPlayer(), ThresholdPlayer()], seed=1, observations=obs)
+        game.init()
+        game.run()
+        self.assertEqual(obs.event_types, ObservationService.subscribed_events)
+
+    def test_evaluation(self):
+        players = [CounterThresPlayer(), CounterThresPlayer(), TrackingPlayer(), TrackingPlayer(),
+                   ThresholdPlayer(), DummyPlayer(), RandomPlayer()]
+        ev = Evaluation(players, 50, seed=3)
+        for player in ev.players:
+            if player.uses_observations:
+                self.assertIs(player.observations, ev.observations)
+        ev.run()
+        total_throws = sum(summary[ObservationService.SUMMARY_TOTAL] for summary in ev.observations.throw_summaries.values())
+        self.assertGreater(total_throws, 0)
+
+    def test_no_observers(self):
+        ev = Evaluation([DummyPlayer(), RandomPlayer()], 1)
+        self.assertIsNone(ev.observations)
+
+    def test_same_decisions(self):
+        # Reading shared statistics must give the same results as each player collecting their own
+        def run(share):
+            players = [CounterThresPlayer(), TrackingPlayer(), ThresholdPlayer(), DummyPlayer(), RandomPlayer()]
+            ev = Evaluation(players, 100, seed=4)
+            if not share:
+                for player in ev.players:
+                    player.onInit(ev.players)
+                ev.observations = None
+            ev.run()
+            return ev.games_won, ev.loss_reason
+
+        self.assertEqual(run(True), run(False))
+
+
+if __name__ == '__main__':
+    unittest.main()
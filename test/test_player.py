@@ -91,8 +91,10 @@ class TestTrackingPlayer(unittest.TestCase):
         self.tr.onInit([self.tr, *self.dummies])
 
     def test_stats_creation(self):
-        # Überprüfen, dass leere Statistik korrekt erzeugt wird
-        self.assertEqual(list(self.tr.playerStats.keys()), [p.id for p in self.dummies])
+        # Statistics are only created once something was observed about a player
+        self.assertEqual(list(self.tr.playerStats.keys()), [])
+        for p in self.dummies:
+            self.assertFalse(self.tr.existPlayerStats(p.id))
 
     def test_track_last_throw(self):
         # Überprüfen, dass TrackingPlayer den letzten und vorletzten Wurf abspeichert
@@ -149,7 +151,8 @@ class TestCounterThresPlayer(unittest.TestCase):
 
     def test_on_init(self):
         for dummy in self.dummies:
-            self.assertEqual(self.ctp.throwStats[dummy.id], [0] * c.N_THROW_VALUES)
+            self.assertNotIn(dummy.id, self.ctp.throwStats)
+            self.assertEqual(self.ctp.totalThrowsTracked(dummy.id), 0)
 
     def test_equal_number_of_throws(self):
         dummy = DummyPlayer(player_id=0)
@@ -189,3 +192,16 @@ class TestCounterThresPlayer(unittest.TestCase):
         self.assertTrue(self.ctp.getDoubt(throw1, n + 2, None))
         self.ctp.getThrowStated(Throw(21), Throw(66), 1, None)
 
+
+    def test_summary(self):
+        # The incrementally updated summary must match the statistics computed from the table
+        rng = Random(0)
+        dummy_id = self.dummies[0].id
+        for _ in range(300):
+            rank = min(rng.randrange(c.N_THROW_VALUES), rng.randrange(c.N_THROW_VALUES))
+            self.ctp.onEvent(gameevent.EventThrow(dummy_id, None, Throw(c.THROW_VALUES[rank])))
+            p_stats = self.ctp.throwStats[dummy_id]
+            max_freq = max(p_stats)
+            self.assertEqual(self.ctp.totalThrowsTracked(dummy_id), sum(p_stats))
+            self.assertEqual(self.ctp.mostFreqThrowIndices(dummy_id), [i for i, n in enumerate(p_stats) if n == max_freq])
+            self.assertAlmostEqual(self.ctp.mostFreqThrowFreq(dummy_id), max_freq / sum(p_stats))
@@ -1,6 +1,8 @@
+import os
+import tempfile
 import unittest
 
-from plot import plotWinRate, plotLossReason
+from plot import plotWinRate, plotLossReason, plotGameLength, saveFigures
 
 
 class TestPlot(unittest.TestCase):
@@ -19,3 +21,16 @@ class TestPlot(unittest.TestCase):
         ]
 
         plotLossReason(player_names, loss_reaons)
+
+    def test_plot_game_length(self):
+        plotGameLength([0, 0, 3, 10, 7, 2], overflow=1)
+
+    def test_save_figures(self):
+        player_names = ["DummyPlayer (x100)", "RandomPlayer (x50)"]
+        figures = {
+            "win_rate": ((player_names, [0.6, 0.4]), {"errors": [0.01, 0.02]}),
+            "loss_reason": ((player_names, [[0.5, 0.5, 0], [0.2, 0.3, 0.5]]), {"errors": [[0.01] * 3, [0.02] * 3]}),
+        }
+        with tempfile.TemporaryDirectory() as out_dir:
+            saveFigures(figures, out_dir, ["png", "svg"])
+            self.assertEqual(sorted(os.listdir(out_dir)), ["loss_reason.png", "loss_reason.svg", "win_rate.png", "win_rate.svg"])
@@ -0,0 +1,58 @@
+import io
+import time
+import unittest
+
+from evaluate import Evaluation
+from gameevent import KICK_REASON
+from player import DummyPlayer, RandomPlayer, TrackingPlayer
+from progress import ProgressCounters, ProgressReporter, GAMES, MOVES, N_COUNTERS, formatDuration
+
+
+class TestProgressReporter(unittest.TestCase):
+    def test_counters(self):
+        stream = io.StringIO()
+        progress = ProgressCounters(n_slots=2)
+        with ProgressReporter(progress, 100, interval=0.01, stream=stream):
+            progress.counters[GAMES] += 10
+            progress.counters[N_COUNTERS + GAMES] += 15
+            progress.counters[N_COUNTERS + MOVES] += 300
+            time.sleep(0.05)
+        self.assertEqual(progress.games(), 25)
+        self.assertEqual(progress.moves(), 300)
+        lines = stream.getvalue().replace("\r", "\n").splitlines()
+        self.assertGreater(len(lines), 1)
+        self.assertIn("25/100 games", lines[-1])
+        self.assertIn("ETA", lines[-1])
+
+    def test_format_duration(self):
+        self.assertEqual(formatDuration(0), "0:00:00")
+        self.assertEqual(formatDuration(3723.4), "1:02:03")
+
+
+class TestEvaluationProgress(unittest.TestCase):
+    def run_evaluation(self, players, **kwargs):
+        ev = Evaluation(players, 200, show_progress=True, seed=1, **kwargs)
+        ev.run()
+        self.assertEqual(ev.progress.games(), 200)
+        self.assertEqual(ev.progress.moves(), round(ev.getGameLengths().mean * 200))
+        # The published results are the same as the merged ones
+        for p in ev.players:
+            self.assertEqual(ev.progress.wins(p.id), ev.games_won[p.id])
+            for reason in KICK_REASON:
+                self.assertEqual(ev.progress.kicks(p.id, reason), ev.loss_reason[p.id][reason])
+
+    def test_serial(self):
+        self.run_evaluation([DummyPlayer(), RandomPlayer(), TrackingPlayer()])
+
+    def test_fast(self):
+        self.run_evaluation([DummyPlayer(), RandomPlayer()])
+
+    def test_parallel(self):
+        self.run_evaluation([DummyPlayer(), RandomPlayer()], workers=2)
+
+    def test_batch(self):
+        self.run_evaluation([DummyPlayer(), RandomPlayer()], batch=True, workers=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
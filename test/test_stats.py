@@ -0,0 +1,75 @@
+import random
+import statistics
+import unittest
+
+from stats import Histogram, RunningStats, proportionStdError
+
+
+class TestRunningStats(unittest.TestCase):
+    def test_mean_variance(self):
+        rng = random.Random(0)
+        values = [1e6 + rng.random() for _ in range(1000)]
+        stats = RunningStats(values)
+        self.assertEqual(stats.n, 1000)
+        self.assertAlmostEqual(stats.mean, statistics.mean(values))
+        # A naive sum of squares would lose all precision at this offset
+        self.assertAlmostEqual(stats.variance(), statistics.variance(values), places=6)
+        low, high = stats.interval()
+        self.assertLess(low, stats.mean)
+        self.assertAlmostEqual(high - stats.mean, 1.959963984540054 * stats.stdError())
+
+    def test_merge(self):
+        values = [3, 1, 4, 1, 5, 9, 2, 6, 5, 3, 5]
+        merged = RunningStats(values[:4])
+        merged.merge(RunningStats(values[4:]))
+        merged.merge(RunningStats())
+        self.assertEqual(merged.n, len(values))
+        self.assertAlmostEqual(merged.mean, statistics.mean(values))
+        self.assertAlmostEqual(merged.variance(), statistics.variance(values))
+
+    def test_empty(self):
+        stats = RunningStats()
+        self.assertEqual(stats.variance(), 0.0)
+        self.assertEqual(stats.stdError(), 0.0)
+        stats.add(7)
+        self.assertEqual(stats.variance(), 0.0)
+
+    def test_proportion(self):
+        self.assertEqual(proportionStdError(0, 0), 0.0)
+        self.assertAlmostEqual(proportionStdError(25, 100), statistics.stdev([1] * 25 + [0] * 75) / 10, places=2)
+
+
+class TestHistogram(unittest.TestCase):
+    def test_overflow(self):
+        values = [3, 1, 4, 1, 5, 9, 2, 6, 5, 3, 5, 100, 250]
+        hist = Histogram(values, n_buckets=10)
+        self.assertEqual(list(hist.counts), [0, 2, 1, 2, 1, 3, 1, 0, 0, 1])
+        self.assertEqual(hist.overflow, 2)
+        # Mean and variance include the overflowing values exactly
+        self.assertAlmostEqual(hist.mean, statistics.mean(values))
+        self.assertAlmostEqual(hist.variance(), statistics.variance(values))
+        self.assertEqual(hist.percentile(0), 1)
+        self.assertEqual(hist.percentile(50), 5)
+        self.assertEqual(hist.percentile(100), 10)
+
+    def test_bounded(self):
+        hist = Histogram(n_buckets=16)
+        for i in range(10000):
+            hist.add(i)
+        self.assertEqual(len(hist.counts), 16)
+        self.assertEqual(hist.overflow, 10000 - 16)
+
+    def test_merge_counts(self):
+        values = [7, 0, 3, 3, 12, 7, 7]
+        a = Histogram(values[:3], n_buckets=10)
+        a.merge(Histogram(values[3:], n_buckets=10))
+        b = Histogram(n_buckets=10)
+        b.addCounts([values.count(v) for v in range(max(values) + 1)])
+        self.assertEqual(a, b)
+        self.assertEqual(a, Histogram(values, n_buckets=10))
+        self.assertAlmostEqual(a.mean, b.mean)
+        self.assertAlmostEqual(a.variance(), b.variance())
+
+
+if __name__ == '__main__':
+    unittest.main()
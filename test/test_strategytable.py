@@ -0,0 +1,73 @@
+import unittest
+from random import Random
+
+import numpy as np
+
+import constants as c
+from player import Player, DummyPlayer, AdvancedDummyPlayer, CounterDummyPlayer, RandomPlayer, ThresholdPlayer
+from strategytable import compileStrategy, StrategyNotCompilable
+from throw import Throw
+
+
+class MoveCountingPlayer(DummyPlayer):
+    """Changes its state with every decision"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.n_decisions = 0
+
+    def getDoubt(self, lastThrow, iMove, rng):
+        self.n_decisions += 1
+        return super().getDoubt(lastThrow, iMove, rng)
+
+
+class LateDoubterPlayer(DummyPlayer):
+    """Decides based on the index of the move"""
+    def getDoubt(self, lastThrow, iMove, rng):
+        return iMove > 5
+
+
+class TestCompile(unittest.TestCase):
+    def test_deterministic(self):
+        for player in [DummyPlayer(), ThresholdPlayer(doubtThreshold=55, lieThreshold=62)]:
+            table = compileStrategy(player)
+            self.assertTrue(table.isDeterministic())
+            for last_rank in range(c.N_THROW_VALUES):
+                self.assertEqual(table.doubt[last_rank], player.getDoubtRank(last_rank, 0, Random()))
+            for my_rank in range(c.N_THROW_VALUES):
+                for last_rank in range(-1, c.N_THROW_VALUES):
+                    if last_rank >= 0 and table.doubt[last_rank]:
+                        continue
+                    stated = player.getThrowStatedRank(my_rank, last_rank, 0, Random())
+                    self.assertEqual(table.stated[my_rank, last_rank + 1, stated], 1)
+
+    def test_choice(self):
+        table = compileStrategy(AdvancedDummyPlayer())
+        self.assertFalse(table.isDeterministic())
+        # Forced to lie after a 33, AdvancedDummyPlayer states anything between 44 and 66
+        last_rank = Throw(33).rank
+        expected = np.zeros(c.N_THROW_VALUES)
+        expected[last_rank + 1:c.N_THROW_VALUES - 1] = 1 / (c.N_THROW_VALUES - 2 - last_rank)
+        np.testing.assert_allclose(table.stated[0, last_rank + 1], expected)
+
+    def test_random(self):
+        table = compileStrategy(RandomPlayer(doubtChance=0.3))
+        np.testing.assert_allclose(table.doubt, 0.3)
+        np.testing.assert_allclose(table.stated, 1 / c.N_THROW_VALUES)
+
+    def test_sample(self):
+        table = compileStrategy(RandomPlayer(doubtChance=0.3))
+        rng = np.random.default_rng(0)
+        n = 100000
+        doubt = table.sampleDoubt(np.zeros(n, dtype=np.int64), rng)
+        self.assertAlmostEqual(doubt.mean(), 0.3, delta=0.01)
+        stated = table.sampleStated(np.zeros(n, dtype=np.int64), np.full(n, -1), rng)
+        np.testing.assert_allclose(np.bincount(stated, minlength=c.N_THROW_VALUES) / n, 1 / c.N_THROW_VALUES, atol=0.01)
+
+    def test_stateful(self):
+        for player in [CounterDummyPlayer(), MoveCountingPlayer(), LateDoubterPlayer()]:
+            with self.assertRaises(StrategyNotCompilable):
+                compileStrategy(player)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,8 @@
 import unittest
-from throw import Throw, ThrowOutOfBounds
+import copy
+import pickle
+
+from throw import Throw, NoneThrow, ThrowOutOfBounds, DICE_THROWS, throwByRank
 
 
 class TestThrow(unittest.TestCase):
@@ -16,6 +19,12 @@ class TestRankDict(TestThrow):
                 self.assertTrue(Throw(3, 1) <= t)
                 self.assertEqual(t, t)
 
+    def test_compare_other_types(self):
+        with self.assertRaises(TypeError):
+            Throw(31) >= 31
+        with self.assertRaises(TypeError):
+            Throw(31) <= None
+
     def test_validityChecks(self):
         invalidValues = [34, 35, 36, 45, 46, 56, 71]
         for value in invalidValues:
@@ -35,3 +44,23 @@ class TestRankDict(TestThrow):
         # Größtmöglicher Wert
         big = Throw(2, 1)
         self.assertRaises(ThrowOutOfBounds, big.__add__, 1)
+
+    def test_shared_instances(self):
+        for i in range(1, 7):
+            for j in range(1, 7):
+                self.assertIs(Throw(i, j), Throw(max(i, j) * 10 + min(i, j)))
+        self.assertIs(Throw(65) + 1, Throw(11))
+        self.assertIs(throwByRank(0), Throw(31))
+        self.assertIs(NoneThrow(), NoneThrow())
+        self.assertEqual(len(DICE_THROWS), 36)
+
+    def test_immutable(self):
+        with self.assertRaises(AttributeError):
+            Throw(21).value = 66
+
+    def test_copy(self):
+        throw = Throw(4, 4)
+        self.assertIs(copy.copy(throw), throw)
+        self.assertIs(copy.deepcopy(throw), throw)
+        self.assertIs(pickle.loads(pickle.dumps(throw)), throw)
+        self.assertIs(pickle.loads(pickle.dumps(NoneThrow())), NoneThrow())
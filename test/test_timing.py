@@ -0,0 +1,41 @@
+import unittest
+
+from evaluate import Evaluation
+from player import DummyPlayer, RandomPlayer, TrackingPlayer
+from timing import DecisionTimer, LatencyStats
+
+
+class TestLatencyStats(unittest.TestCase):
+    def test_percentile(self):
+        stats = LatencyStats()
+        for duration in range(1, 1001):
+            stats.add(duration * 1000)
+        self.assertEqual(stats.n_calls, 1000)
+        self.assertAlmostEqual(stats.mean(), 500500)
+        # Percentiles are upper bounds, accurate to one bucket
+        for q in (50, 90, 99):
+            self.assertGreaterEqual(stats.percentile(q), q * 10000)
+            self.assertLess(stats.percentile(q), q * 10000 * 1.1)
+
+
+class TestDecisionTimer(unittest.TestCase):
+    def test_evaluation(self):
+        players = [DummyPlayer(), RandomPlayer(), TrackingPlayer()]
+        timer = DecisionTimer()
+        ev = Evaluation(players, 50, seed=1, timer=timer)
+        ev.run()
+        self.assertEqual({class_name for class_name, _ in timer.stats},
+                         {"DummyPlayer", "RandomPlayer", "TrackingPlayer"})
+        self.assertGreater(timer.stats[("TrackingPlayer", "onEvent")].n_calls, 0)
+        # Only listening players are timed in onEvent()
+        self.assertNotIn(("DummyPlayer", "onEvent"), timer.stats)
+        self.assertIn("Decision times", ev.prettyResults())
+
+        # Timing doesn't change the results
+        reference = Evaluation(players, 50, seed=1)
+        reference.run()
+        self.assertEqual(ev.games_won, reference.games_won)
+
+
+if __name__ == '__main__':
+    unittest.main()
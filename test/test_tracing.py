@@ -0,0 +1,50 @@
+import unittest
+
+from game import Game
+from evaluate import Evaluation
+from player import DummyPlayer, AdvancedDummyPlayer
+from tracing import Tracer, LogTracer, EventSink
+
+
+class MessageCounter(Tracer):
+    def __init__(self):
+        self.n_messages = 0
+
+    def message(self, text):
+        self.n_messages += 1
+
+
+class TestTracing(unittest.TestCase):
+    def test_event_sink(self):
+        sink = EventSink()
+        game = Game([DummyPlayer(), DummyPlayer(), AdvancedDummyPlayer()], seed=0, tracer=sink)
+        game.init()
+        game.run()
+        self.assertEqual(len(sink.records), len(game.log.getEvents()))
+        kicks = [record for record in sink.records if record["type"] == "KICK"]
+        self.assertEqual(len(kicks), 2)
+        self.assertEqual(sink.records[-1]["type"], "FINISH")
+        # The actual throw is recorded before it is hidden from the players
+        throws = [record for record in sink.records if record["type"] == "THROW"]
+        self.assertTrue(all(record["throw_actual"] for record in throws))
+
+    def test_callback(self):
+        records = []
+        game = Game([DummyPlayer(), DummyPlayer()], seed=1, tracer=EventSink(records.append))
+        game.init()
+        game.run()
+        self.assertTrue(records)
+
+    def test_log_tracer(self):
+        game = Game([DummyPlayer(), DummyPlayer()], seed=2, tracer=LogTracer())
+        with self.assertLogs(level="INFO"):
+            game.init()
+            game.run()
+
+    def test_evaluation(self):
+        counter = MessageCounter()
+        ev = Evaluation([DummyPlayer(), DummyPlayer()], 10, tracer=counter, workers=2)
+        # Tracing requires the reference Game
+        self.assertIsNone(ev._fast_game)
+        ev.run()
+        self.assertGreater(counter.n_messages, 10)
@@ -1,5 +1,7 @@
 from __future__ import annotations  # Notwendig für type hints die, die eigene Klasse beinhalten
 
+from typing import Dict, Tuple
+
 import constants as c
 
 
@@ -12,7 +14,13 @@ class ThrowOutOfBounds(Exception):
 
 
 class Throw:
-    """Represents the result of a dice throw"""
+    """Represents the result of a dice throw
+
+    There are only 21 different Throws, and each of them exists exactly once: calling Throw()
+    returns one of the shared instances in THROWS instead of creating a new object. Because of
+    that, Throws are immutable.
+    """
+    __slots__ = ("value", "rank", "is_double", "is_maexchen")
     # The integer value that is formed by according to Mäxchen rules
     value: int
     # Used to compare two Throws
@@ -20,26 +28,48 @@ class Throw:
     is_double: bool
     is_maexchen: bool
 
-    def __init__(self, *args: int) -> None:
+    def __new__(cls, *args: int) -> Throw:
         if len(args) == 1:
             # Got one argument -> must be the value of the Throw
-            self.value = args[0]
-            if self.value not in c.THROW_VALUES:
-                raise ValueError(f"Got invalid value for initializing Throw: {self.value}.")
-            num0 = self.value // 10
-            num1 = self.value % 10
+            try:
+                return _THROWS_BY_VALUE[args[0]]
+            except (KeyError, TypeError):
+                raise ValueError(f"Got invalid value for initializing Throw: {args[0]}.") from None
         elif len(args) == 2:
             # Got two arguments -> must be the results of two individual dice throws
             num0, num1 = args
-            if not 1 <= num0 <= 6 and 1 <= num1 <= 6:
+            if not (1 <= num0 <= 6 and 1 <= num1 <= 6):
                 raise ValueError("Values must be elements of [1, 6].")
-            self.value = max(num0, num1) * 10 + min(num0, num1)
+            return DICE_THROWS[(num0 - 1) * 6 + num1 - 1]
         else:
             raise TypeError(f"Throw() takes either one or two arguments, got {len(args)}")
 
-        self.rank = c.THROW_RANK_BY_VALUE[self.value]
-        self.is_double = num0 == num1  # Pasch
-        self.is_maexchen = self.value == c.MAEXCHEN  # Mäxchen
+    @classmethod
+    def _create(cls, value: int) -> Throw:
+        """Create a new instance. This is only used to build the table of all Throws."""
+        throw = object.__new__(cls)
+        object.__setattr__(throw, "value", value)
+        object.__setattr__(throw, "rank", c.THROW_RANK_BY_VALUE[value])
+        object.__setattr__(throw, "is_double", value // 10 == value % 10)  # Pasch
+        object.__setattr__(throw, "is_maexchen", value == c.MAEXCHEN)  # Mäxchen
+        return throw
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"{self.__class__.__name__} instances are immutable")
+
+    def __reduce__(self):
+        # Unpickling looks up the shared instance again
+        return (Throw, (self.value,))
+
+    def __copy__(self) -> Throw:
+        return self
+
+    def __deepcopy__(self, memo) -> Throw:
+        return self
+
+    def __hash__(self) -> int:
+        # Consistent with __eq__, which also compares the value to ints
+        return hash(self.value)
 
     def __str__(self) -> str:
         return str(self.value)
@@ -65,33 +95,37 @@ class Throw:
         """Check if another Throw is of a higher rank
 
         :param other: Throw to compare"""
-        if not isinstance(other, Throw):
+        try:
+            return self.rank > other.rank
+        except AttributeError:
             return False
-        return self.rank > other.rank
 
     def __lt__(self, other: Throw) -> bool:
         """Check if another Throw is of a lower rank
 
         :param other: Throw to compare"""
-        if not isinstance(other, Throw):
+        try:
+            return self.rank < other.rank
+        except AttributeError:
             return False
-        return self.rank < other.rank
 
     def __ge__(self, other: Throw) -> bool:
         """Check if another Throw is of a greater or equal rank
 
         :param other: Throw to compare"""
-        # a !< b  <=>  a >= b
-        return not self < other
+        try:
+            return self.rank >= other.rank
+        except AttributeError:
+            return NotImplemented
 
     def __le__(self, other: Throw) -> bool:
         """Check if another Throw is of a lower or equal rank
 
         :param other: Throw to compare"""
-        if not isinstance(other, Throw):
-            return False
-        # a !> b  <=>  a <= b
-        return not self > other
+        try:
+            return self.rank <= other.rank
+        except AttributeError:
+            return NotImplemented
 
     def __add__(self, other: int) -> Throw:
         """Return the n'th next Throw.  
@@ -102,8 +136,8 @@ class Throw:
         if not isinstance(other, int):
             return False
         newRank = self.rank + other
-        if 0 <= newRank < len(c.THROW_VALUES):
-            return Throw(c.THROW_VALUES[newRank])
+        if 0 <= newRank < c.N_THROW_VALUES:
+            return THROWS[newRank]
         else:
             raise ThrowOutOfBounds
 
@@ -116,13 +150,31 @@ class Throw:
         return self.__add__(-other)
 
 
+# Every possible Throw, ordered by rank
+THROWS: Tuple[Throw, ...] = tuple(Throw._create(value) for value in c.THROW_VALUES)
+_THROWS_BY_VALUE: Dict[int, Throw] = {throw.value: throw for throw in THROWS}
+# The Throw for each of the 36 equally likely outcomes of rolling two dice,
+# indexed by (die0 - 1) * 6 + (die1 - 1)
+DICE_THROWS: Tuple[Throw, ...] = tuple(_THROWS_BY_VALUE[max(num0, num1) * 10 + min(num0, num1)]
+                                       for num0 in range(1, 7) for num1 in range(1, 7))
+# Same as above, but only the ranks
+DICE_RANKS: Tuple[int, ...] = tuple(throw.rank for throw in DICE_THROWS)
+
+
 class NoneThrow(Throw):
-    """Placeholder for a Throw that has no information"""
-    def __init__(self):
-        self.value = 0
-        self.rank = -1 
-        self.is_maexchen = False
-        self.is_double = False
+    """Placeholder for a Throw that has no information
+
+    Like Throw, this is a shared instance."""
+    __slots__ = ()
+
+    def __new__(cls) -> NoneThrow:
+        return _NONE_THROW
+
+    def __reduce__(self):
+        return (NoneThrow, ())
+
+    def __hash__(self) -> int:
+        return hash(None)
 
     def __str__(self):
         return "NoneThrow"
@@ -152,6 +204,13 @@ class NoneThrow(Throw):
         raise Exception("Cannot perform arithmetics on NoneThrow")
 
 
+_NONE_THROW = object.__new__(NoneThrow)
+object.__setattr__(_NONE_THROW, "value", 0)
+object.__setattr__(_NONE_THROW, "rank", -1)
+object.__setattr__(_NONE_THROW, "is_double", False)
+object.__setattr__(_NONE_THROW, "is_maexchen", False)
+
+
 def throwByRank(rank: int) -> Throw:
     """Return a Throw with the given rank"""
-    return Throw(c.THROW_VALUES[rank])
+    return THROWS[rank]
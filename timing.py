@@ -0,0 +1,89 @@
+from __future__ import annotations
+import math
+from time import perf_counter_ns
+from typing import Callable, Dict, List, Tuple, TYPE_CHECKING
+
+from formatting import formatTable
+
+if TYPE_CHECKING:
+    from player import Player
+
+# Latencies are counted in logarithmic buckets, BUCKETS_PER_OCTAVE per doubling of the
+# duration, so percentiles are accurate to about 9 %
+BUCKETS_PER_OCTAVE = 8
+PERCENTILES = (50, 90, 99)
+
+
+class LatencyStats:
+    """Number, total and distribution of the durations of calls to one method"""
+
+    def __init__(self) -> None:
+        self.n_calls = 0
+        self.total_ns = 0
+        self.buckets: Dict[int, int] = {}
+
+    def add(self, duration_ns: int) -> None:
+        self.n_calls += 1
+        self.total_ns += duration_ns
+        bucket = int(math.log2(duration_ns + 1) * BUCKETS_PER_OCTAVE)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def mean(self) -> float:
+        """Return the mean duration in nanoseconds"""
+        return self.total_ns / self.n_calls if self.n_calls else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Return an upper bound of the q-th percentile of the durations in nanoseconds"""
+        if not self.n_calls:
+            return 0.0
+        rank = q / 100 * self.n_calls
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return 2 ** ((bucket + 1) / BUCKETS_PER_OCTAVE) - 1
+        return 2 ** ((max(self.buckets) + 1) / BUCKETS_PER_OCTAVE) - 1
+
+
+class DecisionTimer:
+    """Measure how long players take to decide and to process events.
+
+    Game wraps the getDoubt(), getThrowStated() and onEvent() methods of its players with
+    timed() if it is given a timer. The measurements are grouped by player class and method.
+    Games without a timer call the methods directly, so timing costs nothing when it's disabled.
+    """
+
+    # Methods of Player that Game times
+    METHODS = ("getDoubt", "getThrowStated", "onEvent")
+
+    stats: Dict[Tuple[str, str], LatencyStats]
+
+    def __init__(self) -> None:
+        self.stats = {}
+
+    def timed(self, player: Player, method: str) -> Callable:
+        """Return the bound method of a player, wrapped so that every call is measured"""
+        func = getattr(player, method)
+        stats = self.stats.setdefault((player.__class__.__name__, method), LatencyStats())
+
+        def timedCall(*args, **kwargs):
+            t_start = perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stats.add(perf_counter_ns() - t_start)
+
+        return timedCall
+
+    def table(self) -> List[List[str]]:
+        """Return the measurements as rows of a table, slowest player class and method first"""
+        table = [["player class", "method", "calls", "total ms", "mean µs", *[f"p{q} µs" for q in PERCENTILES]]]
+        rows = sorted(((key, stats) for key, stats in self.stats.items() if stats.n_calls),
+                      key=lambda row: row[1].total_ns, reverse=True)
+        for (class_name, method), stats in rows:
+            table.append([class_name, method, str(stats.n_calls), f"{stats.total_ns / 1e6:.1f}",
+                          f"{stats.mean() / 1e3:.2f}", *[f"{stats.percentile(q) / 1e3:.2f}" for q in PERCENTILES]])
+        return table
+
+    def pretty(self) -> str:
+        return formatTable(self.table())
@@ -0,0 +1,89 @@
+from __future__ import annotations
+import logging
+from typing import Any, Callable, Dict, List, Optional, TYPE_CHECKING
+
+from gameevent import Event, EventThrow, EventKick, EventAbort
+
+if TYPE_CHECKING:
+    from game import Game
+
+# A structured description of an Event, as produced by eventRecord()
+EventRecord = Dict[str, Any]
+
+
+class Tracer:
+    """Receives log messages and events from a Game.
+
+    Game only builds its log messages if it has a tracer, so a game without one
+    doesn't pay for tracing at all. This base class ignores everything it receives.
+    """
+
+    def message(self, text: str) -> None:
+        """Is called with a human-readable description of what happens"""
+        pass
+
+    def event(self, game: Game, event: Event) -> None:
+        """Is called for every Event, before other players are notified about it"""
+        pass
+
+
+class LogTracer(Tracer):
+    """Write the messages of a Game to the log"""
+
+    def __init__(self, logger: Optional[logging.Logger] = None, level: int = logging.INFO) -> None:
+        self.logger = logger or logging.getLogger()
+        self.level = level
+
+    def message(self, text: str) -> None:
+        self.logger.log(self.level, text)
+
+
+class EventSink(Tracer):
+    """Collect a structured record of every Event.
+
+    The records are stored in `records`, or passed to `callback` instead if one is given.
+    """
+
+    records: List[EventRecord]
+
+    def __init__(self, callback: Optional[Callable[[EventRecord], None]] = None) -> None:
+        self.callback = callback
+        self.records = []
+
+    def event(self, game: Game, event: Event) -> None:
+        record = eventRecord(event)
+        record["game"] = game.index
+        record["seed"] = game.seed
+        record["move"] = game.move_index
+        if self.callback is not None:
+            self.callback(record)
+        else:
+            self.records.append(record)
+
+
+class MultiTracer(Tracer):
+    """Pass everything on to several tracers"""
+
+    def __init__(self, tracers: List[Tracer]) -> None:
+        self.tracers = tracers
+
+    def message(self, text: str) -> None:
+        for tracer in self.tracers:
+            tracer.message(text)
+
+    def event(self, game: Game, event: Event) -> None:
+        for tracer in self.tracers:
+            tracer.event(game, event)
+
+
+def eventRecord(event: Event) -> EventRecord:
+    """Describe an Event with plain values"""
+    record: EventRecord = {"type": event.event_type.name, "player_id": event.player_id}
+    if isinstance(event, EventThrow):
+        record["throw_actual"] = event.throw_actual.value if event.throw_actual is not None else None
+        record["throw_stated"] = event.throw_stated.value if event.throw_stated is not None else None
+    elif isinstance(event, EventKick):
+        record["reason"] = event.reason.name
+    elif isinstance(event, EventAbort):
+        record["message"] = event.message
+    return record
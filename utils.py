@@ -1,3 +1,6 @@
+import math
+from typing import Tuple
+
 import constants as c
 from throw import Throw
 
@@ -17,3 +20,38 @@ def probLT(throw: Throw) -> float:
 def probGE(throw: Throw) -> float:
     """Probability that a randomly chosen Throw is of an equal or higher rank than `throw`"""
     return 1 - probLT(throw)
+
+
+MASK_64 = (1 << 64) - 1
+
+def deriveSeed(master_seed: int, index: int) -> int:
+    """Derive the seed for stream number `index` from a master seed.
+
+    This is the SplitMix64 output function applied to a counter, so any seed can be computed
+    directly from its index, without generating the ones before it."""
+    z = (master_seed + (index + 1) * 0x9E3779B97F4A7C15) & MASK_64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return z ^ (z >> 31)
+
+
+# Quantile of the standard normal distribution for two-sided 95 % confidence intervals
+Z_95 = 1.959963984540054
+
+def wilsonInterval(successes: int, n: int, z: float = Z_95) -> Tuple[float, float]:
+    """Confidence interval of a proportion, e.g. a win rate, by the Wilson score method.
+
+    Unlike the normal approximation, this doesn't collapse to a single point for proportions
+    of 0 or 1, so a player who hasn't won yet isn't taken to be known precisely.
+
+    :param successes: Number of successes, e.g. games won
+    :param n: Number of trials, e.g. games played
+    :param z: Quantile of the standard normal distribution for the confidence level
+    """
+    if n == 0:
+        return 0.0, 1.0
+    p = successes / n
+    denominator = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denominator
+    half_width = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominator
+    return max(0.0, center - half_width), min(1.0, center + half_width)